@@ -0,0 +1,116 @@
+"""add ticket search vectors
+
+Revision ID: 67ec5b14a69c
+Revises: 4a7c8d9e0f1b
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '67ec5b14a69c'
+down_revision: Union[str, None] = '4a7c8d9e0f1b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.modules.tickets.search.SEARCH_CONFIG
+SEARCH_CONFIG = "simple"
+
+
+def upgrade() -> None:
+    # search_vector: subject (A), description (B) and messages (C), visible to everyone.
+    # notes_search_vector: internal notes, only searched for agents/admins.
+    op.add_column('tickets', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.add_column('tickets', sa.Column('notes_search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    op.execute(f"""
+        CREATE FUNCTION tickets_search_vector_refresh() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.subject, '')), 'A') ||
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'B') ||
+                coalesce((
+                    SELECT setweight(to_tsvector('{SEARCH_CONFIG}', string_agg(m.body, ' ')), 'C')
+                    FROM ticket_messages m WHERE m.ticket_id = NEW.id
+                ), ''::tsvector);
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER tickets_search_vector_trg
+        BEFORE INSERT OR UPDATE OF subject, description ON tickets
+        FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_refresh();
+    """)
+
+    # Messages and notes only append their own lexemes instead of rebuilding
+    # the whole document.
+    op.execute(f"""
+        CREATE FUNCTION ticket_messages_search_append() RETURNS trigger AS $$
+        BEGIN
+            UPDATE tickets
+            SET search_vector = coalesce(search_vector, ''::tsvector)
+                || setweight(to_tsvector('{SEARCH_CONFIG}', NEW.body), 'C')
+            WHERE id = NEW.ticket_id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER ticket_messages_search_trg
+        AFTER INSERT ON ticket_messages
+        FOR EACH ROW EXECUTE FUNCTION ticket_messages_search_append();
+    """)
+    op.execute(f"""
+        CREATE FUNCTION internal_notes_search_append() RETURNS trigger AS $$
+        BEGIN
+            UPDATE tickets
+            SET notes_search_vector = coalesce(notes_search_vector, ''::tsvector)
+                || to_tsvector('{SEARCH_CONFIG}', NEW.body)
+            WHERE id = NEW.ticket_id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER internal_notes_search_trg
+        AFTER INSERT ON internal_notes
+        FOR EACH ROW EXECUTE FUNCTION internal_notes_search_append();
+    """)
+
+    # Backfill existing rows
+    op.execute("UPDATE tickets SET subject = subject")
+    op.execute(f"""
+        UPDATE tickets t
+        SET notes_search_vector = n.vector
+        FROM (
+            SELECT ticket_id, to_tsvector('{SEARCH_CONFIG}', string_agg(body, ' ')) AS vector
+            FROM internal_notes GROUP BY ticket_id
+        ) n
+        WHERE n.ticket_id = t.id
+    """)
+
+    op.create_index(
+        'ix_tickets_search_vector', 'tickets', ['search_vector'], postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_tickets_notes_search_vector', 'tickets', ['notes_search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tickets_notes_search_vector', table_name='tickets')
+    op.drop_index('ix_tickets_search_vector', table_name='tickets')
+    op.execute("DROP TRIGGER IF EXISTS internal_notes_search_trg ON internal_notes")
+    op.execute("DROP TRIGGER IF EXISTS ticket_messages_search_trg ON ticket_messages")
+    op.execute("DROP TRIGGER IF EXISTS tickets_search_vector_trg ON tickets")
+    op.execute("DROP FUNCTION IF EXISTS internal_notes_search_append()")
+    op.execute("DROP FUNCTION IF EXISTS ticket_messages_search_append()")
+    op.execute("DROP FUNCTION IF EXISTS tickets_search_vector_refresh()")
+    op.drop_column('tickets', 'notes_search_vector')
+    op.drop_column('tickets', 'search_vector')
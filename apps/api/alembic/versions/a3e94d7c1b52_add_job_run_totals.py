@@ -0,0 +1,43 @@
+"""add job run totals
+
+Revision ID: a3e94d7c1b52
+Revises: f1c7a2d94b30
+Create Date: 2026-10-18 10:20:00.000000
+
+Running (job, status) counters for /metrics, so job_runs can be pruned
+(JOB_RUNS_RETENTION_DAYS) without resetting them. Backfilled from the
+runs recorded so far.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e94d7c1b52'
+down_revision: Union[str, None] = 'f1c7a2d94b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('job_run_totals',
+    sa.Column('job', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('runs', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('duration_seconds', sa.Float(), server_default='0', nullable=False),
+    sa.Column('rows_processed', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('job', 'status')
+    )
+    op.execute(
+        """
+        INSERT INTO job_run_totals (job, status, runs, duration_seconds, rows_processed)
+        SELECT job, status, count(*), sum(duration_seconds), coalesce(sum(rows_processed), 0)
+        FROM job_runs
+        GROUP BY job, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_run_totals')
@@ -0,0 +1,45 @@
+"""add daily stats counters
+
+Revision ID: b81f0c2d5e93
+Revises: 67ec5b14a69c
+Create Date: 2026-10-17 15:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f0c2d5e93'
+down_revision: Union[str, None] = '67ec5b14a69c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing data is loaded with: python -m app.scripts.backfill_daily_stats
+    op.create_table('workspace_daily_stats',
+    sa.Column('workspace_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('tickets_created', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('tickets_resolved', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('first_response_breaches', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('resolution_breaches', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('workspace_id', 'day')
+    )
+    op.create_table('agent_daily_stats',
+    sa.Column('workspace_id', sa.UUID(), nullable=False),
+    sa.Column('agent_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('tickets_resolved', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['agent_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('workspace_id', 'agent_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('agent_daily_stats')
+    op.drop_table('workspace_daily_stats')
@@ -0,0 +1,46 @@
+"""add job runs
+
+Revision ID: c4d2e7a19f60
+Revises: b81f0c2d5e93
+Create Date: 2026-10-17 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e7a19f60'
+down_revision: Union[str, None] = 'b81f0c2d5e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('job_runs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('job', sa.String(length=64), nullable=False),
+    sa.Column('rq_job_id', sa.String(), nullable=True),
+    sa.Column('workspace_id', sa.UUID(), nullable=True),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('duration_seconds', sa.Float(), nullable=False),
+    sa.Column('lag_seconds', sa.Float(), nullable=True),
+    sa.Column('db_statements', sa.Integer(), nullable=False),
+    sa.Column('db_seconds', sa.Float(), nullable=False),
+    sa.Column('rows_processed', sa.Integer(), nullable=True),
+    sa.Column('phases', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_runs_job_started_at', 'job_runs', ['job', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_runs_job_started_at', table_name='job_runs')
+    op.drop_table('job_runs')
@@ -0,0 +1,77 @@
+"""add hot path indexes
+
+Revision ID: d9a3f61c2b47
+Revises: c4d2e7a19f60
+Create Date: 2026-10-17 19:20:00.000000
+
+Composite indexes for the ticket list shapes (workspace + filter + sort
+key + id), partial indexes for open tickets, auto-close candidates and the
+SLA escalation scans, and the first indexes on audit_logs. Built
+CONCURRENTLY so writes keep flowing on a live database; single-column
+indexes made redundant by the composites are dropped afterwards.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3f61c2b47'
+down_revision: Union[str, None] = 'c4d2e7a19f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN = "status IN ('NEW', 'OPEN', 'PENDING')"
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    ('ix_tickets_ws_created', 'tickets', ['workspace_id', 'created_at', 'id'], None),
+    ('ix_tickets_ws_updated', 'tickets', ['workspace_id', 'updated_at', 'id'], None),
+    ('ix_tickets_ws_status_created', 'tickets',
+     ['workspace_id', 'status', 'created_at', 'id'], None),
+    ('ix_tickets_ws_assignee_created', 'tickets',
+     ['workspace_id', 'assigned_agent_id', 'created_at', 'id'], None),
+    ('ix_tickets_open_ws_created', 'tickets', ['workspace_id', 'created_at', 'id'], OPEN),
+    ('ix_tickets_open_assignee', 'tickets', ['assigned_agent_id'], OPEN),
+    ('ix_tickets_resolved_updated', 'tickets', ['updated_at'], "status = 'RESOLVED'"),
+    ('ix_ticket_slas_fr_due', 'ticket_slas', ['first_response_due_at', 'workspace_id'],
+     "first_response_met = false AND first_response_breached = false"),
+    ('ix_ticket_slas_res_due', 'ticket_slas', ['resolution_due_at', 'workspace_id'],
+     "resolution_met = false AND resolution_breached = false"),
+    ('ix_ticket_slas_breached_level', 'ticket_slas', ['escalated_level', 'workspace_id'],
+     "first_response_breached = true OR resolution_breached = true"),
+    ('ix_audit_logs_ws_created', 'audit_logs', ['workspace_id', 'created_at'], None),
+    ('ix_audit_logs_entity', 'audit_logs', ['entity_type', 'entity_id', 'created_at'], None),
+]
+
+# Leading column of a composite above, or replaced by a partial index
+REDUNDANT = [
+    ('ix_tickets_workspace_id', 'tickets', ['workspace_id']),
+    ('ix_tickets_status', 'tickets', ['status']),
+    ('ix_tickets_updated_at', 'tickets', ['updated_at']),
+]
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None, if_not_exists=True,
+            )
+        for name, table, _ in REDUNDANT:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    op.execute("ANALYZE tickets")
+    op.execute("ANALYZE ticket_slas")
+    op.execute("ANALYZE audit_logs")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT:
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True
+            )
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,40 @@
+"""add ticket external id
+
+Revision ID: e5b8c3a0d714
+Revises: d9a3f61c2b47
+Create Date: 2026-10-17 22:10:00.000000
+
+Id of a ticket in the helpdesk it was imported from. Unique per workspace
+(partial: native tickets have none), which is what makes re-running an
+import skip what is already there.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8c3a0d714'
+down_revision: Union[str, None] = 'd9a3f61c2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tickets', sa.Column('external_id', sa.String(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_tickets_ws_external_id', 'tickets', ['workspace_id', 'external_id'], unique=True,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text('external_id IS NOT NULL'),
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_tickets_ws_external_id', table_name='tickets',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('tickets', 'external_id')
@@ -0,0 +1,37 @@
+"""add outbox events
+
+Revision ID: f1c7a2d94b30
+Revises: e5b8c3a0d714
+Create Date: 2026-10-17 23:40:00.000000
+
+Domain events written in the transaction of the change, deleted by the
+relay (python -m app.outbox_relay) once delivered. Rows only live until
+the next relay pass, so the primary key is the only index.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7a2d94b30'
+down_revision: Union[str, None] = 'e5b8c3a0d714'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_events',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('workspace_id', sa.UUID(), nullable=False),
+    sa.Column('event_type', sa.String(length=64), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('outbox_events')
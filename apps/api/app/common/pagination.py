@@ -1,7 +1,30 @@
+import base64
+import json
+from typing import Any
+
 from pydantic import BaseModel, Field
 
+from app.core.errors import BadRequest
+
 
 class PageMeta(BaseModel):
     page: int = Field(1, ge=1)
     size: int = Field(20, ge=1, le=100)
     total: int = Field(0, ge=0)
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Opaque keyset cursor: urlsafe base64 of a compact JSON payload."""
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise BadRequest(message="Invalid cursor")
+    if not isinstance(payload, dict):
+        raise BadRequest(message="Invalid cursor")
+    return payload
@@ -5,8 +5,13 @@ T = TypeVar("T")
 
 
 class ResponseMeta(BaseModel):
-    # Expand here with pagination etc. later
-    pass
+    page: int | None = None
+    size: int | None = None
+    # Only filled when the client asks for a count (exact or planner estimate)
+    total: int | None = None
+    total_is_estimate: bool | None = None
+    # Keyset pagination: pass back as ?cursor= to get the next page
+    next_cursor: str | None = None
 
 
 class ResponseError(BaseModel):
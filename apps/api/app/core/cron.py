@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+DAY_NAMES = {"SUN": 0, "MON": 1, "TUE": 2, "WED": 3, "THU": 4, "FRI": 5, "SAT": 6}
+WEEKDAY_NAMES = {
+    "SUNDAY": 0, "MONDAY": 1, "TUESDAY": 2, "WEDNESDAY": 3,
+    "THURSDAY": 4, "FRIDAY": 5, "SATURDAY": 6,
+}
+
+
+class CronSpec:
+    """
+    Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept *, numbers, ranges (1-5), steps (*/15, 0-30/10), lists
+    (1,15) and day names for day-of-week (MON-FRI; 0 and 7 are Sunday).
+    As in cron, when both day-of-month and day-of-week are restricted a day
+    matches if either does. Times are evaluated in the timezone of the
+    datetime passed to next_after (UTC everywhere in this app).
+    """
+
+    def __init__(self, expr: str):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expr!r}")
+        self.expr = expr
+        self.minutes = self._parse(fields[0], 0, 59)
+        self.hours = self._parse(fields[1], 0, 23)
+        self.days = self._parse(fields[2], 1, 31)
+        self.months = self._parse(fields[3], 1, 12)
+        self.weekdays = {d % 7 for d in self._parse(fields[4], 0, 7, DAY_NAMES)}
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"CronSpec({self.expr!r})"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int, names: dict[str, int] | None = None) -> set[int]:
+        def value(token: str) -> int:
+            token = token.upper()
+            if names and token in names:
+                return names[token]
+            n = int(token)
+            if not low <= n <= high:
+                raise ValueError(f"{n} out of range {low}-{high}")
+            return n
+
+        result: set[int] = set()
+        for part in field.split(","):
+            base, _, step = part.partition("/")
+            if base == "*":
+                start, end = low, high
+            elif "-" in base:
+                a, b = base.split("-", 1)
+                start, end = value(a), value(b)
+            else:
+                start = value(base)
+                end = high if step else start
+            stride = int(step) if step else 1
+            if stride < 1 or start > end:
+                raise ValueError(f"Invalid cron field {field!r}")
+            result.update(range(start, end + 1, stride))
+        return result
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom = dt.day in self.days
+        dow = (dt.weekday() + 1) % 7 in self.weekdays  # cron: 0 = Sunday
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return dow
+        if self.any_weekday:
+            return dom
+        return dom or dow
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after `after`."""
+        t = (after + timedelta(minutes=1)).replace(second=0, microsecond=0)
+        for _ in range(366 * 5):
+            if t.month in self.months and self._day_matches(t):
+                for hour in sorted(h for h in self.hours if h >= t.hour):
+                    minutes = [m for m in self.minutes if hour > t.hour or m >= t.minute]
+                    if minutes:
+                        return t.replace(hour=hour, minute=min(minutes))
+            t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+        raise ValueError(f"{self.expr!r} never fires")
+
+
+def weekly_cron(day: str, hour: int) -> str:
+    """Cron expression for settings like WEEKLY_REPORT_DAY=MONDAY, WEEKLY_REPORT_HOUR=9."""
+    return f"0 {hour} * * {WEEKDAY_NAMES[day.upper()]}"
@@ -0,0 +1,157 @@
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+
+import redis
+from fastapi import Request, Response
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Clients keep the body but revalidate on every use; Authorization varies it
+CACHE_CONTROL = "private, no-cache"
+
+
+class ChangeVersions:
+    """
+    What list and report conditional GETs compare against, without touching
+    the database: a per-workspace version, an opaque token replaced
+    (dropped) whenever any ticket, requester/assignee or report counter of
+    the workspace changes. Ticket details don't use it, their ETag comes
+    from the updated_at columns of what they embed.
+
+    Writers call changed() after their commit. A missing entry only costs a
+    full response, never a stale 304: a fresh token is minted before the
+    data is read, so no ETag issued earlier can match it.
+
+    Entries expire after the TTL, which bounds staleness from writers that
+    can't reach this store. The memory backend is per process, so it only
+    suits a single API process with no RQ workers writing tickets.
+    """
+
+    def __init__(self, ttl_seconds: int, use_redis: bool, max_entries: int = 100_000):
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self.max_entries = max_entries
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.http_cache_enabled
+
+    def workspace(self, workspace_id: uuid.UUID) -> str:
+        key = f"http:ws:{workspace_id}"
+        version = self._get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            self._set(key, version)
+        return version
+
+    def changed(self, workspace_id: uuid.UUID) -> None:
+        """Call after committing a change to tickets, users or report counters of the workspace."""
+        self.changed_many([workspace_id])
+
+    def changed_many(self, workspace_ids: Iterable[uuid.UUID]) -> None:
+        """changed() for writes that span workspaces."""
+        if not self.enabled:
+            return
+        keys = [f"http:ws:{w}" for w in set(workspace_ids)]
+        if keys:
+            self._delete(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def _get(self, key: str) -> str | None:
+        if self.use_redis:
+            try:
+                raw = get_redis().get(key)
+            except redis.RedisError:
+                logger.warning("http cache: redis get failed", exc_info=True)
+                return None
+            return raw.decode() if raw is not None else None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._local[key]
+                return None
+            return value
+
+    def _set(self, key: str, value: str) -> None:
+        if self.use_redis:
+            try:
+                get_redis().set(key, value, ex=self.ttl_seconds)
+            except redis.RedisError:
+                logger.warning("http cache: redis set failed", exc_info=True)
+            return
+
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _delete(self, keys: list[str]) -> None:
+        if self.use_redis:
+            try:
+                get_redis().delete(*keys)
+            except redis.RedisError:
+                logger.warning("http cache: redis delete failed", exc_info=True)
+            return
+
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+
+def etag_for(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:20]
+    # Weak: equal content, not byte-identical JSON
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # Weak comparison (RFC 9110 13.1.2): the W/ prefix is ignored
+    opaque = etag.removeprefix("W/")
+    return "*" in candidates or any(c.removeprefix("W/") == opaque for c in candidates)
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+
+
+def not_modified(request: Request, etag: str | None) -> Response | None:
+    """A 304 for the request if it already has `etag`, else None."""
+    if etag is None or not change_versions.enabled:
+        return None
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    if change_versions.enabled:
+        response.headers.update(cache_headers(etag))
+
+
+change_versions = ChangeVersions(
+    ttl_seconds=settings.http_cache_ttl_seconds,
+    use_redis=settings.http_cache_backend == "redis",
+)
@@ -0,0 +1,155 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import get_settings
+from app.core.metrics import registry
+from app.db.pool import ENGINES
+from app.db.profiling import check_query_budget, profile_queries
+
+settings = get_settings()
+
+UNMATCHED = "<unmatched>"
+
+REQUESTS = registry.counter(
+    "helpdesk_http_requests_total",
+    "HTTP requests by route template and status",
+    ("method", "route", "status"),
+)
+DURATION = registry.histogram(
+    "helpdesk_http_request_duration_seconds",
+    "Request latency by route template",
+    ("method", "route"),
+)
+DB_STATEMENTS = registry.histogram(
+    "helpdesk_http_request_db_statements", "SQL statements per request", ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+IN_FLIGHT = registry.gauge("helpdesk_http_requests_in_flight", "Requests being served")
+
+
+def route_template(scope) -> str:
+    """
+    Full route template, e.g. /api/v1/tickets/{ticket_id}; never the raw
+    path, so label cardinality stays bounded.
+
+    Routers included by FastAPI may only know their own part of the
+    template, so the prefix is recovered from the concrete path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return UNMATCHED
+    path = scope["path"]
+    try:
+        concrete = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    if path.endswith(concrete):
+        return path[: len(path) - len(concrete)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI (no BaseHTTPMiddleware task/stream wrapping): per request one
+    contextvar set, a perf_counter pair and three metric updates.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            with profile_queries() as queries:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            method, route = scope["method"], route_template(scope)
+            REQUESTS.inc(method, route, str(status))
+            DURATION.observe(method, route, value=elapsed)
+            DB_STATEMENTS.observe(method, route, value=queries.count)
+
+
+class QueryProfilingMiddleware:
+    """
+    Per-request SQL profile: labels slow-query log lines with the route,
+    checks @query_budget endpoints, and adds a Server-Timing header when
+    SERVER_TIMING_ENABLED (browser dev tools show it in the timing tab).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        def label() -> str:
+            return f"{scope['method']} {route_template(scope)}"
+
+        started = time.perf_counter()
+        with profile_queries(label) as queries:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start" and settings.server_timing_enabled:
+                    app_ms = (time.perf_counter() - started) * 1000
+                    db_ms = queries.seconds * 1000
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'db;dur={db_ms:.1f};desc="{queries.count} queries", app;dur={app_ms:.1f}',
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+        check_query_budget(scope.get("endpoint"), queries, label())
+
+
+def collect_pool_metrics():
+    """Pool saturation per engine of this process (see app.db.pool)."""
+    pools = {
+        name: getattr(engine, "sync_engine", engine).pool for name, engine in ENGINES.items()
+    }
+    gauges = {
+        "helpdesk_db_pool_size": ("Configured pool size", lambda p: p.size()),
+        "helpdesk_db_pool_checked_out": ("Connections in use", lambda p: p.checkedout()),
+        "helpdesk_db_pool_overflow": (
+            "Connections above pool_size", lambda p: max(p.overflow(), 0)
+        ),
+        "helpdesk_db_pool_max_connections": (
+            "pool_size + max_overflow", lambda p: p.size() + max(p._max_overflow, 0)
+        ),
+    }
+    for metric, (help, value) in gauges.items():
+        samples = [({"engine": name}, value(pool)) for name, pool in pools.items()]
+        yield (metric, "gauge", help, samples)
+
+    waits = {
+        name: pool.wait_stats.snapshot()
+        for name, pool in pools.items()
+        if hasattr(pool, "wait_stats")
+    }
+    yield ("helpdesk_db_pool_checkout_wait_seconds_total", "counter",
+           "Time spent waiting for a connection",
+           [({"engine": name}, stats["wait_total_ms"] / 1000) for name, stats in waits.items()])
+    yield ("helpdesk_db_pool_checkouts_total", "counter", "Connection checkouts",
+           [({"engine": name}, stats["checkouts"]) for name, stats in waits.items()])
+    yield ("helpdesk_db_pool_timeouts_total", "counter",
+           "Checkouts that hit DB_POOL_TIMEOUT_SECONDS",
+           [({"engine": name}, stats["timeouts"]) for name, stats in waits.items()])
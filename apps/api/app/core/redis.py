@@ -0,0 +1,16 @@
+from functools import lru_cache
+
+import redis
+
+from app.core.config import get_settings
+
+
+@lru_cache
+def get_redis() -> redis.Redis:
+    """Shared client for caches and coordination. Connects lazily on first command."""
+    settings = get_settings()
+    return redis.from_url(
+        settings.redis_url,
+        socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        socket_timeout=settings.redis_socket_timeout_seconds,
+    )
@@ -7,4 +7,6 @@ from app.modules.tickets.models import Ticket, TicketMessage  # noqa
 from app.modules.tags.models import Tag  # noqa
 from app.modules.sla.models import SLAPolicy, TicketSLA # noqa
 from app.modules.audit.models import AuditLog # noqa
-from app.modules.reports.models import WeeklyReportSnapshot # noqa
+from app.modules.reports.models import WeeklyReportSnapshot, WorkspaceDailyStats, AgentDailyStats # noqa
+from app.modules.jobs.models import JobRun, JobRunTotal # noqa
+from app.modules.outbox.models import OutboxEvent # noqa
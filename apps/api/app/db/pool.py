@@ -0,0 +1,176 @@
+import threading
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import get_settings
+
+# Engines built by this process, by name, for the pool metrics endpoint
+ENGINES: dict[str, Any] = {}
+
+
+class PoolWaitStats:
+    """Time spent waiting for a connection at checkout (includes opening new ones)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def timed_out(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict[str, float | int]:
+        with self._lock:
+            wait_avg = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.total_wait * 1000, 3),
+                "wait_avg_ms": round(wait_avg * 1000, 3),
+                "wait_max_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class TimedPoolMixin:
+    wait_stats: PoolWaitStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.timed_out()
+            raise
+        self.wait_stats.observe(time.perf_counter() - started)
+        return conn
+
+    def recreate(self):
+        # dispose() swaps in a fresh pool; keep the counters across it
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+
+def engine_options(url: str, async_engine: bool = False) -> dict[str, Any]:
+    """
+    create_engine / create_async_engine kwargs from Settings, shared by the
+    API, worker and scheduler so every process sizes its pool the same way.
+    """
+    settings = get_settings()
+    driver = make_url(url).get_driver_name()
+
+    # application_name shows which process/replica holds a connection in pg_stat_activity
+    if driver == "asyncpg":
+        connect_args: dict[str, Any] = {
+            "server_settings": {"application_name": settings.db_application_name}
+        }
+    else:
+        connect_args = {"application_name": settings.db_application_name}
+
+    if settings.db_pgbouncer_mode:
+        # Transaction pooling hands each transaction a different server
+        # connection, so server-side prepared statements can't be reused.
+        if driver == "asyncpg":
+            connect_args.update({
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            })
+        else:
+            connect_args["prepare_threshold"] = None
+
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if async_engine else TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping == "always",
+        "connect_args": connect_args,
+    }
+
+
+def install_idle_ping(engine: Engine, idle_seconds: float) -> None:
+    """
+    Pre-ping only connections that sat idle in the pool for a while, instead
+    of a round trip on every checkout. A failed ping raises
+    DisconnectionError, which makes the pool retry with a fresh connection.
+    """
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, record):
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, record, proxy):
+        checked_in_at = record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception as e:
+            raise exc.DisconnectionError() from e
+
+
+def register_engine(name: str, engine: Engine) -> None:
+    settings = get_settings()
+    if settings.db_pool_pre_ping == "idle":
+        install_idle_ping(
+            getattr(engine, "sync_engine", engine), settings.db_pool_pre_ping_idle_seconds
+        )
+    ENGINES[name] = engine
+
+
+def pool_status(engine: Engine) -> dict[str, Any]:
+    pool = engine.pool
+    status = {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        # Upper bound this process can hold open against Postgres
+        "max_connections": pool.size() + max(pool._max_overflow, 0),
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(wait_stats.snapshot())
+    return status
+
+
+def pool_metrics() -> dict[str, dict[str, Any]]:
+    # The async engine's pool lives on its sync_engine
+    return {
+        name: pool_status(getattr(engine, "sync_engine", engine))
+        for name, engine in ENGINES.items()
+    }
@@ -0,0 +1,116 @@
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass
+class QueryStats:
+    """Statements executed and time spent in the driver, for one request or job."""
+
+    count: int = 0
+    seconds: float = 0.0
+    # What the statements ran for (route, job name); a callable is resolved
+    # only when a slow statement is logged
+    label: str | Callable[[], str] | None = None
+    # Enclosing profile (e.g. a request around a job run inline), also counted
+    parent: "QueryStats | None" = None
+
+    def describe(self) -> str | None:
+        return self.label() if callable(self.label) else self.label
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def profile_queries(label: str | Callable[[], str] | None = None) -> Iterator[QueryStats]:
+    """Count every statement run on a profiled engine inside the block (this context only)."""
+    parent = _current.get()
+    stats = QueryStats(label=label, parent=parent)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def query_budget(max_statements: int):
+    """
+    Declare how many SQL statements an endpoint may run. Checked per request
+    by QueryProfilingMiddleware according to DB_QUERY_BUDGET_MODE.
+
+        @router.get("/{ticket_id}")
+        @query_budget(8)
+        def get_ticket(...): ...
+    """
+
+    def decorator(endpoint):
+        endpoint.query_budget = max_statements
+        return endpoint
+
+    return decorator
+
+
+def check_query_budget(endpoint, stats: QueryStats, label: str) -> None:
+    budget = getattr(endpoint, "query_budget", None)
+    mode = settings.db_query_budget_mode
+    if budget is None or mode == "off" or stats.count <= budget:
+        return
+    message = f"{label} ran {stats.count} SQL statements, budget is {budget}"
+    if mode == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def install_query_profiler(engine: Engine) -> None:
+    """Time statements on engine (a sync Engine; pass async_engine.sync_engine for async)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        owner = stats
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+            stats = stats.parent
+
+        threshold_ms = settings.db_slow_query_ms
+        if threshold_ms and elapsed * 1000 >= threshold_ms:
+            logger.warning(
+                "slow query %.1fms [%s]: %s",
+                elapsed * 1000,
+                (owner.describe() if owner else None) or "-",
+                " ".join(statement.split())[:1000],
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # Failed statements never reach after_cursor_execute
+        connection = context.connection
+        starts = connection.info.get("query_start") if connection is not None else None
+        if starts:
+            starts.pop()
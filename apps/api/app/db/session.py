@@ -1,11 +1,19 @@
+from functools import lru_cache
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
+from app.db.pool import engine_options, register_engine
+from app.db.profiling import install_query_profiler
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+# Pool sizing, pre-ping and PgBouncer mode come from Settings (see app.db.pool);
+# the API, worker and scheduler all build their engine here.
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
+register_engine("sync", engine)
+install_query_profiler(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
@@ -15,3 +23,30 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async path (DB_ASYNC_ENABLED). Built lazily so the sync app never needs
+# greenlet or an async driver installed.
+@lru_cache
+def get_async_engine():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = settings.async_database_url or settings.database_url
+    async_engine = create_async_engine(url, **engine_options(url, async_engine=True))
+    register_engine("async", async_engine)
+    install_query_profiler(async_engine.sync_engine)
+    return async_engine
+
+
+@lru_cache
+def get_async_sessionmaker():
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    # expire_on_commit=False: attribute access after commit would otherwise
+    # need an implicit refresh, which async sessions can't do
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
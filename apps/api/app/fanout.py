@@ -0,0 +1,99 @@
+import logging
+import time
+import uuid
+from collections.abc import Callable, Iterable
+
+from rq.job import Dependency, JobStatus
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Sub-jobs a lane can chain onto; anything else (finished, failed, gone)
+# would leave the new job deferred forever, so the lane starts over.
+ACTIVE_STATUSES = {JobStatus.QUEUED, JobStatus.STARTED, JobStatus.DEFERRED, JobStatus.SCHEDULED}
+
+
+def dedupe_key(name: str, workspace_id) -> str:
+    return f"jobs:fanout:{name}:{workspace_id}"
+
+
+def lane_key(name: str, lane: int) -> str:
+    return f"jobs:fanout:{name}:lane:{lane}"
+
+
+def fan_out(
+    name: str,
+    func: Callable,
+    workspace_ids: Iterable[uuid.UUID],
+    kwargs: dict | None = None,
+    queue=None,
+    client=None,
+) -> dict[str, int]:
+    """
+    Enqueue func(workspace_id=..., **kwargs) once per workspace.
+
+    A workspace whose previous sub-job is still queued or running is skipped
+    (SET NX on a per-workspace key, released when the sub-job ends, TTL as a
+    backstop for killed workers). Sub-jobs are spread over
+    JOBS_FANOUT_CONCURRENCY lanes; each one depends on the previous job of
+    its lane, so at most that many run at once however many workers there
+    are. Lane tails live in Redis, so the cap holds across coordinator runs.
+    """
+    if queue is None:
+        from app.queue import task_queue as queue
+    client = client if client is not None else get_redis()
+    kwargs = kwargs or {}
+    ttl = settings.jobs_fanout_dedupe_ttl_seconds
+    lanes = max(settings.jobs_fanout_concurrency, 1)
+    run = int(time.time())
+
+    tails: dict[int, str | None] = {}
+    enqueued = skipped = 0
+    for workspace_id in workspace_ids:
+        job_id = f"{name}-{workspace_id}-{run}"
+        key = dedupe_key(name, workspace_id)
+        if not client.set(key, job_id, nx=True, ex=ttl):
+            skipped += 1
+            continue
+
+        lane = enqueued % lanes
+        if lane not in tails:
+            tails[lane] = _active_tail(queue, client, lane_key(name, lane))
+        depends_on = Dependency(jobs=[tails[lane]], allow_failure=True) if tails[lane] else None
+        try:
+            job = queue.enqueue(
+                run_shard, name, func, workspace_id, kwargs,
+                job_id=job_id, depends_on=depends_on,
+            )
+        except Exception:
+            client.delete(key)
+            raise
+        client.set(lane_key(name, lane), job.id, ex=ttl)
+        tails[lane] = job.id
+        enqueued += 1
+
+    logger.info(
+        "%s fan-out: enqueued=%d skipped=%d lanes=%d", name, enqueued, skipped, min(lanes, enqueued)
+    )
+    return {"enqueued": enqueued, "skipped": skipped}
+
+
+def _active_tail(queue, client, key: str) -> str | None:
+    tail = client.get(key)
+    if tail is None:
+        return None
+    job = queue.fetch_job(tail.decode() if isinstance(tail, bytes) else tail)
+    if job is None or job.get_status() not in ACTIVE_STATUSES:
+        return None
+    return job.id
+
+
+def run_shard(name: str, func: Callable, workspace_id: uuid.UUID, kwargs: dict):
+    """Sub-job body: run the workspace-scoped job, then free the workspace for the next fan-out."""
+    try:
+        return func(workspace_id=workspace_id, **kwargs)
+    finally:
+        get_redis().delete(dedupe_key(name, workspace_id))
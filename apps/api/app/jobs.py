@@ -1,209 +1,133 @@
-import time
 from datetime import datetime, timezone, timedelta
+from rq import get_current_job
 from app.db.session import SessionLocal
-from app.modules.tickets.models import Ticket, TicketStatus, Assignment
-from app.modules.sla.models import TicketSLA
-from app.modules.audit.models import AuditLog
-from app.modules.users.models import User
-from app.core.security import Role
 from app.core.config import get_settings
 from app.modules.reports.models import WeeklyReportSnapshot
-from sqlalchemy import func
+from app.modules.sla.escalation import sla_escalation_engine
+from app.modules.tickets.auto_close import auto_close_engine
+from app.modules.reports.repo import report_repo
+from app.modules.reports.service import report_service
+from app.fanout import fan_out
+from app.modules.jobs.service import track_job
+from sqlalchemy import insert
 
 settings = get_settings()
 
-def sla_escalation_job():
+def report_job_progress(chunks: int, processed: int) -> None:
+    # Visible on the RQ job (job.meta["progress"]) while a worker drains a backlog
+    job = get_current_job()
+    if job is not None:
+        job.meta["progress"] = {"chunks": chunks, "processed": processed}
+        job.save_meta()
+
+def rows_processed(result) -> int | None:
+    """Rows a job wrote, from its return value (shown by GET /admin/jobs/{id})."""
+    if isinstance(result, int):
+        return result  # weekly_report_job: snapshots written
+    if isinstance(result, dict):
+        if "closed" in result:
+            return result["closed"]
+        if "escalated" in result:
+            return (
+                result["first_response_breached"]
+                + result["resolution_breached"]
+                + result["escalated"]
+            )
+        if "enqueued" in result:
+            return result["enqueued"]  # fan-out coordinators: sub-jobs
+    return None
+
+def current_week_start():
+    # Calculate start of this week (Monday)
+    today = datetime.now(timezone.utc).date()
+    return today - timedelta(days=today.weekday()) # Monday = 0
+
+def last_completed_week_start():
+    # The week that just ended: scheduled runs happen early in the next one
+    return current_week_start() - timedelta(days=7)
+
+@track_job("sla_escalation", rows_processed)
+def sla_escalation_job(workspace_id=None):
     db = SessionLocal()
     try:
         now = datetime.now(timezone.utc)
-        
-        # 1. Breaches
-        # Find TicketSLAs where due < now AND met=False AND breached=False
-        
-        # First Response Breach
-        fr_breaches = db.query(TicketSLA).filter(
-            TicketSLA.first_response_due_at < now,
-            TicketSLA.first_response_met == False,
-            TicketSLA.first_response_breached == False
-        ).all()
-        
-        for sla in fr_breaches:
-            sla.first_response_breached = True
-            
-        # Resolution Breach
-        res_breaches = db.query(TicketSLA).filter(
-            TicketSLA.resolution_due_at < now,
-            TicketSLA.resolution_met == False,
-            TicketSLA.resolution_breached == False
-        ).all()
-        
-        for sla in res_breaches:
-            sla.resolution_breached = True
-            
-        db.commit()
-        
-        # 2. Escalation
-        # Find TicketSLAs with ANY breach AND escalated_level < 2 AND Ticket Status IN (NEW, OPEN, PENDING)
-        # We need to join Ticket to check status
-        breached_slas = db.query(TicketSLA).join(Ticket).filter(
-            (TicketSLA.first_response_breached == True) | (TicketSLA.resolution_breached == True),
-            TicketSLA.escalated_level < 2,
-            Ticket.status.in_([TicketStatus.NEW, TicketStatus.OPEN, TicketStatus.PENDING])
-        ).all()
-        
-        for sla in breached_slas:
-            # Escalate
-            sla.escalated_level += 1
-            ticket = db.query(Ticket).get(sla.ticket_id)
-            
-            # Update Priority
-            if sla.escalated_level == 1:
-                ticket.priority = "HIGH"
-            elif sla.escalated_level == 2:
-                ticket.priority = "URGENT"
-            
-            # Reassign logical
-            # Find least loaded agent in workspace
-            agents = db.query(User).filter(
-                User.workspace_id == sla.workspace_id,
-                User.role.in_([Role.AGENT, Role.ADMIN]),
-                User.is_active == True
-            ).all()
-            
-            best_agent = None
-            min_load = float('inf')
-            
-            for agent in agents:
-                load = db.query(Ticket).filter(
-                    Ticket.assigned_agent_id == agent.id,
-                    Ticket.status.in_([TicketStatus.NEW, TicketStatus.OPEN, TicketStatus.PENDING])
-                ).count()
-                if load < min_load:
-                    min_load = load
-                    best_agent = agent
-            
-            if best_agent and best_agent.id != ticket.assigned_agent_id:
-                ticket.assigned_agent_id = best_agent.id
-                
-                # Record Assignment
-                assign_history = Assignment(
-                    ticket_id=ticket.id,
-                    assigned_agent_id=best_agent.id,
-                    workspace_id=ticket.workspace_id,
-                    assigned_by_user_id=best_agent.id # System action attributed to new assignee
-                )
-                db.add(assign_history)
-                
-            # Audit Log
-            audit = AuditLog(
-                workspace_id=sla.workspace_id,
-                entity_type="ticket",
-                entity_id=ticket.id,
-                action="sla_escalated",
-                meta={"level": sla.escalated_level, "priority": ticket.priority}
-            )
-            db.add(audit)
-            
-        db.commit()
-            
+        return sla_escalation_engine.run(db, now, workspace_id)
     finally:
         db.close()
 
-def auto_close_job():
+@track_job("auto_close", rows_processed)
+def auto_close_job(batch_size: int | None = None, max_chunks: int | None = None, workspace_id=None):
     db = SessionLocal()
     try:
         now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(days=settings.auto_close_days)
-        
-        tickets_to_close = db.query(Ticket).filter(
-            Ticket.status == TicketStatus.RESOLVED,
-            Ticket.updated_at < cutoff # Using updated_at as proxy for activity if last_customer_activity_at is complex or usually updated on resolve.
-            # Ideally use last_customer_activity_at but we need to ensure it's set. 
-            # Prompt says "last_customer_activity_at < now - X days".
-        ).all()
-        
-        # If we use last_customer_activity_at, make sure it's reliable.
-        # Fallback to updated_at if None?
-        
-        for ticket in tickets_to_close:
-            # Check last activity explicitly if needed
-            last_act = ticket.last_customer_activity_at or ticket.updated_at
-            if last_act < cutoff:
-                ticket.status = TicketStatus.CLOSED
-                # ticket.closed_at = now # If model has closed_at? Assuming yes or just status.
-                # Audit
-                audit = AuditLog(
-                    workspace_id=ticket.workspace_id,
-                    entity_type="ticket",
-                    entity_id=ticket.id,
-                    action="auto_closed"
-                )
-                db.add(audit)
-                
-                # Check SLA resolution met?
-                # If resolution_met was false, and now it's closed?
-                # Usually resolution met happens on RESOLVED.
-                # If it was resolved on time, met is true.
-                # Auto close just confirms it.
-        
-        db.commit()
+        return auto_close_engine.run(
+            db,
+            now,
+            inactive_days=settings.auto_close_days,
+            batch_size=batch_size or settings.auto_close_batch_size,
+            max_chunks=max_chunks,
+            on_progress=report_job_progress,
+            workspace_id=workspace_id,
+        )
     finally:
         db.close()
 
-def weekly_report_job():
+@track_job("weekly_report", rows_processed)
+def weekly_report_job(workspace_id=None, week_start=None):
+    # Snapshots are written once per week, so by default only a finished
+    # week is stored; pass week_start to snapshot another one
     db = SessionLocal()
     try:
-        # Calculate start of this week (Monday)
-        today = datetime.now(timezone.utc).date()
-        start_of_week = today - timedelta(days=today.weekday()) # Monday = 0
-        
-        # Group by workspace? Or iterate workspaces?
-        # Iterate all users/workspaces? Better grouping query.
-        # Simple MVP: Iterate workspaces.
-        from app.modules.workspaces.models import Workspace
-        workspaces = db.query(Workspace).all()
-        
-        for ws in workspaces:
-            # Check if snapshot exists
-            exists = db.query(WeeklyReportSnapshot).filter_by(
-                workspace_id=ws.id,
-                week_start_date=start_of_week
-            ).first()
-            
-            if exists:
-                continue
-                
-            # Calculate metrics
-            # created tickets
-            created_count = db.query(Ticket).filter(
-                Ticket.workspace_id == ws.id,
-                Ticket.created_at >= datetime.combine(start_of_week, datetime.min.time(), tzinfo=timezone.utc)
-            ).count()
-            
-            resolved_count = db.query(Ticket).filter(
-                Ticket.workspace_id == ws.id,
-                Ticket.status.in_([TicketStatus.RESOLVED, TicketStatus.CLOSED]),
-                Ticket.updated_at >= datetime.combine(start_of_week, datetime.min.time(), tzinfo=timezone.utc) # Approx
-            ).count()
-            
-            breaches_fr = db.query(TicketSLA).filter(
-                TicketSLA.workspace_id == ws.id,
-                TicketSLA.first_response_breached == True,
-                TicketSLA.updated_at >= datetime.combine(start_of_week, datetime.min.time(), tzinfo=timezone.utc) # Approx time of breach?
-            ).count()
-            
-            snapshot = WeeklyReportSnapshot(
-                workspace_id=ws.id,
-                week_start_date=start_of_week,
-                payload={
-                    "tickets_created": created_count,
-                    "tickets_resolved": resolved_count,
-                    "sla_breaches": breaches_fr
-                }
-            )
-            db.add(snapshot)
-            
+        start_of_week = week_start or last_completed_week_start()
+
+        # Workspaces without a snapshot for this week, then every payload
+        # from the daily counters in two grouped queries.
+        workspace_ids = report_repo.workspaces_without_snapshot(db, start_of_week, workspace_id)
+        if not workspace_ids:
+            return 0
+
+        reports = report_service.weekly_reports(db, start_of_week, workspace_ids)
+        db.execute(insert(WeeklyReportSnapshot), [
+            {"workspace_id": workspace_id, "week_start_date": start_of_week, "payload": payload}
+            for workspace_id, payload in reports.items()
+        ])
         db.commit()
-        
+        return len(reports)
+
+    finally:
+        db.close()
+
+# Fan-out coordinators (JOBS_FANOUT_ENABLED): list the workspaces with work,
+# then one sub-job per workspace on task_queue so a big tenant only delays itself.
+
+@track_job("sla_escalation_coordinator", rows_processed)
+def sla_escalation_coordinator():
+    db = SessionLocal()
+    try:
+        workspace_ids = sla_escalation_engine.pending_workspaces(db, datetime.now(timezone.utc))
+    finally:
+        db.close()
+    return fan_out("sla_escalation", sla_escalation_job, workspace_ids)
+
+@track_job("auto_close_coordinator", rows_processed)
+def auto_close_coordinator():
+    db = SessionLocal()
+    try:
+        workspace_ids = auto_close_engine.pending_workspaces(
+            db, datetime.now(timezone.utc), settings.auto_close_days
+        )
+    finally:
+        db.close()
+    return fan_out("auto_close", auto_close_job, workspace_ids)
+
+@track_job("weekly_report_coordinator", rows_processed)
+def weekly_report_coordinator():
+    db = SessionLocal()
+    try:
+        week_start = last_completed_week_start()
+        workspace_ids = report_repo.workspaces_without_snapshot(db, week_start)
     finally:
         db.close()
+    return fan_out(
+        "weekly_report", weekly_report_job, workspace_ids, kwargs={"week_start": week_start}
+    )
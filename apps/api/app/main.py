@@ -1,9 +1,10 @@
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from app.core.config import get_settings
 from app.core.logging import configure_logging
 from app.core.errors import HelpdeskException
+from app.core.metrics import registry as metrics_registry, CONTENT_TYPE as METRICS_CONTENT_TYPE
 from app.common.responses import ResponseError, APIResponse
 
 # Routers
@@ -15,6 +16,7 @@ from app.modules.tags.router import router as tags_router
 from app.modules.sla.router import router as sla_router
 from app.modules.reports.router import router as reports_router
 from app.modules.admin.router import router as admin_router
+from app.modules.realtime.router import router as realtime_router
 
 
 def create_app() -> FastAPI:
@@ -39,6 +41,15 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # SQL profile per request: slow-query route labels, query budgets, Server-Timing
+    from app.core.http_metrics import QueryProfilingMiddleware
+    app.add_middleware(QueryProfilingMiddleware)
+
+    if settings.metrics_enabled:
+        # Outermost, so latency covers CORS and the exception handlers too
+        from app.core.http_metrics import MetricsMiddleware
+        app.add_middleware(MetricsMiddleware)
+
     # Global Exception Handler
     @app.exception_handler(HelpdeskException)
     async def helpdesk_exception_handler(request: Request, exc: HelpdeskException):
@@ -61,9 +72,28 @@ def create_app() -> FastAPI:
             "version": settings.service_version,
         }
 
+    if settings.metrics_enabled:
+        from app.core.http_metrics import collect_pool_metrics
+        from app.modules.jobs.service import collect_job_metrics
+        metrics_registry.register_collector("db_pool", collect_pool_metrics)
+        metrics_registry.register_collector("jobs", collect_job_metrics)
+
+        @app.get("/metrics", include_in_schema=False)
+        def metrics() -> Response:
+            return Response(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
     # API V1
     API_PREFIX = "/api/v1"
     
+    if settings.db_async_enabled:
+        # Async handlers for the hot endpoints go first so they win the match
+        from app.modules.auth.async_router import router as auth_async_router
+        from app.modules.tickets.async_router import router as tickets_async_router
+        from app.modules.users.async_router import router as users_async_router
+        app.include_router(auth_async_router, prefix=f"{API_PREFIX}/auth", tags=["Auth"])
+        app.include_router(users_async_router, prefix=f"{API_PREFIX}/users", tags=["Users"])
+        app.include_router(tickets_async_router, prefix=f"{API_PREFIX}/tickets", tags=["Tickets"])
+
     app.include_router(auth_router, prefix=f"{API_PREFIX}/auth", tags=["Auth"])
     app.include_router(users_router, prefix=f"{API_PREFIX}/users", tags=["Users"])
     app.include_router(workspaces_router, prefix=f"{API_PREFIX}/workspaces", tags=["Workspaces"])
@@ -74,6 +104,7 @@ def create_app() -> FastAPI:
     from app.modules.reports.agents import router as agent_stats_router
     app.include_router(agent_stats_router, prefix=f"{API_PREFIX}/reports/agents", tags=["Agent Stats"])
     app.include_router(admin_router, prefix=f"{API_PREFIX}/admin", tags=["Admin"])
+    app.include_router(realtime_router, prefix=f"{API_PREFIX}/events", tags=["Realtime"])
     
     return app
 
@@ -1,15 +1,20 @@
 from typing import Annotated
+from datetime import datetime, timezone
 from enum import Enum
-from fastapi import APIRouter, Depends, Query, Body, status
+from fastapi import APIRouter, Depends, Query, status
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy.orm import Session
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
+from rq.results import Result
 
-from app.db.session import get_db
+from app.db.pool import pool_metrics
+from app.core.errors import NotFound
 from app.core.security import Role
 from app.modules.auth.deps import require_roles
 from app.modules.users.models import User
 from app.common.responses import APIResponse
-from app.jobs import sla_escalation_job, auto_close_job, weekly_report_job
+from app.jobs import sla_escalation_job, auto_close_job, weekly_report_job, rows_processed
+from app.queue import task_queue
 
 router = APIRouter()
 
@@ -25,31 +30,82 @@ class JobRunRequest(BaseModel):
         "examples": [{"job": "sla_escalation"}]
     })
 
-@router.post("/jobs/run", response_model=APIResponse[dict], status_code=status.HTTP_200_OK)
+JOB_FUNCS = {
+    JobName.SLA_ESCALATION: sla_escalation_job,
+    JobName.AUTO_CLOSE: auto_close_job,
+    JobName.WEEKLY_SNAPSHOT: weekly_report_job,
+}
+
+# Upper bound for ?wait=true; longer runs should be polled via GET /admin/jobs/{id}
+MAX_WAIT_SECONDS = 60
+
+
+def describe_job(job: Job) -> dict:
+    job_status = job.get_status()
+    result = job.latest_result()
+    duration = None
+    if job.started_at:
+        end = job.ended_at or datetime.now(timezone.utc).replace(tzinfo=job.started_at.tzinfo)
+        duration = (end - job.started_at).total_seconds()
+    return_value = result.return_value if result and result.type == Result.Type.SUCCESSFUL else None
+    return {
+        "id": job.id,
+        "job": job.meta.get("job", job.func_name),
+        "status": job_status.value if job_status else None,
+        "enqueued_at": job.enqueued_at,
+        "started_at": job.started_at,
+        "ended_at": job.ended_at,
+        "duration_seconds": duration,
+        "progress": job.meta.get("progress"),
+        "result": return_value,
+        "rows_processed": rows_processed(return_value),
+        "error": result.exc_string if result and result.type == Result.Type.FAILED else None,
+    }
+
+
+@router.post("/jobs/run", response_model=APIResponse[dict], status_code=status.HTTP_202_ACCEPTED)
 def run_job_manually(
     job_req: JobRunRequest,
     user: Annotated[User, Depends(require_roles(Role.ADMIN))],
-    db: Annotated[Session, Depends(get_db)],
+    wait: bool = Query(False, description="Block until the job ends or the timeout passes"),
+    timeout: int = Query(
+        30, ge=1, le=MAX_WAIT_SECONDS, description="Seconds to wait with wait=true"
+    ),
 ):
     """
     Manually trigger a background job. ADMIN only.
-    Use for demo or debugging purposes.
+    The job is enqueued on the RQ task queue and runs on a worker; poll
+    GET /admin/jobs/{id} for its status, or pass wait=true for demos.
     """
-    # Simply call the job function synchronously for immediate effect in demo.
-    # Alternatively, enqueue it. But for demo, sync is better to "see result instantly".
-    # User asked for "SAFE" execution. 
-    # Let's run it synchronously so we can return "done".
-    
-    result_msg = ""
-    
-    if job_req.job == JobName.SLA_ESCALATION:
-        sla_escalation_job()
-        result_msg = "SLA Escalation Job executed."
-    elif job_req.job == JobName.AUTO_CLOSE:
-        auto_close_job()
-        result_msg = "Auto-close Job executed."
-    elif job_req.job == JobName.WEEKLY_SNAPSHOT:
-        weekly_report_job()
-        result_msg = "Weekly Snapshot Job executed."
-        
-    return APIResponse(data={"message": result_msg, "job": job_req.job})
+    job = task_queue.enqueue(JOB_FUNCS[job_req.job], meta={"job": job_req.job.value})
+    if wait:
+        # Blocks on the job's result stream, not by polling
+        job.latest_result(timeout=timeout)
+    return APIResponse(data=describe_job(job))
+
+
+@router.get("/jobs/{job_id}", response_model=APIResponse[dict])
+def get_job(
+    job_id: str,
+    user: Annotated[User, Depends(require_roles(Role.ADMIN))],
+):
+    """
+    Status, duration, rows processed and error of a background job. ADMIN only.
+    """
+    try:
+        job = Job.fetch(job_id, connection=task_queue.connection)
+    except (NoSuchJobError, ValueError):
+        raise NotFound("Job not found")
+    return APIResponse(data=describe_job(job))
+
+
+@router.get("/db/pool", response_model=APIResponse[dict])
+def get_db_pool_metrics(
+    user: Annotated[User, Depends(require_roles(Role.ADMIN))],
+):
+    """
+    Connection pool state for this API process: size, checked out, overflow
+    and checkout wait times per engine. ADMIN only.
+    Multiply max_connections by the replica count when sizing Postgres.
+    """
+    return APIResponse(data=pool_metrics())
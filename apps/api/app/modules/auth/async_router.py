@@ -0,0 +1,34 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.responses import APIResponse
+from app.core.errors import NotFound
+from app.db.profiling import query_budget
+from app.db.session import get_async_db
+from app.modules.auth.deps import get_current_user_async
+from app.modules.auth.schemas import AuthMeResponse
+from app.modules.users.models import User
+from app.modules.users.schemas import UserRead
+from app.modules.workspaces.models import Workspace
+from app.modules.workspaces.schemas import WorkspaceRead
+
+router = APIRouter()
+
+
+@router.get("/me", response_model=APIResponse[AuthMeResponse])
+@query_budget(3)
+async def get_me_async(
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    workspace = await db.get(Workspace, current_user.workspace_id)
+    if not workspace:
+        raise NotFound(message="Workspace not found")
+    return APIResponse(
+        data=AuthMeResponse(
+            user=UserRead.model_validate(current_user),
+            workspace=WorkspaceRead.model_validate(workspace)
+        )
+    )
@@ -0,0 +1,123 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+import redis
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+from app.modules.users.models import User
+from app.modules.users.schemas import UserRead
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class PrincipalCache:
+    """
+    TTL cache of authenticated users, keyed by user id.
+
+    Two tiers: a per-process LRU and an optional shared Redis tier. Only the
+    UserRead fields are cached (never the password hash). Entries are dropped
+    explicitly when a user is updated, deactivated or deleted; other processes
+    see the change once their local entry expires, which is why the local TTL
+    is kept short when Redis is enabled.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        local_ttl_seconds: int,
+        max_entries: int,
+        use_redis: bool,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds if use_redis else ttl_seconds
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self._local: OrderedDict[uuid.UUID, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: uuid.UUID) -> dict[str, Any] | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry:
+                expires_at, data = entry
+                if expires_at > now:
+                    self._local.move_to_end(user_id)
+                    return data
+                del self._local[user_id]
+
+        if not self.use_redis:
+            return None
+        try:
+            raw = get_redis().get(self._key(user_id))
+        except redis.RedisError:
+            logger.warning("principal cache: redis get failed", exc_info=True)
+            return None
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        self._set_local(user_id, data)
+        return data
+
+    def set(self, user_id: uuid.UUID, data: dict[str, Any]) -> None:
+        self._set_local(user_id, data)
+        if self.use_redis:
+            try:
+                get_redis().set(self._key(user_id), json.dumps(data), ex=self.ttl_seconds)
+            except redis.RedisError:
+                logger.warning("principal cache: redis set failed", exc_info=True)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._local.pop(user_id, None)
+        if self.use_redis:
+            try:
+                get_redis().delete(self._key(user_id))
+            except redis.RedisError:
+                logger.warning("principal cache: redis delete failed", exc_info=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def _set_local(self, user_id: uuid.UUID, data: dict[str, Any]) -> None:
+        with self._lock:
+            self._local[user_id] = (time.monotonic() + self.local_ttl_seconds, data)
+            self._local.move_to_end(user_id)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _key(self, user_id: uuid.UUID) -> str:
+        return f"auth:principal:{user_id}"
+
+
+def serialize_user(user: User) -> dict[str, Any]:
+    return UserRead.model_validate(user).model_dump(mode="json")
+
+
+def attach_user(db: Session, data: dict[str, Any]) -> User:
+    """
+    Rebuild a cached user as a persistent instance of `db` without a SELECT.
+
+    The instance behaves like one loaded by the session: it is in the identity
+    map, and anything not cached (password_hash) loads lazily on access.
+    """
+    user = User(**UserRead.model_validate(data).model_dump())
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+    local_ttl_seconds=settings.auth_cache_local_ttl_seconds,
+    max_entries=settings.auth_cache_max_entries,
+    use_redis=settings.auth_cache_redis_enabled,
+)
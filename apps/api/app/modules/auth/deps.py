@@ -5,14 +5,16 @@ from fastapi import Depends, Security
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
 
 from app.core.config import get_settings
 from app.core.security import Role
 from app.core.errors import NotAuthenticated, PermissionDenied, NotFound
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.modules.users.models import User
-from app.modules.users.service import user_service
+from app.modules.users.async_repo import async_user_repo
+from app.modules.auth.cache import principal_cache, attach_user, serialize_user
 
 settings = get_settings()
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -24,6 +26,47 @@ def get_current_user(
     token: Annotated[str, Depends(reusable_oauth2)],
     db: Annotated[Session, Depends(get_db)],
 ) -> User:
+    user_id = decode_user_id(token)
+
+    # At most one SELECT per request: the principal cache first, then the
+    # session identity map / primary key lookup.
+    user_model = None
+    if settings.auth_cache_enabled:
+        cached = principal_cache.get(user_id)
+        if cached is not None:
+            user_model = attach_user(db, cached)
+
+    if user_model is None:
+        user_model = db.get(User, user_id)
+        if user_model and settings.auth_cache_enabled:
+            principal_cache.set(user_id, serialize_user(user_model))
+
+    return check_user(user_model)
+
+
+async def get_current_user_async(
+    token: Annotated[str, Depends(reusable_oauth2)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+) -> User:
+    user_id = decode_user_id(token)
+
+    user_model = None
+    if settings.auth_cache_enabled:
+        cached = principal_cache.get(user_id)
+        if cached is not None:
+            # merge(load=False) never touches the database, so the sync
+            # session behind the AsyncSession is safe to use here
+            user_model = attach_user(db.sync_session, cached)
+
+    if user_model is None:
+        user_model = await async_user_repo.get_by_id(db, user_id)
+        if user_model and settings.auth_cache_enabled:
+            principal_cache.set(user_id, serialize_user(user_model))
+
+    return check_user(user_model)
+
+
+def decode_user_id(token: str) -> uuid.UUID:
     try:
         payload = jwt.decode(
             token, settings.jwt_secret, algorithms=[settings.jwt_algorithm]
@@ -33,34 +76,25 @@ def get_current_user(
             raise NotAuthenticated(message="Could not validate credentials")
     except (JWTError, ValidationError):
         raise NotAuthenticated(message="Could not validate credentials")
-    
+
     try:
-        user_id = uuid.UUID(user_id_str)
+        return uuid.UUID(user_id_str)
     except ValueError:
-         raise NotAuthenticated(message="Invalid token subject")
-
-    user = user_service.get_user(db, user_id=user_id)
-    if not user: # Should technically use repo get_by_id directly to avoid NotFound exception converting to 404 if we want 401
-         # But user_service.get_user returns UserRead, we need Model for deps usually to check details
-         # Wait, user_service.get_user returns UserRead (Pydantic). Detailed permission checks need Model? 
-         # Let's fix user_service to have get_user_model or use repo directly here.
-         # Using repo directly is better pattern for internal auth.
-         pass
-         
-    # Better: use repo directly
-    from app.modules.users.repo import user_repo
-    user_model = user_repo.get_by_id(db, user_id)
-    
+        raise NotAuthenticated(message="Invalid token subject")
+
+
+def check_user(user_model: User | None) -> User:
     if not user_model:
         raise NotAuthenticated(message="User not found")
-        
+
     if not user_model.is_active:
-         raise PermissionDenied(message="User is inactive")
-         
+        raise PermissionDenied(message="User is inactive")
+
     return user_model
 
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUserAsync = Annotated[User, Depends(get_current_user_async)]
 
 
 def get_current_active_superuser(current_user: CurrentUser) -> User:
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
+from app.db.profiling import query_budget
 from app.modules.auth.schemas import RegisterRequest, LoginRequest, Token, AuthMeResponse
 from app.modules.auth.service import auth_service
 from app.modules.auth.deps import get_current_user
@@ -35,6 +36,7 @@ def login(
 
 
 @router.get("/me", response_model=APIResponse[AuthMeResponse])
+@query_budget(3)
 def get_me(
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
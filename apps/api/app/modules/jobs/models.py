@@ -0,0 +1,56 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class JobRun(Base):
+    """One execution of a background job, written by track_job when it ends."""
+    __tablename__ = "job_runs"
+    __table_args__ = (Index("ix_job_runs_job_started_at", "job", "started_at"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job: Mapped[str] = mapped_column(String(64), nullable=False)
+    rq_job_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Set for fan-out sub-jobs; null for runs over every workspace
+    workspace_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=True
+    )
+
+    status: Mapped[str] = mapped_column(String(16), nullable=False)  # 'success', 'failed'
+    scheduled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    duration_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    # Start minus scheduled time (or enqueue time for manual and fan-out runs)
+    lag_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    db_statements: Mapped[int] = mapped_column(Integer, nullable=False)
+    db_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    rows_processed: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Rows per phase, e.g. {"first_response_breached": 3, "escalated": 5, ...}
+    phases: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class JobRunTotal(Base):
+    """
+    Running totals per (job, status), updated with every job_runs insert;
+    /metrics reads these counters because old job_runs rows are pruned.
+    """
+    __tablename__ = "job_run_totals"
+
+    job: Mapped[str] = mapped_column(String(64), primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), primary_key=True)
+
+    runs: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    duration_seconds: Mapped[float] = mapped_column(
+        Float, default=0, server_default="0", nullable=False
+    )
+    rows_processed: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from app.modules.jobs.models import JobRun, JobRunTotal
+
+
+class JobRunRepo:
+    def create(self, db: Session, prune_before: datetime | None = None, **fields) -> JobRun:
+        """
+        Insert the run, add it to job_run_totals and, with prune_before,
+        delete this job's runs that started earlier, all in one transaction.
+        """
+        run = JobRun(**fields)
+        db.add(run)
+
+        stmt = insert(JobRunTotal).values(
+            job=run.job,
+            status=run.status,
+            runs=1,
+            duration_seconds=run.duration_seconds,
+            rows_processed=run.rows_processed or 0,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobRunTotal.job, JobRunTotal.status],
+            set_={
+                counter: getattr(JobRunTotal, counter) + getattr(stmt.excluded, counter)
+                for counter in ("runs", "duration_seconds", "rows_processed")
+            },
+        )
+        db.execute(stmt)
+
+        if prune_before is not None:
+            # Range on ix_job_runs_job_started_at
+            db.execute(
+                delete(JobRun)
+                .where(JobRun.job == run.job, JobRun.started_at < prune_before)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        return run
+
+    def latest_per_job(self, db: Session) -> list[JobRun]:
+        """
+        Most recent run of every job (fan-out sub-jobs included): one
+        backward ix_job_runs_job_started_at probe per job in job_run_totals.
+        """
+        jobs = select(JobRunTotal.job).distinct().subquery()
+        latest = (
+            select(JobRun)
+            .where(JobRun.job == jobs.c.job)
+            .order_by(JobRun.started_at.desc())
+            .limit(1)
+            .lateral()
+        )
+        run = aliased(JobRun, latest)
+        stmt = select(run).select_from(jobs).join(latest, true()).order_by(run.job)
+        return list(db.execute(stmt).scalars())
+
+    def totals(self, db: Session) -> list[JobRunTotal]:
+        """(job, status, runs, duration_seconds, rows_processed) over every run ever recorded."""
+        stmt = select(JobRunTotal).order_by(JobRunTotal.job, JobRunTotal.status)
+        return list(db.execute(stmt).scalars())
+
+
+job_run_repo = JobRunRepo()
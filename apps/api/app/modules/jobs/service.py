@@ -0,0 +1,153 @@
+import functools
+import logging
+import time
+import traceback
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from rq import get_current_job
+
+from app.core.config import get_settings
+from app.db.profiling import profile_queries
+from app.db.session import SessionLocal
+from app.modules.jobs.repo import job_run_repo
+
+logger = logging.getLogger(__name__)
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    # RQ timestamps are naive UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def scheduled_time(rq_job) -> datetime | None:
+    """When the run was meant to start: the scheduler's due time, else when it was enqueued."""
+    if rq_job is None:
+        return None
+    scheduled_at = rq_job.meta.get("scheduled_at")
+    if scheduled_at:
+        return datetime.fromisoformat(scheduled_at)
+    return _utc(rq_job.enqueued_at)
+
+
+def track_job(name: str, rows: Callable[[object], int | None] | None = None):
+    """
+    Record every run of the decorated job in job_runs: wall time, DB
+    statement count and time, rows per phase (a dict return value) and
+    total (rows(result)), and the lag between scheduled and actual start.
+    Runs older than JOB_RUNS_RETENTION_DAYS are pruned as new ones land.
+    Recording never fails the job.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rq_job = get_current_job()
+            started_at = datetime.now(timezone.utc)
+            started = time.perf_counter()
+            outcome = {"status": "failed", "error": None, "result": None}
+            try:
+                with profile_queries(name) as queries:
+                    outcome["result"] = func(*args, **kwargs)
+                outcome["status"] = "success"
+                return outcome["result"]
+            except Exception:
+                outcome["error"] = traceback.format_exc()
+                raise
+            finally:
+                _record(
+                    name, rq_job, kwargs.get("workspace_id"), started_at,
+                    time.perf_counter() - started, queries, outcome, rows,
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def _record(name, rq_job, workspace_id, started_at, duration, queries, outcome, rows) -> None:
+    result = outcome["result"]
+    scheduled_at = scheduled_time(rq_job)
+    lag = (started_at - scheduled_at).total_seconds() if scheduled_at else None
+    rows_processed = rows(result) if rows and outcome["status"] == "success" else None
+    logger.info(
+        "job %s %s in %.3fs lag=%s statements=%d db=%.3fs rows=%s",
+        name, outcome["status"], duration, f"{lag:.1f}s" if lag is not None else "-",
+        queries.count, queries.seconds, rows_processed,
+    )
+
+    db = SessionLocal()
+    try:
+        job_run_repo.create(
+            db,
+            prune_before=started_at - timedelta(days=get_settings().job_runs_retention_days),
+            job=name,
+            rq_job_id=rq_job.id if rq_job else None,
+            workspace_id=workspace_id,
+            status=outcome["status"],
+            scheduled_at=scheduled_at,
+            started_at=started_at,
+            finished_at=datetime.now(timezone.utc),
+            duration_seconds=duration,
+            lag_seconds=lag,
+            db_statements=queries.count,
+            db_seconds=queries.seconds,
+            rows_processed=rows_processed,
+            phases=result if isinstance(result, dict) else None,
+            error=outcome["error"],
+        )
+    except Exception:
+        logger.exception("Could not record run of job %s", name)
+    finally:
+        db.close()
+
+
+def collect_job_metrics():
+    """
+    /metrics collector: job runs live in the database because jobs run in
+    forked RQ work-horses. Counters come from job_run_totals, gauges from
+    the latest run of each job; neither scans job_runs.
+    """
+    db = SessionLocal()
+    try:
+        totals = job_run_repo.totals(db)
+        latest = job_run_repo.latest_per_job(db)
+    finally:
+        db.close()
+
+    yield ("helpdesk_job_runs_total", "counter", "Job runs by outcome",
+           [({"job": r.job, "status": r.status}, r.runs) for r in totals])
+    yield ("helpdesk_job_duration_seconds_total", "counter", "Wall time spent in jobs",
+           [({"job": r.job, "status": r.status}, r.duration_seconds) for r in totals])
+    yield ("helpdesk_job_rows_processed_total", "counter", "Rows written by successful job runs",
+           [({"job": r.job, "status": r.status}, r.rows_processed)
+            for r in totals if r.status == "success"])
+
+    last = {
+        "helpdesk_job_last_run_timestamp_seconds": (
+            "Start of the latest run", lambda r: r.started_at.timestamp()
+        ),
+        "helpdesk_job_last_success": (
+            "1 if the latest run succeeded", lambda r: int(r.status == "success")
+        ),
+        "helpdesk_job_last_duration_seconds": (
+            "Wall time of the latest run", lambda r: r.duration_seconds
+        ),
+        "helpdesk_job_last_lag_seconds": (
+            "Scheduled-to-start delay of the latest run", lambda r: r.lag_seconds
+        ),
+        "helpdesk_job_last_db_statements": (
+            "SQL statements in the latest run", lambda r: r.db_statements
+        ),
+        "helpdesk_job_last_db_seconds": (
+            "Time in SQL during the latest run", lambda r: r.db_seconds
+        ),
+        "helpdesk_job_last_rows_processed": (
+            "Rows written by the latest run", lambda r: r.rows_processed
+        ),
+    }
+    for metric, (help, value) in last.items():
+        samples = [({"job": r.job}, value(r)) for r in latest]
+        yield (metric, "gauge", help, [(labels, v) for labels, v in samples if v is not None])
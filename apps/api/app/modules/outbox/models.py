@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Identity, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class OutboxEvent(Base):
+    """
+    A domain event, inserted in the transaction of the change it describes
+    and deleted by the relay (app.outbox_relay) once delivered.
+    """
+    __tablename__ = "outbox_events"
+
+    # Insertion order: the relay delivers oldest first
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False
+    )
+    # 'ticket.status', 'sla.breached'
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    # {"ticket_ids": [...]}, one row for every ticket a change touched, plus
+    # the "counters" and "audit" entries the relay writes, if any
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
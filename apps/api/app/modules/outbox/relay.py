@@ -0,0 +1,133 @@
+import json
+import logging
+import uuid
+from collections.abc import Callable
+
+import redis
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.http_cache import change_versions
+from app.core.redis import get_redis
+from app.db.session import SessionLocal
+from app.modules.audit.models import AuditLog
+from app.modules.outbox.repo import outbox_repo
+from app.modules.realtime.events import ticket_events
+from app.modules.reports.service import report_service
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Downstream consumers (webhooks, search indexing, ...) read this stream
+# with XREADGROUP; entries carry the outbox id to dedupe redeliveries
+STREAM = "outbox:events"
+
+Handler = Callable[[list[dict]], None]
+# Writes to the database, in the transaction that claims the batch
+DbHandler = Callable[[Session, list[dict]], None]
+
+
+def publish_realtime(events: list[dict]) -> None:
+    for event in events:
+        ticket_events.publish(
+            event["workspace_id"], event["event_type"], event["payload"]["ticket_ids"]
+        )
+
+
+def apply_deltas(db: Session, events: list[dict]) -> None:
+    """Report counters and audit entries the batch carries, one statement per table."""
+    report_service.apply_counters(db, events)
+    audit = [
+        {
+            "id": uuid.uuid4(),
+            "workspace_id": event["workspace_id"],
+            "actor_user_id": uuid.UUID(entry["actor_user_id"]) if entry["actor_user_id"] else None,
+            "entity_type": entry["entity_type"],
+            "entity_id": uuid.UUID(entry["entity_id"]),
+            "action": entry["action"],
+            "meta": entry["meta"],
+            # When the change committed, not when it was relayed
+            "created_at": event["created_at"],
+        }
+        for event in events
+        for entry in event["payload"].get("audit", [])
+    ]
+    if audit:
+        db.execute(insert(AuditLog), audit)
+
+
+class OutboxRelay:
+    """
+    Delivers committed outbox events in batches, oldest first.
+
+    Each batch is claimed (deleted) in a transaction, written by the
+    db_handlers in that same transaction, appended to the Redis stream in
+    one pipeline and passed to the in-process handlers; the delete commits
+    only after all of that succeeded. Delivery is therefore at least once:
+    a crash between the publish and the commit sends the batch again. What
+    the db_handlers write commits or rolls back with the claim, so it is
+    applied exactly once. Several relays can run, each claims different
+    rows.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        client: redis.Redis | None = None,
+        batch_size: int = 500,
+        stream_maxlen: int = 100_000,
+        handlers: list[Handler] | None = None,
+        db_handlers: list[DbHandler] | None = None,
+    ):
+        self.session_factory = session_factory
+        self._client = client
+        self.batch_size = batch_size
+        self.stream_maxlen = stream_maxlen
+        self.handlers = handlers if handlers is not None else [publish_realtime]
+        self.db_handlers = db_handlers if db_handlers is not None else [apply_deltas]
+
+    @property
+    def client(self) -> redis.Redis:
+        return self._client or get_redis()
+
+    def process(self) -> int:
+        """Deliver one batch; returns how many events it had."""
+        db = self.session_factory()
+        try:
+            events = outbox_repo.claim(db, self.batch_size)
+            if not events:
+                db.rollback()
+                return 0
+            for db_handler in self.db_handlers:
+                db_handler(db, events)
+            pipe = self.client.pipeline(transaction=False)
+            for event in events:
+                pipe.xadd(STREAM, self.entry(event), maxlen=self.stream_maxlen, approximate=True)
+            pipe.execute()
+            for handler in self.handlers:
+                handler(events)
+            db.commit()
+        finally:
+            db.close()
+        # Weekly reports are cached on the workspace version: they just changed
+        change_versions.changed_many(
+            event["workspace_id"] for event in events if "counters" in event["payload"]
+        )
+        logger.debug("outbox: relayed %d events", len(events))
+        return len(events)
+
+    def entry(self, event: dict) -> dict[str, str]:
+        return {
+            "id": str(event["id"]),
+            "workspace_id": str(event["workspace_id"]),
+            "type": event["event_type"],
+            "payload": json.dumps(event["payload"]),
+            "created_at": event["created_at"].isoformat(),
+        }
+
+
+outbox_relay = OutboxRelay(
+    batch_size=settings.outbox_batch_size,
+    stream_maxlen=settings.outbox_stream_maxlen,
+)
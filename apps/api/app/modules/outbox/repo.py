@@ -0,0 +1,82 @@
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.modules.outbox.models import OutboxEvent
+
+
+class OutboxRepo:
+    def add(
+        self,
+        db: Session | AsyncSession,
+        workspace_id: uuid.UUID,
+        event_type: str,
+        ticket_ids: Iterable[uuid.UUID],
+        counters: dict | None = None,
+        audit: list[dict] | None = None,
+    ) -> None:
+        """
+        Queue an event in the caller's transaction: it exists if and only if
+        the change commits. counters (ReportService.*_counters) and audit
+        entries ride along and are written by the relay.
+        """
+        ids = [str(t) for t in ticket_ids]
+        if not ids:
+            return
+        payload: dict = {"ticket_ids": ids}
+        if counters:
+            payload["counters"] = counters
+        if audit:
+            payload["audit"] = audit
+        db.add(OutboxEvent(workspace_id=workspace_id, event_type=event_type, payload=payload))
+
+    def add_rows(
+        self,
+        db: Session,
+        event_type: str,
+        rows: Iterable[tuple[uuid.UUID, uuid.UUID]],
+        counters: dict[uuid.UUID, dict] | None = None,
+    ) -> None:
+        """
+        add() for (workspace_id, ticket_id) pairs that span workspaces: one
+        event per workspace, with that workspace's counters.
+        """
+        by_workspace = defaultdict(list)
+        for workspace_id, ticket_id in rows:
+            by_workspace[workspace_id].append(ticket_id)
+        for workspace_id, ticket_ids in by_workspace.items():
+            self.add(
+                db, workspace_id, event_type, ticket_ids, (counters or {}).get(workspace_id)
+            )
+
+    def claim(self, db: Session, limit: int) -> list[dict]:
+        """
+        Remove and return the oldest `limit` events, as dicts. Rows locked by
+        another relay are skipped; a rollback puts the batch back.
+        """
+        oldest = (
+            select(OutboxEvent.id)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            delete(OutboxEvent)
+            .where(OutboxEvent.id.in_(oldest.scalar_subquery()))
+            .returning(
+                OutboxEvent.id,
+                OutboxEvent.workspace_id,
+                OutboxEvent.event_type,
+                OutboxEvent.payload,
+                OutboxEvent.created_at,
+            )
+        )
+        rows = db.execute(stmt, execution_options={"synchronize_session": False}).all()
+        return sorted((row._asdict() for row in rows), key=lambda event: event["id"])
+
+
+outbox_repo = OutboxRepo()
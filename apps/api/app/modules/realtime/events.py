@@ -0,0 +1,88 @@
+import json
+import logging
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+import redis
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+CHANNEL_PREFIX = "events:ws:"
+
+TICKET_CREATED = "ticket.created"
+TICKET_MESSAGE = "ticket.message"
+TICKET_STATUS = "ticket.status"
+TICKET_ASSIGNED = "ticket.assigned"
+TICKET_TAGS = "ticket.tags"
+# Several fields at once (bulk updates)
+TICKET_UPDATED = "ticket.updated"
+SLA_BREACHED = "sla.breached"
+SLA_ESCALATED = "sla.escalated"
+
+
+def channel_for(workspace_id: uuid.UUID) -> str:
+    return f"{CHANNEL_PREFIX}{workspace_id}"
+
+
+class TicketEvents:
+    """
+    Publishes "these tickets changed" to the workspace's Redis channel, for
+    the SSE clients of every API process (app.modules.realtime.hub).
+
+    Events carry ids only: clients fetch what changed through the API, with
+    its access checks (GET /tickets?updated_since=..., GET /tickets/{id}).
+    Called by the outbox relay for committed events; services write them
+    with outbox_repo.add(). Pub/sub is fire and forget, so a failed publish
+    is logged and the client catches up on its next fetch.
+    """
+
+    def __init__(self, client: redis.Redis | None = None):
+        self._client = client
+
+    @property
+    def client(self) -> redis.Redis:
+        return self._client or get_redis()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.realtime_enabled
+
+    def publish(
+        self, workspace_id: uuid.UUID, event_type: str, ticket_ids: Iterable[uuid.UUID]
+    ) -> None:
+        if not self.enabled:
+            return
+        ids = [str(t) for t in ticket_ids]
+        if not ids:
+            return
+        payload = json.dumps(
+            {"type": event_type, "ticket_ids": ids, "at": datetime.now(timezone.utc).isoformat()}
+        )
+        try:
+            self.client.publish(channel_for(workspace_id), payload)
+        except redis.RedisError:
+            logger.warning(
+                "realtime: could not publish %s for workspace %s",
+                event_type,
+                workspace_id,
+                exc_info=True,
+            )
+
+    def publish_rows(self, event_type: str, rows: Iterable[tuple[uuid.UUID, uuid.UUID]]) -> None:
+        """publish() for (workspace_id, ticket_id) pairs that span workspaces."""
+        if not self.enabled:
+            return
+        by_workspace = defaultdict(list)
+        for workspace_id, ticket_id in rows:
+            by_workspace[workspace_id].append(ticket_id)
+        for workspace_id, ticket_ids in by_workspace.items():
+            self.publish(workspace_id, event_type, ticket_ids)
+
+
+ticket_events = TicketEvents()
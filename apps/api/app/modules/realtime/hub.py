@@ -0,0 +1,122 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import get_settings
+from app.modules.realtime.events import CHANNEL_PREFIX
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Sent when a client may have missed events (slow client, lost subscription)
+RESYNC = "resync"
+RECONNECT_DELAY_SECONDS = 1
+
+
+def sse_frame(event_type: str, data: str) -> bytes:
+    return f"event: {event_type}\ndata: {data}\n\n".encode()
+
+
+RESYNC_FRAME = sse_frame(RESYNC, "{}")
+
+
+class RealtimeHub:
+    """
+    Fans workspace events out to this process's SSE clients.
+
+    One pattern subscription (events:ws:*) per process, whatever the number
+    of clients: each message is turned into an SSE frame once and put on
+    the bounded queue of every client of its workspace. A client that
+    can't keep up loses its backlog and gets a single resync frame instead
+    of holding memory or slowing the others down.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._clients: dict[uuid.UUID, set[asyncio.Queue]] = defaultdict(set)
+        self._listener: asyncio.Task | None = None
+
+    @asynccontextmanager
+    async def subscribe(self, workspace_id: uuid.UUID) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue[bytes] = asyncio.Queue(self.queue_size)
+        self._clients[workspace_id].add(queue)
+        self._ensure_listener()
+        try:
+            yield queue
+        finally:
+            clients = self._clients.get(workspace_id)
+            if clients is not None:
+                clients.discard(queue)
+                if not clients:
+                    del self._clients[workspace_id]
+
+    def clients(self, workspace_id: uuid.UUID) -> int:
+        return len(self._clients.get(workspace_id, ()))
+
+    def dispatch(self, workspace_id: uuid.UUID, payload: str) -> None:
+        queues = self._clients.get(workspace_id)
+        if not queues:
+            return
+        try:
+            event_type = json.loads(payload)["type"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("realtime: ignoring malformed event on workspace %s", workspace_id)
+            return
+        frame = sse_frame(event_type, payload)
+        for queue in queues:
+            self._put(queue, frame)
+
+    def broadcast(self, frame: bytes) -> None:
+        for queues in self._clients.values():
+            for queue in queues:
+                self._put(queue, frame)
+
+    def _put(self, queue: asyncio.Queue, frame: bytes) -> None:
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC_FRAME)
+
+    def _ensure_listener(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        # No socket timeout: the subscription is idle between events
+        client = aioredis.from_url(
+            settings.redis_url, socket_connect_timeout=settings.redis_socket_timeout_seconds
+        )
+        try:
+            while True:
+                try:
+                    async with client.pubsub() as pubsub:
+                        await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                        async for message in pubsub.listen():
+                            if message["type"] != "pmessage":
+                                continue
+                            channel = message["channel"].decode()
+                            try:
+                                workspace_id = uuid.UUID(channel.removeprefix(CHANNEL_PREFIX))
+                            except ValueError:
+                                continue
+                            self.dispatch(workspace_id, message["data"].decode())
+                except (redis.RedisError, OSError):
+                    logger.warning("realtime: subscription lost, reconnecting", exc_info=True)
+                    # Whatever was published meanwhile is gone
+                    self.broadcast(RESYNC_FRAME)
+                    await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+        finally:
+            await client.aclose()
+
+
+realtime_hub = RealtimeHub(queue_size=settings.realtime_queue_size)
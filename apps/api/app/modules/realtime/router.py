@@ -0,0 +1,67 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.errors import BadRequest, NotAuthenticated, PermissionDenied
+from app.core.security import Role
+from app.db.session import get_db
+from app.modules.auth.deps import get_current_user
+from app.modules.realtime.hub import realtime_hub
+from app.modules.users.models import User
+
+router = APIRouter()
+settings = get_settings()
+optional_oauth2 = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
+
+# How long a browser waits before reconnecting a dropped stream
+RETRY_MS = 3000
+
+
+def stream_user(
+    db: Annotated[Session, Depends(get_db)],
+    token: Annotated[str | None, Depends(optional_oauth2)],
+    access_token: Annotated[str | None, Query()] = None,
+) -> User:
+    # EventSource can't send headers: the token may come as ?access_token=
+    if not (token or access_token):
+        raise NotAuthenticated()
+    user = get_current_user(token or access_token, db)
+    if user.role not in [Role.ADMIN, Role.AGENT]:
+        raise PermissionDenied(message="Not enough privileges")
+    # The stream outlives the request: don't hold a pooled connection for it
+    db.close()
+    return user
+
+
+async def event_stream(user: User) -> AsyncIterator[bytes]:
+    async with realtime_hub.subscribe(user.workspace_id) as queue:
+        yield f"retry: {RETRY_MS}\n\n".encode()
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), settings.realtime_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+
+
+@router.get("", response_class=StreamingResponse)
+async def stream_events(user: Annotated[User, Depends(stream_user)]):
+    """
+    Server-sent events for the caller's workspace (agents and admins):
+    `event: ticket.status`, `data: {"type", "ticket_ids", "at"}`. Fetch
+    the changes with GET /tickets?updated_since=... or GET /tickets/{id};
+    on `resync` (or after reconnecting) refetch the list.
+    """
+    if not settings.realtime_enabled:
+        raise BadRequest(message="Realtime events are disabled (REALTIME_ENABLED)")
+    return StreamingResponse(
+        event_stream(user),
+        media_type="text/event-stream",
+        # No proxy buffering (nginx), no caching
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
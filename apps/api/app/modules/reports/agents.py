@@ -3,15 +3,15 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
 
 from app.db.session import get_db
 from app.core.security import Role
 from app.modules.auth.deps import get_current_user, require_roles
 from app.modules.users.models import User
-from app.modules.tickets.models import Ticket, TicketStatus, TicketMessage
+from app.modules.tickets.models import OPEN_STATUSES, Ticket, TicketMessage, status_in
 from app.modules.sla.models import TicketSLA
 from app.common.responses import APIResponse
+from app.modules.reports.repo import report_repo
 
 router = APIRouter()
 
@@ -26,15 +26,13 @@ def get_my_stats(
     # 1. My Open Assigned
     open_count = db.query(Ticket).filter(
         Ticket.assigned_agent_id == user.id,
-        Ticket.status.in_([TicketStatus.OPEN, TicketStatus.PENDING, TicketStatus.NEW])
+        status_in(OPEN_STATUSES)
     ).count()
     
-    # 2. Resolved This Week
-    resolved_count = db.query(Ticket).filter(
-        Ticket.assigned_agent_id == user.id,
-        Ticket.status.in_([TicketStatus.RESOLVED, TicketStatus.CLOSED]),
-        Ticket.updated_at >= one_week_ago # Proxy for resolution time if we don't track state change events explicitly
-    ).count()
+    # 2. Resolved This Week (daily counters, last 7 days)
+    resolved_count = report_repo.agent_resolved(
+        db, user.workspace_id, user.id, now.date() - timedelta(days=6)
+    )
     
     # 3. Breaches involved (Assigned to ticket that breached)
     # Joining TicketSLA -> Ticket
@@ -59,26 +57,19 @@ def get_leaderboard(
     user: Annotated[User, Depends(require_roles(Role.ADMIN, Role.AGENT))],
     db: Annotated[Session, Depends(get_db)],
 ):
-    # Top Agents by Resolved Tickets (All time or this week? Let's do all time for demo data density)
-    # Group by assigned_agent_id
-    
-    results = db.query(
-        User.id,
-        User.full_name,
-        func.count(Ticket.id).label("resolved_count")
-    ).join(Ticket, Ticket.assigned_agent_id == User.id)\
-     .filter(Ticket.status.in_([TicketStatus.RESOLVED, TicketStatus.CLOSED]))\
-     .group_by(User.id)\
-     .order_by(desc("resolved_count"))\
-     .limit(5)\
-     .all()
-     
+    # Top Agents by Resolved Tickets (all time, this workspace) from the daily counters
+    leaders = report_repo.top_agents(db, [user.workspace_id], limit=5).get(user.workspace_id, [])
+    names = {}
+    if leaders:
+        agent_ids = [agent_id for agent_id, _ in leaders]
+        names = dict(db.query(User.id, User.full_name).filter(User.id.in_(agent_ids)).all())
+
     data = []
-    for r in results:
+    for agent_id, resolved in leaders:
         data.append({
-            "agent_id": r.id,
-            "name": r.full_name,
-            "score": r.resolved_count,
+            "agent_id": agent_id,
+            "name": names.get(agent_id),
+            "score": resolved,
             "metric": "Resolved Tickets"
         })
         
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone, date
 
-from sqlalchemy import Date, ForeignKey, DateTime
+from sqlalchemy import Date, ForeignKey, DateTime, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
@@ -21,3 +21,45 @@ class WeeklyReportSnapshot(Base):
     )
     
     # Unique Constraint on workspace + week_start_date is recommended in DB migration
+
+
+class WorkspaceDailyStats(Base):
+    """
+    Per-workspace, per-day (UTC) counters maintained at write time; the
+    weekly report sums at most seven of these rows instead of scanning tickets.
+    """
+    __tablename__ = "workspace_daily_stats"
+
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("workspaces.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    tickets_created: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    tickets_resolved: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    first_response_breaches: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    resolution_breaches: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
+
+class AgentDailyStats(Base):
+    __tablename__ = "agent_daily_stats"
+
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("workspaces.id", ondelete="CASCADE"), primary_key=True
+    )
+    agent_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    tickets_resolved: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
@@ -1 +1,143 @@
-# Repository placeholder for reports.
+import uuid
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.modules.reports.models import AgentDailyStats, WeeklyReportSnapshot, WorkspaceDailyStats
+from app.modules.workspaces.models import Workspace
+
+WORKSPACE_COUNTERS = (
+    "tickets_created",
+    "tickets_resolved",
+    "first_response_breaches",
+    "resolution_breaches",
+)
+AGENT_COUNTERS = ("tickets_resolved",)
+
+
+class ReportRepo:
+    def increment_workspace_stats(self, db: Session, rows: list[dict]) -> None:
+        """rows: {"workspace_id", "day", <counter>: delta, ...}"""
+        self._upsert(db, WorkspaceDailyStats, ("workspace_id", "day"), WORKSPACE_COUNTERS, rows)
+
+    def increment_agent_stats(self, db: Session, rows: list[dict]) -> None:
+        """rows: {"workspace_id", "agent_id", "day", "tickets_resolved": delta}"""
+        self._upsert(db, AgentDailyStats, ("workspace_id", "agent_id", "day"), AGENT_COUNTERS, rows)
+
+    def _upsert(
+        self, db: Session, model, keys: tuple[str, ...], counters: tuple[str, ...], rows: list[dict]
+    ) -> None:
+        # Fold duplicates first (ON CONFLICT can't touch a row twice in one
+        # statement) and write in key order so concurrent writers take the
+        # row locks in the same order.
+        totals: dict[tuple, dict[str, int]] = defaultdict(lambda: dict.fromkeys(counters, 0))
+        for row in rows:
+            key = tuple(row[k] for k in keys)
+            for counter in counters:
+                totals[key][counter] += row.get(counter, 0)
+        if not totals:
+            return
+
+        values = [
+            {**dict(zip(keys, key)), **deltas}
+            for key, deltas in sorted(
+                totals.items(), key=lambda item: tuple(str(k) for k in item[0])
+            )
+        ]
+        stmt = insert(model).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={
+                counter: getattr(model, counter) + getattr(stmt.excluded, counter)
+                for counter in counters
+            },
+        )
+        db.execute(stmt)
+
+    def workspace_totals(
+        self, db: Session, start: date, end: date, workspace_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, dict[str, int]]:
+        """Summed counters per workspace for start <= day < end."""
+        stmt = (
+            select(
+                WorkspaceDailyStats.workspace_id,
+                *[func.sum(getattr(WorkspaceDailyStats, c)).label(c) for c in WORKSPACE_COUNTERS],
+            )
+            .where(
+                WorkspaceDailyStats.workspace_id.in_(workspace_ids),
+                WorkspaceDailyStats.day >= start,
+                WorkspaceDailyStats.day < end,
+            )
+            .group_by(WorkspaceDailyStats.workspace_id)
+        )
+        return {
+            row.workspace_id: {c: int(getattr(row, c)) for c in WORKSPACE_COUNTERS}
+            for row in db.execute(stmt)
+        }
+
+    def top_agents(
+        self,
+        db: Session,
+        workspace_ids: list[uuid.UUID],
+        limit: int,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> dict[uuid.UUID, list[tuple[uuid.UUID, int]]]:
+        """Top agents by resolved tickets per workspace, optionally within start <= day < end."""
+        resolved = func.sum(AgentDailyStats.tickets_resolved)
+        ranked = (
+            select(
+                AgentDailyStats.workspace_id,
+                AgentDailyStats.agent_id,
+                resolved.label("resolved"),
+                func.row_number().over(
+                    partition_by=AgentDailyStats.workspace_id,
+                    order_by=(desc(resolved), AgentDailyStats.agent_id),
+                ).label("rank"),
+            )
+            .where(AgentDailyStats.workspace_id.in_(workspace_ids))
+            .group_by(AgentDailyStats.workspace_id, AgentDailyStats.agent_id)
+        )
+        if start is not None:
+            ranked = ranked.where(AgentDailyStats.day >= start)
+        if end is not None:
+            ranked = ranked.where(AgentDailyStats.day < end)
+        ranked = ranked.subquery()
+
+        stmt = (
+            select(ranked.c.workspace_id, ranked.c.agent_id, ranked.c.resolved)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.workspace_id, ranked.c.rank)
+        )
+        leaders: dict[uuid.UUID, list[tuple[uuid.UUID, int]]] = defaultdict(list)
+        for row in db.execute(stmt):
+            leaders[row.workspace_id].append((row.agent_id, int(row.resolved)))
+        return leaders
+
+    def workspaces_without_snapshot(
+        self, db: Session, week_start: date, workspace_id: uuid.UUID | None = None
+    ) -> list[uuid.UUID]:
+        has_snapshot = select(WeeklyReportSnapshot.id).where(
+            WeeklyReportSnapshot.workspace_id == Workspace.id,
+            WeeklyReportSnapshot.week_start_date == week_start,
+        ).exists()
+        stmt = select(Workspace.id).where(~has_snapshot)
+        if workspace_id is not None:
+            stmt = stmt.where(Workspace.id == workspace_id)
+        return list(db.execute(stmt).scalars())
+
+    def agent_resolved(
+        self, db: Session, workspace_id: uuid.UUID, agent_id: uuid.UUID, start: date
+    ) -> int:
+        return db.scalar(
+            select(func.coalesce(func.sum(AgentDailyStats.tickets_resolved), 0)).where(
+                AgentDailyStats.workspace_id == workspace_id,
+                AgentDailyStats.agent_id == agent_id,
+                AgentDailyStats.day >= start,
+            )
+        )
+
+report_repo = ReportRepo()
@@ -1 +1,153 @@
-# Service placeholder for reports.
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.modules.reports.repo import WORKSPACE_COUNTERS, report_repo
+from app.modules.tickets.models import Ticket, TicketStatus
+
+RESOLVED_STATUSES = {TicketStatus.RESOLVED, TicketStatus.CLOSED}
+LEADERBOARD_SIZE = 5
+
+
+class ReportService:
+    """
+    Daily counters, so reports never scan tickets. Requests don't write
+    them: the *_counters methods build the deltas of a change, which ride
+    on its outbox event (payload "counters") and are applied in bulk by
+    the outbox relay, in the transaction that claims the batch. Each delta
+    is therefore applied exactly once, and the hot counter rows are locked
+    by the relay alone. Counters record events: a ticket resolved,
+    reopened and resolved again counts twice. Days are UTC dates.
+    """
+
+    def created_counters(self, ticket: Ticket) -> dict:
+        return self._counters([{"day": ticket.created_at.date(), "tickets_created": 1}])
+
+    def status_change_counters(
+        self,
+        ticket: Ticket,
+        old_status: TicketStatus,
+        new_status: TicketStatus,
+        when: datetime,
+    ) -> dict | None:
+        # Only the move into resolved/closed counts; RESOLVED -> CLOSED is the same resolution
+        if old_status in RESOLVED_STATUSES or new_status not in RESOLVED_STATUSES:
+            return None
+        return self.resolution_counters([ticket.assigned_agent_id], when)
+
+    def resolution_counters(self, assignees: list[uuid.UUID | None], when: datetime) -> dict:
+        """assignees: assigned_agent_id per ticket of the workspace that just got resolved."""
+        day = when.date()
+        return self._counters(
+            [{"day": day, "tickets_resolved": len(assignees)}] if assignees else [],
+            [
+                {"agent_id": agent_id, "day": day, "tickets_resolved": count}
+                for agent_id, count in Counter(assignees).items()
+                if agent_id is not None
+            ],
+        )
+
+    def imported_counters(self, tickets: list[dict]) -> dict:
+        """
+        Counters for imported tickets of one workspace, on the days things
+        happened rather than today: {"assigned_agent_id", "created_at",
+        "resolved_at", "first_response_breached_at", "resolution_breached_at"}
+        per ticket, the last three None when they didn't happen.
+        """
+        rows, agent_rows = [], []
+        for t in tickets:
+            rows.append({"day": t["created_at"].date(), "tickets_created": 1})
+            if t["resolved_at"] is not None:
+                day = t["resolved_at"].date()
+                rows.append({"day": day, "tickets_resolved": 1})
+                if t["assigned_agent_id"] is not None:
+                    agent_rows.append({
+                        "agent_id": t["assigned_agent_id"], "day": day, "tickets_resolved": 1,
+                    })
+            for counter in ("first_response_breaches", "resolution_breaches"):
+                at = t[counter.replace("breaches", "breached_at")]
+                if at is not None:
+                    rows.append({"day": at.date(), counter: 1})
+        return self._counters(rows, agent_rows)
+
+    def breach_counters(
+        self, first_response: list[uuid.UUID], resolution: list[uuid.UUID], when: datetime
+    ) -> dict[uuid.UUID, dict]:
+        """
+        Workspace id of every SLA that was just flagged, per breach type;
+        returns the counters of each workspace.
+        """
+        day = when.date()
+        fr_counts, res_counts = Counter(first_response), Counter(resolution)
+        return {
+            workspace_id: self._counters([{
+                "day": day,
+                "first_response_breaches": fr_counts[workspace_id],
+                "resolution_breaches": res_counts[workspace_id],
+            }])
+            for workspace_id in fr_counts.keys() | res_counts.keys()
+        }
+
+    def apply_counters(self, db: Session, events: list[dict]) -> None:
+        """The counters of a batch of claimed outbox events: one upsert per table."""
+        rows, agent_rows = [], []
+        for event in events:
+            counters = event["payload"].get("counters") or {}
+            workspace_id = event["workspace_id"]
+            rows += [
+                {**row, "workspace_id": workspace_id, "day": date.fromisoformat(row["day"])}
+                for row in counters.get("workspace", [])
+            ]
+            agent_rows += [
+                {
+                    **row,
+                    "workspace_id": workspace_id,
+                    "agent_id": uuid.UUID(row["agent_id"]),
+                    "day": date.fromisoformat(row["day"]),
+                }
+                for row in counters.get("agents", [])
+            ]
+        report_repo.increment_workspace_stats(db, rows)
+        report_repo.increment_agent_stats(db, agent_rows)
+
+    def _counters(self, rows: list[dict], agent_rows: Iterable[dict] = ()) -> dict:
+        # JSON for the outbox payload; the workspace is the event's
+        return {
+            "workspace": [{**row, "day": row["day"].isoformat()} for row in rows],
+            "agents": [
+                {**row, "agent_id": str(row["agent_id"]), "day": row["day"].isoformat()}
+                for row in agent_rows
+            ],
+        }
+
+    def weekly_reports(
+        self, db: Session, week_start: date, workspace_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, dict]:
+        """Report payloads for several workspaces in two queries over the counter tables."""
+        week_end = week_start + timedelta(days=7)
+        totals = report_repo.workspace_totals(db, week_start, week_end, workspace_ids)
+        leaders = report_repo.top_agents(db, workspace_ids, LEADERBOARD_SIZE, week_start, week_end)
+
+        reports = {}
+        for workspace_id in workspace_ids:
+            counts = totals.get(workspace_id, dict.fromkeys(WORKSPACE_COUNTERS, 0))
+            reports[workspace_id] = {
+                "tickets_created": counts["tickets_created"],
+                "tickets_resolved": counts["tickets_resolved"],
+                "sla_breaches": counts["first_response_breaches"] + counts["resolution_breaches"],
+                "first_response_breaches": counts["first_response_breaches"],
+                "resolution_breaches": counts["resolution_breaches"],
+                "agent_leaderboard": [
+                    {"agent_id": str(agent_id), "resolved": resolved}
+                    for agent_id, resolved in leaders.get(workspace_id, [])
+                ],
+            }
+        return reports
+
+    def weekly_report(self, db: Session, workspace_id: uuid.UUID, week_start: date) -> dict:
+        return self.weekly_reports(db, week_start, [workspace_id])[workspace_id]
+
+report_service = ReportService()
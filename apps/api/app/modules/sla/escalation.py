@@ -0,0 +1,295 @@
+import heapq
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import Row, false, func, insert, select, true, update
+from sqlalchemy.orm import Session
+
+from app.core.http_cache import change_versions
+from app.core.security import Role
+from app.modules.audit.models import AuditLog
+from app.modules.outbox.repo import outbox_repo
+from app.modules.realtime.events import SLA_BREACHED, SLA_ESCALATED
+from app.modules.reports.service import report_service
+from app.modules.sla.models import TicketSLA
+from app.modules.tickets.models import OPEN_STATUSES, Assignment, Ticket, TicketPriority, status_in
+from app.modules.users.models import User
+
+MAX_ESCALATION_LEVEL = 2
+LEVEL_PRIORITY = {
+    1: TicketPriority.HIGH,
+    2: TicketPriority.URGENT,
+}
+
+
+class SLAEscalationEngine:
+    """
+    Set-based breach detection and escalation.
+
+    Every phase is a fixed number of statements regardless of how many
+    tickets are breached: one UPDATE ... RETURNING per breach type, one for
+    the escalation bump, one grouped load query for all affected workspaces
+    and bulk writes for tickets, assignments and audit rows.
+    """
+
+    def run(
+        self, db: Session, now: datetime, workspace_id: uuid.UUID | None = None
+    ) -> dict[str, int]:
+        """Whole table, or one workspace when run as a fan-out sub-job."""
+        stats, _ = self.run_scoped(db, now, workspace_id=workspace_id)
+        return stats
+
+    def run_scoped(
+        self,
+        db: Session,
+        now: datetime,
+        workspace_id: uuid.UUID | None = None,
+        ticket_ids: list[uuid.UUID] | None = None,
+    ) -> tuple[dict[str, int], list[dict]]:
+        """
+        run() limited to a workspace and/or to the given tickets (SLA timers
+        that fell due). Also returns the escalated rows.
+        """
+        fr_breached, res_breached = self.flag_breaches(db, now, workspace_id, ticket_ids)
+        counters = report_service.breach_counters(
+            [r.workspace_id for r in fr_breached],
+            [r.workspace_id for r in res_breached],
+            now,
+        )
+        breached = [(r.workspace_id, r.ticket_id) for r in [*fr_breached, *res_breached]]
+        outbox_repo.add_rows(db, SLA_BREACHED, breached, counters)
+        db.commit()
+        change_versions.changed_many(w for w, _ in breached)
+
+        escalated = self.escalate(db, now, workspace_id, ticket_ids)
+        reassigned = self.reassign(db, escalated, now)
+        self.write_audit(db, escalated, now)
+        escalated_rows = [(e["workspace_id"], e["ticket_id"]) for e in escalated]
+        outbox_repo.add_rows(db, SLA_ESCALATED, escalated_rows)
+        db.commit()
+        change_versions.changed_many(w for w, _ in escalated_rows)
+
+        stats = {
+            "first_response_breached": len(fr_breached),
+            "resolution_breached": len(res_breached),
+            "escalated": len(escalated),
+            "reassigned": reassigned,
+        }
+        return stats, escalated
+
+    def pending_workspaces(self, db: Session, now: datetime) -> list[uuid.UUID]:
+        """Workspaces with something to flag or escalate; the fan-out coordinator's work list."""
+        # Escalation only touches open tickets (see escalate()): a closed
+        # ticket that breached below the top level is not pending work
+        first_response_due = (
+            (TicketSLA.first_response_due_at < now)
+            & (TicketSLA.first_response_met == false())
+            & (TicketSLA.first_response_breached == false())
+        )
+        resolution_due = (
+            (TicketSLA.resolution_due_at < now)
+            & (TicketSLA.resolution_met == false())
+            & (TicketSLA.resolution_breached == false())
+        )
+        breached = (TicketSLA.first_response_breached == true()) | (
+            TicketSLA.resolution_breached == true()
+        )
+        stmt = (
+            select(TicketSLA.workspace_id)
+            .join(Ticket, TicketSLA.ticket_id == Ticket.id)
+            .where(
+                first_response_due
+                | resolution_due
+                | (
+                    breached
+                    & (TicketSLA.escalated_level < MAX_ESCALATION_LEVEL)
+                    & status_in(OPEN_STATUSES)
+                )
+            )
+            .distinct()
+        )
+        return list(db.execute(stmt).scalars())
+
+    def flag_breaches(
+        self,
+        db: Session,
+        now: datetime,
+        workspace_id: uuid.UUID | None = None,
+        ticket_ids: list[uuid.UUID] | None = None,
+    ) -> tuple[list[Row], list[Row]]:
+        """Flag overdue SLAs; returns (ticket_id, workspace_id) rows per breach type."""
+        fr_stmt = (
+            update(TicketSLA)
+            .where(
+                TicketSLA.first_response_due_at < now,
+                TicketSLA.first_response_met == false(),
+                TicketSLA.first_response_breached == false(),
+            )
+            .values(first_response_breached=True, updated_at=now)
+            .returning(TicketSLA.ticket_id, TicketSLA.workspace_id)
+        )
+        res_stmt = (
+            update(TicketSLA)
+            .where(
+                TicketSLA.resolution_due_at < now,
+                TicketSLA.resolution_met == false(),
+                TicketSLA.resolution_breached == false(),
+            )
+            .values(resolution_breached=True, updated_at=now)
+            .returning(TicketSLA.ticket_id, TicketSLA.workspace_id)
+        )
+        if workspace_id is not None:
+            fr_stmt = fr_stmt.where(TicketSLA.workspace_id == workspace_id)
+            res_stmt = res_stmt.where(TicketSLA.workspace_id == workspace_id)
+        if ticket_ids is not None:
+            fr_stmt = fr_stmt.where(TicketSLA.ticket_id.in_(ticket_ids))
+            res_stmt = res_stmt.where(TicketSLA.ticket_id.in_(ticket_ids))
+        fr_rows = db.execute(fr_stmt, execution_options={"synchronize_session": False}).all()
+        res_rows = db.execute(res_stmt, execution_options={"synchronize_session": False}).all()
+        return fr_rows, res_rows
+
+    def escalate(
+        self,
+        db: Session,
+        now: datetime,
+        workspace_id: uuid.UUID | None = None,
+        ticket_ids: list[uuid.UUID] | None = None,
+    ) -> list[dict]:
+        # Bump the level of every breached SLA whose ticket is still open and
+        # hand back what the later phases need in one round trip.
+        stmt = (
+            update(TicketSLA)
+            .where(
+                TicketSLA.ticket_id == Ticket.id,
+                (TicketSLA.first_response_breached == true())
+                | (TicketSLA.resolution_breached == true()),
+                TicketSLA.escalated_level < MAX_ESCALATION_LEVEL,
+                status_in(OPEN_STATUSES),
+            )
+            .values(escalated_level=TicketSLA.escalated_level + 1, updated_at=now)
+            .returning(
+                TicketSLA.ticket_id,
+                TicketSLA.workspace_id,
+                TicketSLA.escalated_level,
+                Ticket.assigned_agent_id,
+            )
+        )
+        if workspace_id is not None:
+            stmt = stmt.where(TicketSLA.workspace_id == workspace_id)
+        if ticket_ids is not None:
+            stmt = stmt.where(TicketSLA.ticket_id.in_(ticket_ids))
+        rows = db.execute(stmt, execution_options={"synchronize_session": False}).all()
+        escalated = [
+            {
+                "ticket_id": r.ticket_id,
+                "workspace_id": r.workspace_id,
+                "level": r.escalated_level,
+                "priority": LEVEL_PRIORITY[r.escalated_level],
+                "assigned_agent_id": r.assigned_agent_id,
+            }
+            for r in rows
+        ]
+
+        by_priority: dict[TicketPriority, list[uuid.UUID]] = defaultdict(list)
+        for item in escalated:
+            by_priority[item["priority"]].append(item["ticket_id"])
+        for priority, ids in by_priority.items():
+            db.execute(
+                update(Ticket)
+                .where(Ticket.id.in_(ids))
+                .values(priority=priority, updated_at=now),
+                execution_options={"synchronize_session": False},
+            )
+        return escalated
+
+    def agent_loads(
+        self, db: Session, workspace_ids: set[uuid.UUID]
+    ) -> dict[uuid.UUID, list[list]]:
+        """Open-ticket load of every active agent/admin, grouped by workspace, in one query."""
+        stmt = (
+            select(User.id, User.workspace_id, func.count(Ticket.id))
+            .outerjoin(
+                Ticket,
+                (Ticket.assigned_agent_id == User.id) & status_in(OPEN_STATUSES),
+            )
+            .where(
+                User.workspace_id.in_(workspace_ids),
+                User.role.in_([Role.AGENT, Role.ADMIN]),
+                User.is_active == true(),
+            )
+            .group_by(User.id, User.workspace_id)
+            .order_by(User.workspace_id, User.created_at, User.id)
+        )
+        loads: dict[uuid.UUID, list[list]] = defaultdict(list)
+        for agent_id, workspace_id, load in db.execute(stmt):
+            # [load, tie-breaker, agent_id] so heapq keeps the query order on ties
+            loads[workspace_id].append([load, len(loads[workspace_id]), agent_id])
+        return loads
+
+    def reassign(self, db: Session, escalated: list[dict], now: datetime) -> int:
+        if not escalated:
+            return 0
+
+        loads = self.agent_loads(db, {item["workspace_id"] for item in escalated})
+        for heap in loads.values():
+            heapq.heapify(heap)
+
+        # Greedy least-loaded assignment; the in-memory counters keep a large
+        # batch from piling onto whoever happened to be idle at the start.
+        ticket_updates = []
+        assignments = []
+        for item in escalated:
+            heap = loads.get(item["workspace_id"])
+            if not heap:
+                continue
+            best = heap[0]
+            if best[2] == item["assigned_agent_id"]:
+                continue
+
+            heapq.heapreplace(heap, [best[0] + 1, best[1], best[2]])
+            previous = item["assigned_agent_id"]
+            if previous is not None:
+                for entry in heap:
+                    if entry[2] == previous:
+                        entry[0] -= 1
+                        heapq.heapify(heap)
+                        break
+
+            item["assigned_agent_id"] = best[2]
+            ticket_updates.append(
+                {"id": item["ticket_id"], "assigned_agent_id": best[2], "updated_at": now}
+            )
+            assignments.append({
+                "ticket_id": item["ticket_id"],
+                "workspace_id": item["workspace_id"],
+                "assigned_agent_id": best[2],
+                "assigned_by_user_id": best[2],  # System action attributed to new assignee
+                "created_at": now,
+            })
+
+        if ticket_updates:
+            db.execute(update(Ticket), ticket_updates)
+            db.execute(insert(Assignment), assignments)
+        return len(ticket_updates)
+
+    def write_audit(self, db: Session, escalated: list[dict], now: datetime) -> None:
+        if not escalated:
+            return
+        db.execute(
+            insert(AuditLog),
+            [
+                {
+                    "workspace_id": item["workspace_id"],
+                    "entity_type": "ticket",
+                    "entity_id": item["ticket_id"],
+                    "action": "sla_escalated",
+                    "meta": {"level": item["level"], "priority": item["priority"].value},
+                    "created_at": now,
+                }
+                for item in escalated
+            ],
+        )
+
+
+sla_escalation_engine = SLAEscalationEngine()
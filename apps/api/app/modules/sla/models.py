@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import String, Boolean, DateTime, ForeignKey, Integer, JSON
+from sqlalchemy import String, Boolean, DateTime, ForeignKey, Integer, JSON, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
@@ -62,3 +62,18 @@ class TicketSLA(Base):
     )
 
     # ticket = relationship("Ticket", back_populates="sla")
+
+    # What the escalation job scans: pending deadlines by due date, and
+    # breached SLAs still below the top level. Met/breached rows drop out.
+    __table_args__ = (
+        Index(
+            "ix_ticket_slas_fr_due", "first_response_due_at", "workspace_id",
+            postgresql_where=text("first_response_met = false AND first_response_breached = false"),
+        ),
+        Index("ix_ticket_slas_res_due", "resolution_due_at", "workspace_id",
+              postgresql_where=text("resolution_met = false AND resolution_breached = false")),
+        Index(
+            "ix_ticket_slas_breached_level", "escalated_level", "workspace_id",
+            postgresql_where=text("first_response_breached = true OR resolution_breached = true"),
+        ),
+    )
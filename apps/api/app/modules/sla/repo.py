@@ -1,4 +1,5 @@
 import uuid
+from sqlalchemy import false, update
 from sqlalchemy.orm import Session
 from app.modules.sla.models import SLAPolicy, TicketSLA
 from app.modules.sla.schemas import SLAPolicyCreate, SLAPolicyUpdate
@@ -46,6 +47,14 @@ class SLARepository:
     def get_ticket_sla(self, db: Session, ticket_id: uuid.UUID) -> TicketSLA | None:
         return db.query(TicketSLA).filter(TicketSLA.ticket_id == ticket_id).first()
 
+    def mark_resolution_met(self, db: Session, ticket_ids: list[uuid.UUID]) -> None:
+        db.execute(
+            update(TicketSLA)
+            .where(TicketSLA.ticket_id.in_(ticket_ids), TicketSLA.resolution_met == false())
+            .values(resolution_met=True),
+            execution_options={"synchronize_session": False},
+        )
+
     def get_breached_ticket_slas(self, db: Session, workspace_id: uuid.UUID) -> list[TicketSLA]:
         # Helper for job (maybe unused here, but useful)
         # Actually job needs complex query.
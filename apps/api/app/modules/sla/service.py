@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app.modules.sla.models import SLAPolicy, TicketSLA
 from app.modules.sla.schemas import SLAPolicyCreate, SLAPolicyUpdate, SLAPolicyResponse, TicketSLAResponse
 from app.modules.sla.repo import sla_repo
+from app.modules.sla.timers import sla_timers
 from app.modules.tickets.repo import ticket_repo
 from app.core.errors import NotFound, BadRequest
 from app.modules.users.models import User
@@ -83,6 +84,8 @@ class SLAService:
         )
         db.add(audit)
         db.commit() # commit sla and audit
+        # Only once committed, so the consumer finds the row
+        sla_timers.schedule_sla(new_sla)
         
         return TicketSLAResponse.model_validate(new_sla)
 
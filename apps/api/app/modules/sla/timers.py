@@ -0,0 +1,167 @@
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import redis
+from sqlalchemy import false, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+from app.modules.sla.models import TicketSLA
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+FIRST_RESPONSE = "first_response"
+RESOLUTION = "resolution"
+# Next escalation level of an already breached ticket
+ESCALATION = "escalation"
+
+
+@dataclass(frozen=True)
+class Timer:
+    ticket_id: uuid.UUID
+    kind: str
+    due_at: datetime
+
+    @property
+    def member(self) -> str:
+        return f"{self.ticket_id}:{self.kind}"
+
+
+class SLATimerQueue:
+    """
+    SLA deadlines in one Redis sorted set, scored by due time, so the
+    consumer (app.sla_timers) escalates exactly the tickets that fell due.
+
+    Timers are hints: the escalation engine re-checks every condition in
+    SQL, so a stale timer (SLA met, ticket closed, Redis write after a
+    rolled back transaction) is a no-op, and the periodic sweep still
+    catches anything a lost timer missed. Writes from request paths
+    therefore never fail the request.
+    """
+
+    KEY = "sla:timers"
+
+    def __init__(self, client: redis.Redis | None = None):
+        self._client = client
+
+    @property
+    def client(self) -> redis.Redis:
+        return self._client or get_redis()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.sla_timers_enabled
+
+    def schedule(self, timers: list[Timer]) -> None:
+        if not timers:
+            return
+        self.client.zadd(self.KEY, {t.member: t.due_at.timestamp() for t in timers})
+
+    @staticmethod
+    def pending(sla: TicketSLA) -> list[Timer]:
+        """Timers for the deadlines of an SLA that are neither met nor breached."""
+        timers = []
+        if not sla.first_response_met and not sla.first_response_breached:
+            timers.append(Timer(sla.ticket_id, FIRST_RESPONSE, sla.first_response_due_at))
+        if not sla.resolution_met and not sla.resolution_breached:
+            timers.append(Timer(sla.ticket_id, RESOLUTION, sla.resolution_due_at))
+        return timers
+
+    def schedule_sla(self, sla: TicketSLA) -> None:
+        """Pending deadlines of a freshly applied SLA (request path: best effort)."""
+        self.schedule_slas([sla])
+
+    def schedule_slas(self, slas: list[TicketSLA]) -> None:
+        """schedule_sla() for many SLAs, in one Redis write (best effort)."""
+        if not self.enabled or not slas:
+            return
+        try:
+            self.schedule([timer for sla in slas for timer in self.pending(sla)])
+        except redis.RedisError:
+            logger.warning(
+                "sla timers: schedule failed for %d tickets; left to the sweep",
+                len(slas),
+                exc_info=True,
+            )
+
+    def cancel(self, ticket_id: uuid.UUID, *kinds: str) -> None:
+        """Drop timers whose condition was met (request path: best effort)."""
+        self.cancel_many([ticket_id], *kinds)
+
+    def cancel_many(self, ticket_ids: list[uuid.UUID], *kinds: str) -> None:
+        if not self.enabled or not ticket_ids:
+            return
+        try:
+            self.client.zrem(
+                self.KEY, *(f"{ticket_id}:{kind}" for ticket_id in ticket_ids for kind in kinds)
+            )
+        except redis.RedisError:
+            logger.warning(
+                "sla timers: cancel failed for %d tickets", len(ticket_ids), exc_info=True
+            )
+
+    def pop_due(self, now: datetime, limit: int) -> list[Timer]:
+        """
+        Claim up to `limit` timers due at `now`. Each member is claimed by
+        whoever's ZREM removes it, so concurrent consumers never share one.
+        """
+        members = self.client.zrangebyscore(
+            self.KEY, "-inf", now.timestamp(), start=0, num=limit, withscores=True
+        )
+        if not members:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for member, _ in members:
+            pipe.zrem(self.KEY, member)
+        removed = pipe.execute()
+        return [self._parse(member, score) for (member, score), ok in zip(members, removed) if ok]
+
+    def requeue(self, timers: list[Timer]) -> None:
+        self.schedule(timers)
+
+    def next_due(self) -> datetime | None:
+        first = self.client.zrange(self.KEY, 0, 0, withscores=True)
+        if not first:
+            return None
+        return datetime.fromtimestamp(first[0][1], tz=timezone.utc)
+
+    def size(self) -> int:
+        return self.client.zcard(self.KEY)
+
+    def rebuild(self, db: Session, batch_size: int = 5000) -> int:
+        """
+        Timers for every pending deadline, e.g. after enabling
+        SLA_TIMERS_ENABLED or losing Redis data.
+        """
+        first_response_pending = (TicketSLA.first_response_met == false()) & (
+            TicketSLA.first_response_breached == false()
+        )
+        resolution_pending = (TicketSLA.resolution_met == false()) & (
+            TicketSLA.resolution_breached == false()
+        )
+        stmt = select(TicketSLA).where(
+            or_(first_response_pending, resolution_pending)
+        ).execution_options(yield_per=batch_size)
+        count = 0
+        timers: list[Timer] = []
+        for sla in db.execute(stmt).scalars():
+            timers += self.pending(sla)
+            if len(timers) >= batch_size:
+                self.schedule(timers)
+                count += len(timers)
+                timers = []
+        self.schedule(timers)
+        return count + len(timers)
+
+    def _parse(self, member: bytes | str, score: float) -> Timer:
+        if isinstance(member, bytes):
+            member = member.decode()
+        ticket_id, kind = member.split(":", 1)
+        return Timer(uuid.UUID(ticket_id), kind, datetime.fromtimestamp(score, tz=timezone.utc))
+
+
+sla_timers = SLATimerQueue()
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
+from app.core.http_cache import change_versions
 from app.core.security import Role
 from app.modules.auth.deps import get_current_user, require_roles
 from app.modules.users.models import User
@@ -41,4 +42,6 @@ def delete_tag(
     db: Annotated[Session, Depends(get_db)],
 ):
     tag_repo.delete(db, user.workspace_id, tag_id)
+    # Only tags no ticket carries can be deleted (ticket_tags has no cascade)
+    change_versions.changed(user.workspace_id)
     return None
@@ -0,0 +1,58 @@
+import uuid
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.sla.models import TicketSLA
+from app.modules.tickets.models import Ticket
+from app.modules.tickets.repo import ticket_repo
+from app.modules.tickets.schemas import TicketFilter
+
+
+class AsyncTicketRepo:
+    # Statements come from TicketRepo so both paths stay in lockstep; only
+    # the execution differs.
+
+    async def get_by_id(
+        self,
+        db: AsyncSession,
+        workspace_id: uuid.UUID,
+        ticket_id: uuid.UUID,
+        user_id: uuid.UUID | None = None,
+    ) -> Ticket | None:
+        result = await db.execute(ticket_repo.detail_statement(workspace_id, ticket_id, user_id))
+        return result.unique().scalars().first()
+
+    async def get_version(
+        self,
+        db: AsyncSession,
+        workspace_id: uuid.UUID,
+        ticket_id: uuid.UUID,
+        user_id: uuid.UUID | None = None,
+    ) -> Row | None:
+        result = await db.execute(ticket_repo.version_statement(workspace_id, ticket_id, user_id))
+        return result.first()
+
+    async def list_tickets(
+        self,
+        db: AsyncSession,
+        workspace_id: uuid.UUID,
+        filter_params: TicketFilter,
+        user_id: uuid.UUID | None = None,
+    ) -> tuple[list[Ticket], int | None, str | None]:
+        page_stmt, filtered = ticket_repo.list_statements(workspace_id, filter_params, user_id)
+
+        total = None
+        if filter_params.count == "exact":
+            total = await db.scalar(ticket_repo.count_statement(filtered))
+        elif filter_params.count == "estimated":
+            total = await db.run_sync(ticket_repo.estimate_count, filtered)
+
+        result = await db.execute(page_stmt)
+        items, next_cursor = ticket_repo.paginate(result.unique().scalars().all(), filter_params)
+        return items, total, next_cursor
+
+    async def get_sla(self, db: AsyncSession, ticket_id: uuid.UUID) -> TicketSLA | None:
+        return await db.scalar(select(TicketSLA).where(TicketSLA.ticket_id == ticket_id))
+
+async_ticket_repo = AsyncTicketRepo()
@@ -0,0 +1,74 @@
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.responses import APIResponse
+from app.core.http_cache import not_modified, set_cache_headers
+from app.db.profiling import query_budget
+from app.db.session import get_async_db
+from app.modules.auth.deps import get_current_user_async
+from app.modules.tickets.async_service import async_ticket_service
+from app.modules.tickets.router import build_list_meta, list_etag, ticket_etag
+from app.modules.tickets.schemas import (
+    MessageCreate,
+    MessageResponse,
+    TicketFilter,
+    TicketListItem,
+    TicketResponse,
+)
+from app.modules.users.models import User
+
+# Mounted ahead of the sync tickets router when DB_ASYNC_ENABLED is set, so
+# these paths resolve here and everything else falls through to the sync one.
+# {ticket_id:uuid} keeps fixed paths such as /export out of the detail route.
+router = APIRouter()
+
+
+@router.get("", response_model=APIResponse[list[TicketListItem]])
+# user (principal cache miss), optional total, page; none on a 304
+@query_budget(4)
+async def list_tickets_async(
+    request: Request,
+    response: Response,
+    user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    filter_params: Annotated[TicketFilter, Query()],
+):
+    etag = list_etag(request, user)
+    if cached := not_modified(request, etag):
+        return cached
+    items, total, next_cursor = await async_ticket_service.list_tickets(db, filter_params, user)
+    set_cache_headers(response, etag)
+    return APIResponse(data=items, meta=build_list_meta(filter_params, total, next_cursor))
+
+
+@router.get("/{ticket_id:uuid}", response_model=APIResponse[TicketResponse])
+# user (principal cache miss), updated_at versions, ticket; no ticket on a 304
+@query_budget(4)
+async def get_ticket_async(
+    ticket_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    version = await async_ticket_service.get_ticket_version(db, ticket_id, user)
+    etag = ticket_etag(ticket_id, version)
+    if cached := not_modified(request, etag):
+        return cached
+    result = await async_ticket_service.get_ticket(db, ticket_id, user)
+    set_cache_headers(response, etag)
+    return APIResponse(data=result)
+
+
+@router.post("/{ticket_id:uuid}/messages", response_model=APIResponse[MessageResponse])
+async def add_message_async(
+    ticket_id: uuid.UUID,
+    message_in: MessageCreate,
+    user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    result = await async_ticket_service.add_message(db, ticket_id, message_in, user)
+    return APIResponse(data=result)
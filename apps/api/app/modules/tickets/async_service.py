@@ -0,0 +1,75 @@
+import uuid
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.errors import NotFound
+from app.core.http_cache import change_versions
+from app.core.security import Role
+from app.modules.outbox.repo import outbox_repo
+from app.modules.realtime.events import TICKET_MESSAGE
+from app.modules.sla.timers import FIRST_RESPONSE, sla_timers
+from app.modules.tickets.async_repo import async_ticket_repo
+from app.modules.tickets.models import Ticket
+from app.modules.tickets.repo import ticket_repo
+from app.modules.tickets.schemas import MessageCreate, MessageResponse, TicketFilter, TicketResponse
+from app.modules.tickets.service import ticket_service
+from app.modules.users.models import User
+
+
+class AsyncTicketService:
+    """Async counterpart of TicketService for the hot read/message endpoints."""
+
+    async def get_ticket(
+        self, db: AsyncSession, ticket_id: uuid.UUID, user: User
+    ) -> TicketResponse:
+        ticket = await self._get_ticket_model(db, ticket_id, user)
+        return TicketResponse.model_validate(ticket)
+
+    async def get_ticket_version(
+        self, db: AsyncSession, ticket_id: uuid.UUID, user: User
+    ) -> Row | None:
+        target_user_id = user.id if user.role == Role.CUSTOMER else None
+        return await async_ticket_repo.get_version(db, user.workspace_id, ticket_id, target_user_id)
+
+    async def list_tickets(self, db: AsyncSession, filter_params: TicketFilter, user: User):
+        # Access control: Customer force filter
+        target_user_id = user.id if user.role == Role.CUSTOMER else None
+        return await async_ticket_repo.list_tickets(
+            db, user.workspace_id, filter_params, target_user_id
+        )
+
+    async def add_message(
+        self, db: AsyncSession, ticket_id: uuid.UUID, message_in: MessageCreate, user: User
+    ) -> MessageResponse:
+        ticket = await self._get_ticket_model(db, ticket_id, user)
+
+        # Session.add is synchronous, the sync repo helper works as-is
+        msg = ticket_repo.add_message(db, ticket_id, user.workspace_id, user.id, message_in)
+        ticket_service.apply_message_activity(ticket, user)
+
+        # SLA Hook: First Response Met
+        first_response = False
+        if user.role != Role.CUSTOMER:
+            tsla = await async_ticket_repo.get_sla(db, ticket_id)
+            if tsla and not tsla.first_response_met:
+                tsla.first_response_met = True
+                first_response = True
+
+        # Session.add, no I/O: the event commits with the message
+        outbox_repo.add(db, user.workspace_id, TICKET_MESSAGE, [ticket_id])
+        await db.commit()
+        change_versions.changed(user.workspace_id)
+        if first_response:
+            sla_timers.cancel(ticket_id, FIRST_RESPONSE)
+        await db.refresh(msg)
+        return MessageResponse.model_validate(msg)
+
+    async def _get_ticket_model(self, db: AsyncSession, ticket_id: uuid.UUID, user: User) -> Ticket:
+        target_user_id = user.id if user.role == Role.CUSTOMER else None
+        ticket = await async_ticket_repo.get_by_id(db, user.workspace_id, ticket_id, target_user_id)
+        if not ticket:
+            raise NotFound(message="Ticket not found")
+        return ticket
+
+async_ticket_service = AsyncTicketService()
@@ -0,0 +1,119 @@
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.http_cache import change_versions
+from app.modules.audit.models import AuditLog
+from app.modules.outbox.repo import outbox_repo
+from app.modules.realtime.events import TICKET_STATUS
+from app.modules.tickets.models import Ticket, TicketStatus
+
+logger = logging.getLogger(__name__)
+
+
+class AutoCloseEngine:
+    """
+    Closes RESOLVED tickets with no activity since the cutoff, in chunks.
+
+    Each chunk is one UPDATE over up to batch_size rows picked with
+    FOR UPDATE SKIP LOCKED, one bulk audit insert and a commit. Locks are
+    held for a single chunk, memory stays flat, an interrupted run simply
+    resumes where it stopped, and several workers can drain a backlog in
+    parallel without waiting on each other's rows.
+    """
+
+    def run(
+        self,
+        db: Session,
+        now: datetime,
+        inactive_days: int,
+        batch_size: int,
+        max_chunks: int | None = None,
+        on_progress: Callable[[int, int], None] | None = None,
+        workspace_id: uuid.UUID | None = None,
+    ) -> dict[str, int]:
+        cutoff = now - timedelta(days=inactive_days)
+        closed = chunks = 0
+        started = time.perf_counter()
+
+        while max_chunks is None or chunks < max_chunks:
+            rows = self.close_chunk(db, now, cutoff, batch_size, workspace_id)
+            if rows:
+                self.write_audit(db, rows, now)
+                outbox_repo.add_rows(
+                    db, TICKET_STATUS, ((row.workspace_id, row.id) for row in rows)
+                )
+            db.commit()
+            change_versions.changed_many(row.workspace_id for row in rows)
+
+            chunks += 1
+            closed += len(rows)
+            logger.info(
+                "auto_close chunk=%d closed=%d total=%d rate=%.0f/s",
+                chunks, len(rows), closed, closed / max(time.perf_counter() - started, 1e-9),
+            )
+            if on_progress:
+                on_progress(chunks, closed)
+            # A short chunk means the backlog is drained, or that what is
+            # left is locked by another worker that will close it.
+            if len(rows) < batch_size:
+                break
+
+        return {"closed": closed, "chunks": chunks}
+
+    def pending_workspaces(self, db: Session, now: datetime, inactive_days: int) -> list[uuid.UUID]:
+        cutoff = now - timedelta(days=inactive_days)
+        stmt = select(Ticket.workspace_id).where(*self._closable(cutoff)).distinct()
+        return list(db.execute(stmt).scalars())
+
+    def close_chunk(
+        self,
+        db: Session,
+        now: datetime,
+        cutoff: datetime,
+        batch_size: int,
+        workspace_id: uuid.UUID | None = None,
+    ) -> list:
+        candidates = select(Ticket.id).where(*self._closable(cutoff))
+        if workspace_id is not None:
+            candidates = candidates.where(Ticket.workspace_id == workspace_id)
+        candidates = candidates.limit(batch_size).with_for_update(skip_locked=True)
+        stmt = (
+            update(Ticket)
+            .where(Ticket.id.in_(candidates.scalar_subquery()))
+            .values(status=TicketStatus.CLOSED, closed_at=now, updated_at=now)
+            .returning(Ticket.id, Ticket.workspace_id)
+        )
+        return db.execute(stmt, execution_options={"synchronize_session": False}).all()
+
+    def _closable(self, cutoff: datetime) -> tuple:
+        return (
+            # Inlined so ix_tickets_resolved_updated matches
+            Ticket.status
+            == literal(TicketStatus.RESOLVED, Ticket.status.type, literal_execute=True),
+            Ticket.updated_at < cutoff,
+            func.coalesce(Ticket.last_customer_activity_at, Ticket.updated_at) < cutoff,
+        )
+
+    def write_audit(self, db: Session, rows: list, now: datetime) -> None:
+        db.execute(
+            insert(AuditLog),
+            [
+                {
+                    "workspace_id": row.workspace_id,
+                    "entity_type": "ticket",
+                    "entity_id": row.id,
+                    "action": "auto_closed",
+                    "created_at": now,
+                }
+                for row in rows
+            ],
+        )
+
+
+auto_close_engine = AutoCloseEngine()
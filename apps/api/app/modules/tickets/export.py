@@ -0,0 +1,230 @@
+import csv
+import io
+import json
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+
+from sqlalchemy import asc, desc, select
+from sqlalchemy.orm import Session, aliased
+
+from app.db.session import SessionLocal
+from app.modules.tags.models import Tag
+from app.modules.tickets.models import InternalNote, Ticket, TicketMessage, TicketTag
+from app.modules.tickets.repo import SORT_COLUMNS, ticket_repo
+from app.modules.tickets.schemas import TicketExportFilter
+from app.modules.users.models import User
+
+EXPORT_CHUNK_SIZE = 1000
+
+# Same names as the import (TicketImportRecord), so an export re-imports
+# into another workspace (whose users own the requester/assignee emails).
+# Native tickets have no external_id: their id stands in for it.
+COLUMNS = (
+    "id", "external_id", "subject", "description", "status", "priority", "channel",
+    "requester_email", "assignee_email", "tags", "created_at", "updated_at", "closed_at",
+)
+CSV_TAG_SEPARATOR = "|"
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class TicketExporter:
+    """
+    Streams a workspace's tickets in chunks of EXPORT_CHUNK_SIZE.
+
+    Tickets come from one server-side cursor (yield_per) as plain rows, not
+    ORM objects, so nothing accumulates in the session. Tags, messages and
+    notes are loaded per chunk with one query each for the chunk's ids.
+    Memory is bounded by the chunk whatever the export size.
+    """
+
+    def __init__(self, chunk_size: int = EXPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def chunks(
+        self, db: Session, workspace_id: uuid.UUID, filters: TicketExportFilter
+    ) -> Iterator[list[dict]]:
+        requester, assignee = aliased(User), aliased(User)
+        stmt = select(
+            Ticket.id, Ticket.external_id, Ticket.subject, Ticket.description, Ticket.status,
+            Ticket.priority, Ticket.channel, requester.email.label("requester_email"),
+            assignee.email.label("assignee_email"),
+            Ticket.created_at, Ticket.updated_at, Ticket.closed_at,
+        ).select_from(Ticket)
+        stmt = stmt.join(requester, requester.id == Ticket.created_by_user_id)
+        stmt = stmt.outerjoin(assignee, assignee.id == Ticket.assigned_agent_id)
+        stmt = ticket_repo.filter_statement(stmt, workspace_id, filters)
+        direction = desc if filters.order == "desc" else asc
+        stmt = stmt.order_by(direction(SORT_COLUMNS[filters.sort]), direction(Ticket.id))
+
+        result = db.execute(stmt.execution_options(yield_per=self.chunk_size))
+        for partition in result.partitions():
+            rows = [row._asdict() for row in partition]
+            ids = [row["id"] for row in rows]
+            tags = self._tags(db, ids)
+            messages = self._bodies(db, TicketMessage, ids) if filters.include_messages else None
+            notes = self._bodies(db, InternalNote, ids) if filters.include_notes else None
+            for row in rows:
+                row["external_id"] = row["external_id"] or str(row["id"])
+                row["tags"] = tags.get(row["id"], [])
+                if messages is not None:
+                    row["messages"] = messages.get(row["id"], [])
+                if notes is not None:
+                    row["notes"] = notes.get(row["id"], [])
+            yield rows
+
+    def _tags(self, db: Session, ticket_ids: list[uuid.UUID]) -> dict[uuid.UUID, list[str]]:
+        stmt = (
+            select(TicketTag.ticket_id, Tag.name)
+            .join(Tag, Tag.id == TicketTag.tag_id)
+            .where(TicketTag.ticket_id.in_(ticket_ids))
+            .order_by(Tag.name)
+        )
+        tags = defaultdict(list)
+        for ticket_id, name in db.execute(stmt):
+            tags[ticket_id].append(name)
+        return tags
+
+    def _bodies(
+        self, db: Session, model, ticket_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, list[dict]]:
+        """Messages or notes of the tickets, oldest first, as {author_email, body, created_at}."""
+        stmt = (
+            select(model.ticket_id, User.email, model.body, model.created_at)
+            .join(User, User.id == model.author_user_id)
+            .where(model.ticket_id.in_(ticket_ids))
+            .order_by(model.ticket_id, model.created_at)
+        )
+        bodies = defaultdict(list)
+        for ticket_id, email, body, created_at in db.execute(stmt):
+            bodies[ticket_id].append(
+                {"author_email": email, "body": body, "created_at": created_at}
+            )
+        return bodies
+
+
+def _plain(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def write_csv(chunks: Iterator[list[dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for rows in chunks:
+        for row in rows:
+            writer.writerow([
+                CSV_TAG_SEPARATOR.join(row["tags"]) if column == "tags" else _plain(row[column])
+                for column in COLUMNS
+            ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def write_ndjson(chunks: Iterator[list[dict]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(json.dumps(row, default=_plain) + "\n" for row in rows).encode()
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self.parts: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def write_parquet(
+    chunks: Iterator[list[dict]], include_messages: bool, include_notes: bool
+) -> Iterator[bytes]:
+    # Optional dependency: pip install -e ".[export]"
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    timestamp = pa.timestamp("us", tz="UTC")
+    body = pa.list_(pa.struct([
+        ("author_email", pa.string()), ("body", pa.string()), ("created_at", timestamp),
+    ]))
+    fields = [
+        (column, timestamp) if column.endswith("_at")
+        else (column, pa.list_(pa.string())) if column == "tags"
+        else (column, pa.string())
+        for column in COLUMNS
+    ]
+    if include_messages:
+        fields.append(("messages", body))
+    if include_notes:
+        fields.append(("notes", body))
+    schema = pa.schema(fields)
+    text_columns = {"id", "status", "priority", "channel"}
+
+    sink = _Sink()
+    # One row group per chunk, flushed to the client as soon as it is written
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in chunks:
+            for row in rows:
+                for column in text_columns:
+                    row[column] = _plain(row[column])
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_export(
+    workspace_id: uuid.UUID,
+    filters: TicketExportFilter,
+    session_factory: Callable[[], Session] = SessionLocal,
+    exporter: TicketExporter | None = None,
+) -> Iterator[bytes]:
+    """
+    The export file, piece by piece. Opens its own session: the response
+    body is produced after the request's dependencies have been closed.
+    """
+    db = session_factory()
+    try:
+        chunks = (exporter or TicketExporter(EXPORT_CHUNK_SIZE)).chunks(db, workspace_id, filters)
+        if filters.format == "csv":
+            yield from write_csv(chunks)
+        elif filters.format == "ndjson":
+            yield from write_ndjson(chunks)
+        else:
+            yield from write_parquet(chunks, filters.include_messages, filters.include_notes)
+    finally:
+        db.close()
@@ -0,0 +1,424 @@
+import codecs
+import csv
+import json
+import logging
+import time
+import uuid
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Literal
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.http_cache import change_versions
+from app.core.security import Role
+from app.modules.outbox.repo import outbox_repo
+from app.modules.realtime.events import TICKET_CREATED
+from app.modules.reports.service import RESOLVED_STATUSES, report_service
+from app.modules.sla.models import SLAPolicy, TicketSLA
+from app.modules.sla.timers import sla_timers
+from app.modules.tags.models import Tag
+from app.modules.tickets.models import Ticket, TicketMessage, TicketStatus, TicketTag
+from app.modules.tickets.schemas import TicketImportError, TicketImportRecord, TicketImportResult
+from app.modules.users.models import User
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["ndjson", "csv"]
+
+IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_ERRORS = 100
+CSV_TAG_SEPARATOR = "|"
+
+# (line number, parsed record or why it could not be parsed)
+ParsedLine = tuple[int, dict | str]
+
+
+class Utf8Lines:
+    """
+    The lines of a binary file, decoded one at a time. A line that isn't
+    valid UTF-8, or has a NUL byte (PostgreSQL text can't store it), is
+    still yielded but listed in `invalid` with the reason, so the parser
+    fails that line instead of the whole upload.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.invalid: dict[int, str] = {}
+
+    def __iter__(self) -> Iterator[str]:
+        for line_no, raw in enumerate(self.file, 1):
+            if line_no == 1:
+                raw = raw.removeprefix(codecs.BOM_UTF8)
+            if b"\x00" in raw:
+                self.invalid[line_no] = "NUL byte"
+            try:
+                yield raw.decode("utf-8")
+            except UnicodeDecodeError:
+                self.invalid[line_no] = "invalid UTF-8"
+                yield raw.decode("utf-8", errors="replace")
+
+
+def parse_ndjson(
+    lines: Iterable[str], invalid: Mapping[int, str] | None = None
+) -> Iterator[ParsedLine]:
+    invalid = invalid if invalid is not None else {}
+    for line_no, line in enumerate(lines, 1):
+        if line_no in invalid:
+            yield line_no, invalid[line_no]
+            continue
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_no, f"invalid JSON: {exc.msg}"
+            continue
+        yield line_no, data if isinstance(data, dict) else "expected a JSON object"
+
+
+def parse_csv(
+    lines: Iterable[str], invalid: Mapping[int, str] | None = None
+) -> Iterator[ParsedLine]:
+    invalid = invalid if invalid is not None else {}
+    reader = csv.DictReader(lines)
+    while True:
+        start = reader.line_num
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            # Oversized fields, stray quotes...: the reader resumes on the next line
+            yield max(reader.line_num, start + 1), f"invalid CSV: {exc}"
+            continue
+        # A quoted cell can span lines: any of them may be the bad one
+        bad = [invalid[n] for n in range(start + 1, reader.line_num + 1) if n in invalid]
+        if bad:
+            yield reader.line_num, bad[0]
+            continue
+        # Empty cells mean "not given", so the record defaults apply
+        data = {key: value for key, value in row.items() if key and value not in ("", None)}
+        if "tags" in data:
+            data["tags"] = [t.strip() for t in data["tags"].split(CSV_TAG_SEPARATOR) if t.strip()]
+        yield reader.line_num, data
+
+
+PARSERS = {"ndjson": parse_ndjson, "csv": parse_csv}
+CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+
+def format_for(content_type: str | None, filename: str | None = None) -> ImportFormat | None:
+    if content_type:
+        fmt = CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+        if fmt:
+            return fmt
+    if filename:
+        suffix = filename.rsplit(".", 1)[-1].lower()
+        return {"ndjson": "ndjson", "jsonl": "ndjson", "csv": "csv"}.get(suffix)
+    return None
+
+
+def utc(value: datetime | None) -> datetime | None:
+    # Naive timestamps in an export are taken as UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class TicketImporter:
+    """
+    Streams tickets from another helpdesk into a workspace.
+
+    Records are parsed lazily and written batch by batch: per batch, one
+    query for the users it mentions that aren't cached yet, one upsert for
+    new tags, one multi-row INSERT per table (tickets, messages, ticket
+    tags, SLAs) and the outbox event carrying the report counters, then a
+    commit. Memory is bounded by the batch whatever the file size.
+
+    external_id is the idempotency key: the tickets INSERT skips ids the
+    workspace already has (ON CONFLICT DO NOTHING on a unique index), and
+    only the rows it returns get messages, tags and SLAs. An interrupted
+    import is resumed by running it again.
+    """
+
+    def __init__(
+        self, db: Session, workspace_id: uuid.UUID, actor: User, batch_size: int = IMPORT_BATCH_SIZE
+    ):
+        self.db = db
+        self.workspace_id = workspace_id
+        self.actor = actor
+        self.batch_size = batch_size
+        # email -> (id, role), None when not a user of the workspace
+        self.users: dict[str, tuple[uuid.UUID, Role] | None] = {
+            actor.email: (actor.id, actor.role)
+        }
+        self.tag_ids: dict[str, uuid.UUID] = {}
+        self.policies: dict[str, SLAPolicy] | None = None
+        self.result = TicketImportResult()
+
+    def run(self, parsed: Iterable[ParsedLine]) -> TicketImportResult:
+        started = time.perf_counter()
+        batch: list[tuple[int, TicketImportRecord]] = []
+        for line_no, data in parsed:
+            if isinstance(data, str):
+                self._fail(line_no, None, data)
+                continue
+            try:
+                batch.append((line_no, TicketImportRecord.model_validate(data)))
+            except ValidationError as exc:
+                error = exc.errors()[0]
+                location = ".".join(map(str, error["loc"]))
+                self._fail(line_no, data.get("external_id"), f"{location}: {error['msg']}")
+                continue
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch)
+                batch = []
+        if batch:
+            self._import_batch(batch)
+
+        result = self.result
+        result.seconds = round(time.perf_counter() - started, 3)
+        processed = result.created + result.skipped + result.failed
+        result.rows_per_second = round(processed / result.seconds, 1) if result.seconds else 0
+        logger.info(
+            "ticket import into %s: %s", self.workspace_id, result.model_dump(exclude={"errors"})
+        )
+        return result
+
+    def _import_batch(self, batch: list[tuple[int, TicketImportRecord]]) -> None:
+        db = self.db
+        self._load_users({
+            email
+            for _, record in batch
+            for email in (
+                record.requester_email,
+                record.assignee_email,
+                *(m.author_email for m in record.messages),
+            )
+            if email
+        })
+        if self.policies is None:
+            policies = db.execute(
+                select(SLAPolicy).where(SLAPolicy.workspace_id == self.workspace_id)
+            ).scalars()
+            self.policies = {p.name: p for p in policies}
+
+        now = datetime.now(timezone.utc)
+        tickets: dict[str, dict] = {}
+        details: dict[str, tuple[TicketImportRecord, list[dict], dict | None, dict]] = {}
+        for line_no, record in batch:
+            if record.external_id in tickets:
+                self.result.skipped += 1
+                continue
+            try:
+                ticket, messages, sla, events = self._rows(record, now)
+            except ValueError as exc:
+                self._fail(line_no, record.external_id, str(exc))
+                continue
+            tickets[record.external_id] = ticket
+            details[record.external_id] = (record, messages, sla, events)
+        if not tickets:
+            return
+
+        self._load_tags({name for record, *_ in details.values() for name in record.tags})
+
+        stmt = pg_insert(Ticket).values(list(tickets.values())).on_conflict_do_nothing(
+            index_elements=["workspace_id", "external_id"],
+            index_where=Ticket.external_id.isnot(None),
+        ).returning(Ticket.external_id)
+        created = set(db.execute(stmt).scalars())
+        self.result.created += len(created)
+        self.result.skipped += len(tickets) - len(created)
+
+        messages, ticket_tags, slas, events = [], [], [], []
+        for external_id in (e for e in tickets if e in created):
+            record, ticket_messages, sla, counter_events = details[external_id]
+            ticket_id = tickets[external_id]["id"]
+            messages += ticket_messages
+            ticket_tags += [
+                {"ticket_id": ticket_id, "tag_id": self.tag_ids[name]}
+                for name in dict.fromkeys(record.tags)
+            ]
+            if sla is not None:
+                slas.append(sla)
+            events.append(counter_events)
+        # executemany: SQLAlchemy folds these into multi-row INSERTs
+        if messages:
+            db.execute(insert(TicketMessage), messages)
+        if ticket_tags:
+            db.execute(insert(TicketTag), ticket_tags)
+        if slas:
+            db.execute(insert(TicketSLA), slas)
+        created_ids = (tickets[e]["id"] for e in tickets if e in created)
+        outbox_repo.add(
+            db, self.workspace_id, TICKET_CREATED, created_ids,
+            report_service.imported_counters(events),
+        )
+        db.commit()
+        change_versions.changed(self.workspace_id)
+        # Only once committed, like SLAService.apply_sla; settled deadlines get none
+        sla_timers.schedule_slas([TicketSLA(**sla) for sla in slas])
+        self.result.messages += len(messages)
+
+    def _rows(
+        self, record: TicketImportRecord, now: datetime
+    ) -> tuple[dict, list[dict], dict | None, dict]:
+        """
+        Ticket, message and SLA rows of one record, and its events for the
+        report counters. ValueError for references the workspace doesn't have.
+        """
+        requester = self._user(record.requester_email or self.actor.email, "requester")
+        assignee = None
+        if record.assignee_email:
+            assignee = self._user(record.assignee_email, "assignee")
+            if assignee[1] not in (Role.ADMIN, Role.AGENT):
+                raise ValueError(f"assignee {record.assignee_email} is not an agent")
+        policy = None
+        if record.sla_policy:
+            policy = self.policies.get(record.sla_policy)
+            if policy is None:
+                raise ValueError(f"unknown SLA policy {record.sla_policy!r}")
+
+        ticket_id = uuid.uuid4()
+        created_at = utc(record.created_at) or now
+        messages = []
+        last_customer = last_agent = first_reply = None
+        for message in record.messages:
+            author_id, role = (
+                self._user(message.author_email, "message author")
+                if message.author_email
+                else requester
+            )
+            sent_at = utc(message.created_at) or created_at
+            messages.append({
+                "id": uuid.uuid4(),
+                "ticket_id": ticket_id,
+                "workspace_id": self.workspace_id,
+                "author_user_id": author_id,
+                "body": message.body,
+                "created_at": sent_at,
+            })
+            if role == Role.CUSTOMER:
+                last_customer = max(last_customer or sent_at, sent_at)
+            else:
+                last_agent = max(last_agent or sent_at, sent_at)
+                first_reply = min(first_reply or sent_at, sent_at)
+
+        updated_at = utc(record.updated_at) or max(
+            created_at, last_customer or created_at, last_agent or created_at
+        )
+        closed_at = utc(record.closed_at)
+        if closed_at is None and record.status == TicketStatus.CLOSED:
+            closed_at = updated_at
+        # Same approximation as backfill_daily_stats
+        resolved_at = (closed_at or updated_at) if record.status in RESOLVED_STATUSES else None
+
+        ticket = {
+            "id": ticket_id,
+            "workspace_id": self.workspace_id,
+            "external_id": record.external_id,
+            "created_by_user_id": requester[0],
+            "assigned_agent_id": assignee[0] if assignee else None,
+            "subject": record.subject,
+            "description": record.description,
+            "status": record.status,
+            "priority": record.priority,
+            "channel": record.channel,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "closed_at": closed_at,
+            "last_customer_activity_at": last_customer,
+            "last_agent_activity_at": last_agent,
+        }
+
+        events = {
+            "assigned_agent_id": ticket["assigned_agent_id"],
+            "created_at": created_at,
+            "resolved_at": resolved_at,
+            "first_response_breached_at": None,
+            "resolution_breached_at": None,
+        }
+        sla = None
+        if policy is not None:
+            first_response_due = created_at + timedelta(minutes=policy.first_response_time_minutes)
+            resolution_due = created_at + timedelta(minutes=policy.resolution_time_minutes)
+            # Deadlines already met are settled here; pending ones are left
+            # to the escalation job, which flags and counts their breaches
+            sla = {
+                "ticket_id": ticket_id,
+                "workspace_id": self.workspace_id,
+                "policy_id": policy.id,
+                "first_response_due_at": first_response_due,
+                "resolution_due_at": resolution_due,
+                "first_response_met": first_reply is not None,
+                "first_response_breached": (
+                    first_reply is not None and first_reply > first_response_due
+                ),
+                "resolution_met": resolved_at is not None,
+                "resolution_breached": resolved_at is not None and resolved_at > resolution_due,
+            }
+            if sla["first_response_breached"]:
+                events["first_response_breached_at"] = first_reply
+            if sla["resolution_breached"]:
+                events["resolution_breached_at"] = resolved_at
+        return ticket, messages, sla, events
+
+    def _user(self, email: str, what: str) -> tuple[uuid.UUID, Role]:
+        user = self.users.get(email)
+        if user is None:
+            raise ValueError(f"unknown {what} {email}")
+        return user
+
+    def _load_users(self, emails: set[str]) -> None:
+        missing = emails - self.users.keys()
+        if not missing:
+            return
+        stmt = select(User.id, User.email, User.role).where(
+            User.workspace_id == self.workspace_id, User.email.in_(missing)
+        )
+        self.users.update(dict.fromkeys(missing))
+        self.users.update({row.email: (row.id, row.role) for row in self.db.execute(stmt)})
+
+    def _load_tags(self, names: set[str]) -> None:
+        missing = names - self.tag_ids.keys()
+        if not missing:
+            return
+        self.db.execute(
+            pg_insert(Tag)
+            .values([
+                {"id": uuid.uuid4(), "workspace_id": self.workspace_id, "name": name}
+                for name in sorted(missing)
+            ])
+            .on_conflict_do_nothing(constraint="uq_workspace_tag_name")
+        )
+        stmt = select(Tag.id, Tag.name).where(
+            Tag.workspace_id == self.workspace_id, Tag.name.in_(missing)
+        )
+        self.tag_ids.update({row.name: row.id for row in self.db.execute(stmt)})
+
+    def _fail(self, line_no: int, external_id: str | None, error: str) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < MAX_IMPORT_ERRORS:
+            self.result.errors.append(
+                TicketImportError(line=line_no, external_id=external_id, error=error)
+            )
+
+
+def import_file(
+    db: Session, file: BinaryIO, fmt: ImportFormat, workspace_id: uuid.UUID, actor: User,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> TicketImportResult:
+    """Import a UTF-8 NDJSON/CSV file object, reading it line by line."""
+    # Line endings are kept, so csv still sees line breaks inside quoted cells
+    lines = Utf8Lines(file)
+    parsed = PARSERS[fmt](lines, lines.invalid)
+    return TicketImporter(db, workspace_id, actor, batch_size).run(parsed)
@@ -2,9 +2,9 @@ import uuid
 from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import String, DateTime, ForeignKey, Text, Enum as SAEnum
+from sqlalchemy import String, DateTime, ForeignKey, Text, Index, Enum as SAEnum, bindparam, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 
 from app.db.base_class import Base
 
@@ -17,6 +17,10 @@ class TicketStatus(str, Enum):
     CLOSED = "CLOSED"
 
 
+# Statuses an agent still has to act on
+OPEN_STATUSES = (TicketStatus.NEW, TicketStatus.OPEN, TicketStatus.PENDING)
+
+
 class TicketPriority(str, Enum):
     LOW = "LOW"
     MEDIUM = "MEDIUM"
@@ -34,13 +38,13 @@ class Ticket(Base):
     __tablename__ = "tickets"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    workspace_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False, index=True)
+    workspace_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False)
     created_by_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     
     subject: Mapped[str] = mapped_column(Text, nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     
-    status: Mapped[TicketStatus] = mapped_column(SAEnum(TicketStatus, native_enum=False), default=TicketStatus.NEW, nullable=False, index=True)
+    status: Mapped[TicketStatus] = mapped_column(SAEnum(TicketStatus, native_enum=False), default=TicketStatus.NEW, nullable=False)
     priority: Mapped[TicketPriority] = mapped_column(SAEnum(TicketPriority, native_enum=False), default=TicketPriority.MEDIUM, nullable=False, index=True)
     channel: Mapped[TicketChannel] = mapped_column(SAEnum(TicketChannel, native_enum=False), default=TicketChannel.WEB, nullable=False)
     
@@ -54,19 +58,73 @@ class Ticket(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
         nullable=False,
-        index=True
     )
     last_customer_activity_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     last_agent_activity_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     closed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Id in the helpdesk a ticket was imported from; makes re-imports idempotent
+    external_id: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    # Full-text documents, maintained by database triggers (see tickets/search.py).
+    # Deferred so regular ticket loads never pull them.
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR, nullable=True, deferred=True)
+    notes_search_vector: Mapped[str | None] = mapped_column(TSVECTOR, nullable=True, deferred=True)
 
     # Relationships
-    tags = relationship("Tag", secondary="ticket_tags", backref="tickets", lazy="selectin")
+    # Lazy by default: each query states what it needs (see TicketRepo.LIST_OPTIONS /
+    # DETAIL_OPTIONS) instead of every ticket load pulling users and the workspace.
+    tags = relationship("Tag", secondary="ticket_tags", backref="tickets")
     
     # Naming the relationship 'requester' to match schemas.py
-    requester = relationship("User", foreign_keys=[created_by_user_id], lazy="selectin")
-    assigned_agent = relationship("User", foreign_keys=[assigned_agent_id], lazy="selectin")
-    workspace = relationship("Workspace", foreign_keys=[workspace_id], lazy="selectin")
+    requester = relationship("User", foreign_keys=[created_by_user_id])
+    assigned_agent = relationship("User", foreign_keys=[assigned_agent_id])
+    workspace = relationship("Workspace", foreign_keys=[workspace_id])
+
+    __table_args__ = (
+        Index("ix_tickets_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_tickets_notes_search_vector", "notes_search_vector", postgresql_using="gin"),
+        # Ticket lists: workspace first, then the filter, then the sort key
+        # with id as tie-breaker, so keyset pages are a single index range
+        # (scanned backwards for desc).
+        Index("ix_tickets_ws_created", "workspace_id", "created_at", "id"),
+        Index("ix_tickets_ws_updated", "workspace_id", "updated_at", "id"),
+        Index("ix_tickets_ws_status_created", "workspace_id", "status", "created_at", "id"),
+        Index(
+            "ix_tickets_ws_assignee_created",
+            "workspace_id",
+            "assigned_agent_id",
+            "created_at",
+            "id",
+        ),
+        # Partial: only rows still being worked on, so they stay small as
+        # closed tickets pile up. Queries must inline the statuses (status_in)
+        # for the planner to match them.
+        Index("ix_tickets_open_ws_created", "workspace_id", "created_at", "id",
+              postgresql_where=text("status IN ('NEW', 'OPEN', 'PENDING')")),
+        Index("ix_tickets_open_assignee", "assigned_agent_id",
+              postgresql_where=text("status IN ('NEW', 'OPEN', 'PENDING')")),
+        # Auto-close candidates
+        Index(
+            "ix_tickets_resolved_updated",
+            "updated_at",
+            postgresql_where=text("status = 'RESOLVED'"),
+        ),
+        Index("uq_tickets_ws_external_id", "workspace_id", "external_id", unique=True,
+              postgresql_where=text("external_id IS NOT NULL")),
+    )
+
+
+def status_in(statuses):
+    """
+    Ticket.status IN (...) with the values inlined in the SQL instead of
+    bound, so partial indexes on status stay usable for prepared statements
+    (a generic plan can't see parameter values).
+    """
+    return Ticket.status.in_(
+        bindparam(
+            "statuses", list(statuses), expanding=True, literal_execute=True, unique=True
+        )
+    )
 
 
 class TicketMessage(Base):
@@ -1,17 +1,76 @@
+import json
 import uuid
 from datetime import datetime
 from typing import Literal
 
-from sqlalchemy import or_, desc, asc, func
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Row, Select, asc, desc, false, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, aliased, joinedload, raiseload
 
-from app.modules.tickets.models import Ticket, TicketMessage, InternalNote, TicketTag, Assignment
+from app.common.pagination import decode_cursor, encode_cursor
+from app.core.errors import BadRequest
 from app.modules.tags.models import Tag
-from app.modules.tickets.schemas import TicketCreate, TicketFilter, MessageCreate, NoteCreate
+from app.modules.tickets.models import (
+    Assignment,
+    InternalNote,
+    Ticket,
+    TicketMessage,
+    TicketPriority,
+    TicketStatus,
+    TicketTag,
+    status_in,
+)
+from app.modules.tickets.schemas import (
+    MessageCreate,
+    NoteCreate,
+    TicketCreate,
+    TicketFilter,
+    TicketSearchFilter,
+)
+from app.modules.tickets.search import build_tsquery, search_condition, search_rank
+from app.modules.users.models import User
+from app.modules.workspaces.models import Workspace
+
+SORT_COLUMNS = {
+    "created_at": Ticket.created_at,
+    "updated_at": Ticket.updated_at,
+    "priority": Ticket.priority,
+    "status": Ticket.status,
+}
+
+CURSOR_VALUE_PARSERS = {
+    "created_at": datetime.fromisoformat,
+    "updated_at": datetime.fromisoformat,
+    "priority": TicketPriority,
+    "status": TicketStatus,
+}
 
 
 class TicketRepo:
-    def create(self, db: Session, obj_in: TicketCreate, workspace_id: uuid.UUID, created_by_user_id: uuid.UUID) -> Ticket:
+    # Everything TicketListItem serializes, in the same statement as the page:
+    # the many-to-one users join directly and tags join onto the LIMITed
+    # subquery. Anything else touched while serializing a list is a bug.
+    LIST_OPTIONS = (
+        joinedload(Ticket.tags),
+        joinedload(Ticket.requester).load_only(User.id, User.full_name, User.email),
+        joinedload(Ticket.assigned_agent).load_only(User.id, User.full_name, User.email),
+        raiseload("*"),
+    )
+    DETAIL_OPTIONS = (
+        joinedload(Ticket.tags),
+        joinedload(Ticket.requester),
+        joinedload(Ticket.assigned_agent),
+        joinedload(Ticket.workspace),
+    )
+
+    def create(
+        self,
+        db: Session,
+        obj_in: TicketCreate,
+        workspace_id: uuid.UUID,
+        created_by_user_id: uuid.UUID,
+        commit: bool = True,
+    ) -> Ticket:
         db_obj = Ticket(
             workspace_id=workspace_id,
             created_by_user_id=created_by_user_id,
@@ -22,82 +81,225 @@ class TicketRepo:
             # default status NEW matches model default
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        if commit:
+            db.commit()
+            db.refresh(db_obj)
         return db_obj
 
     def get_by_id(self, db: Session, workspace_id: uuid.UUID, ticket_id: uuid.UUID, user_id: uuid.UUID | None = None) -> Ticket | None:
-        query = db.query(Ticket).filter(
+        return (
+            db.execute(self.detail_statement(workspace_id, ticket_id, user_id))
+            .unique()
+            .scalars()
+            .first()
+        )
+
+    def detail_statement(
+        self, workspace_id: uuid.UUID, ticket_id: uuid.UUID, user_id: uuid.UUID | None = None
+    ) -> Select:
+        stmt = select(Ticket).where(
             Ticket.workspace_id == workspace_id,
             Ticket.id == ticket_id
-        ).options(joinedload(Ticket.tags))
-        
+        ).options(*self.DETAIL_OPTIONS)
+
         if user_id:
             # For customer access check, strictly filter by creator
-             query = query.filter(Ticket.created_by_user_id == user_id)
-             
-        return query.first()
+            stmt = stmt.where(Ticket.created_by_user_id == user_id)
+
+        return stmt
+
+    def get_version(
+        self, db: Session, workspace_id: uuid.UUID, ticket_id: uuid.UUID,
+        user_id: uuid.UUID | None = None,
+    ) -> Row | None:
+        return db.execute(self.version_statement(workspace_id, ticket_id, user_id)).first()
+
+    def version_statement(
+        self, workspace_id: uuid.UUID, ticket_id: uuid.UUID, user_id: uuid.UUID | None = None
+    ) -> Select:
+        """
+        updated_at of the ticket and of every row its detail embeds, by
+        primary key: the detail changes only if one of them does. Tag
+        changes touch the ticket's updated_at.
+        """
+        requester = aliased(User)
+        assignee = aliased(User)
+        stmt = (
+            select(
+                Ticket.updated_at, requester.updated_at, assignee.updated_at,
+                Workspace.updated_at,
+            )
+            .join(requester, requester.id == Ticket.created_by_user_id)
+            .outerjoin(assignee, assignee.id == Ticket.assigned_agent_id)
+            .join(Workspace, Workspace.id == Ticket.workspace_id)
+            .where(Ticket.workspace_id == workspace_id, Ticket.id == ticket_id)
+        )
+        if user_id:
+            stmt = stmt.where(Ticket.created_by_user_id == user_id)
+        return stmt
+
+    def list_tickets(
+        self,
+        db: Session,
+        workspace_id: uuid.UUID,
+        filter_params: TicketFilter,
+        user_id: uuid.UUID | None = None,
+    ) -> tuple[list[Ticket], int | None, str | None]:
+        page_stmt, filtered = self.list_statements(workspace_id, filter_params, user_id)
+
+        # Totals are opt-in: an exact COUNT(*) scans the whole filtered set
+        total = None
+        if filter_params.count == "exact":
+            total = db.scalar(self.count_statement(filtered))
+        elif filter_params.count == "estimated":
+            total = self.estimate_count(db, filtered)
+
+        items, next_cursor = self.paginate(
+            db.execute(page_stmt).unique().scalars().all(), filter_params
+        )
+        return items, total, next_cursor
+
+    def list_statements(
+        self, workspace_id: uuid.UUID, filter_params: TicketFilter, user_id: uuid.UUID | None = None
+    ) -> tuple[Select, Select]:
+        """
+        Build the list query without executing it, so the sync and async
+        repos share one definition. Returns (page statement, filtered
+        statement before ordering/paging for totals).
+        """
+        stmt = self.filter_statement(select(Ticket), workspace_id, filter_params, user_id)
+        tsquery = build_tsquery(filter_params.q) if filter_params.q else None
+        include_notes = user_id is None
+        filtered = stmt
+
+        # Relevance ranking only makes sense with a search; otherwise fall back to recency
+        if filter_params.sort == "relevance":
+            if filter_params.cursor:
+                raise BadRequest(message="Cursor pagination is not supported for relevance sort")
+            if tsquery:
+                stmt = stmt.order_by(desc(search_rank(tsquery, include_notes)), desc(Ticket.id))
+            else:
+                stmt = stmt.order_by(desc(Ticket.created_at), desc(Ticket.id))
+            stmt = stmt.offset((filter_params.page - 1) * filter_params.size)
+        else:
+            # Sort, with id as tie-breaker so (sort column, id) is a unique key
+            sort_col = SORT_COLUMNS[filter_params.sort]
+            direction = desc if filter_params.order == "desc" else asc
+            stmt = stmt.order_by(direction(sort_col), direction(Ticket.id))
+
+            # Pagination: keyset when a cursor is given, OFFSET otherwise
+            if filter_params.cursor:
+                value, last_id = self._decode_ticket_cursor(filter_params)
+                key = tuple_(sort_col, Ticket.id)
+                stmt = stmt.where(
+                    key < (value, last_id)
+                    if filter_params.order == "desc"
+                    else key > (value, last_id)
+                )
+            else:
+                stmt = stmt.offset((filter_params.page - 1) * filter_params.size)
+
+        # One extra row tells us whether there is a next page
+        stmt = stmt.options(*self.LIST_OPTIONS).limit(filter_params.size + 1)
+        return stmt, filtered
+
+    def filter_statement(
+        self,
+        stmt: Select,
+        workspace_id: uuid.UUID,
+        filter_params: TicketSearchFilter,
+        user_id: uuid.UUID | None = None,
+    ) -> Select:
+        """The TicketSearchFilter conditions on a select over tickets (list and export)."""
+        stmt = stmt.where(Ticket.workspace_id == workspace_id)
 
-    def list_tickets(self, db: Session, workspace_id: uuid.UUID, filter_params: TicketFilter, user_id: uuid.UUID | None = None) -> tuple[list[Ticket], int]:
-        query = db.query(Ticket).filter(Ticket.workspace_id == workspace_id)
-        
         # Access Scope
         if user_id:
-             query = query.filter(Ticket.created_by_user_id == user_id)
+            stmt = stmt.where(Ticket.created_by_user_id == user_id)
 
         # Apply Filters
+        # Full-text search over subject, description and messages (plus internal
+        # notes for agents); customers are scoped by user_id and never match notes.
         if filter_params.q:
-            search = f"%{filter_params.q}%"
-            query = query.filter(or_(
-                Ticket.subject.ilike(search),
-                Ticket.description.ilike(search)
-            ))
-            
+            tsquery = build_tsquery(filter_params.q)
+            # Nothing searchable left (q="!!!"): match no ticket rather than
+            # dropping the filter and returning them all
+            stmt = stmt.where(search_condition(tsquery, user_id is None) if tsquery else false())
+
         if filter_params.status:
             statuses = filter_params.status.split(",")
-            query = query.filter(Ticket.status.in_(statuses))
+            stmt = stmt.where(status_in(statuses))
 
         if filter_params.priority:
             priorities = filter_params.priority.split(",")
-            query = query.filter(Ticket.priority.in_(priorities))
+            stmt = stmt.where(Ticket.priority.in_(priorities))
 
         if filter_params.assigned_to:
             if filter_params.assigned_to == "unassigned":
-                query = query.filter(Ticket.assigned_agent_id.is_(None))
+                stmt = stmt.where(Ticket.assigned_agent_id.is_(None))
             else:
-                query = query.filter(Ticket.assigned_agent_id == filter_params.assigned_to)
+                stmt = stmt.where(Ticket.assigned_agent_id == filter_params.assigned_to)
 
         if filter_params.tag:
             # Join with tags if filtering by tag
-            query = query.join(Ticket.tags).filter(or_(
+            stmt = stmt.join(Ticket.tags).where(or_(
                 Tag.name == filter_params.tag,
                 Tag.id == uuid.UUID(filter_params.tag) if self._is_uuid(filter_params.tag) else False
             ))
 
-        # Count total before pagination
-        total = query.with_entities(func.count(Ticket.id)).scalar()
-
-        # Sort
-        # Sort
-        # Simple mapping for robustness
-        sort_map = {
-            "created_at": Ticket.created_at,
-            "updated_at": Ticket.updated_at,
-            "priority": Ticket.priority,
-            "status": Ticket.status
-        }
-        sort_col = sort_map.get(filter_params.sort, Ticket.created_at)
-        
-        if filter_params.order == "desc":
-            query = query.order_by(desc(sort_col))
-        else:
-            query = query.order_by(asc(sort_col))
+        if filter_params.updated_since:
+            stmt = stmt.where(Ticket.updated_at >= filter_params.updated_since)
 
-        # Pagination
-        offset = (filter_params.page - 1) * filter_params.size
-        items = query.with_entities(Ticket).options(joinedload(Ticket.tags)).offset(offset).limit(filter_params.size).all()
-        
-        return items, total
+        return stmt
+
+    def count_statement(self, filtered: Select) -> Select:
+        return filtered.with_only_columns(func.count(Ticket.id))
+
+    def paginate(
+        self, items: list[Ticket], filter_params: TicketFilter
+    ) -> tuple[list[Ticket], str | None]:
+        """Trim the look-ahead row and build the next cursor from the last item."""
+        items = list(items)
+        if len(items) <= filter_params.size:
+            return items, None
+
+        items = items[:filter_params.size]
+        if filter_params.sort == "relevance":
+            return items, None
+
+        last = items[-1]
+        next_cursor = encode_cursor({
+            "s": filter_params.sort,
+            "o": filter_params.order,
+            "v": getattr(last, filter_params.sort),
+            "id": last.id,
+        })
+        return items, next_cursor
+
+    def _decode_ticket_cursor(self, filter_params: TicketFilter) -> tuple[object, uuid.UUID]:
+        payload = decode_cursor(filter_params.cursor)
+        if payload.get("s") != filter_params.sort or payload.get("o") != filter_params.order:
+            raise BadRequest(message="Cursor does not match sort/order")
+        try:
+            parse = CURSOR_VALUE_PARSERS[filter_params.sort]
+            return parse(payload["v"]), uuid.UUID(payload["id"])
+        except (KeyError, ValueError, TypeError):
+            raise BadRequest(message="Invalid cursor")
+
+    def estimate_count(self, db: Session, filtered: Select) -> int:
+        # Row estimate from the planner; cheap regardless of table size but only
+        # as good as the latest ANALYZE.
+        compiled = filtered.with_only_columns(Ticket.id).compile(
+            dialect=db.bind.dialect, compile_kwargs={"render_postcompile": True}
+        )
+        params = compiled.params
+        if compiled.positiontup is not None:
+            # asyncpg and friends take positional parameters
+            params = tuple(params[name] for name in compiled.positiontup)
+        plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     def add_message(self, db: Session, ticket_id: uuid.UUID, workspace_id: uuid.UUID, author_id: uuid.UUID, obj_in: MessageCreate) -> TicketMessage:
         msg = TicketMessage(
@@ -136,6 +338,46 @@ class TicketRepo:
     def add_assignment_history(self, db: Session, assignment: Assignment):
         db.add(assignment)
 
+    # Bulk operations: a fixed number of statements whatever the number of tickets
+
+    def lock_many(
+        self, db: Session, workspace_id: uuid.UUID, ticket_ids: list[uuid.UUID]
+    ) -> list[Row]:
+        """
+        (id, status, assigned_agent_id) of the workspace's tickets among
+        ticket_ids, row-locked in id order.
+        """
+        stmt = (
+            select(Ticket.id, Ticket.status, Ticket.assigned_agent_id)
+            .where(Ticket.workspace_id == workspace_id, Ticket.id.in_(ticket_ids))
+            .order_by(Ticket.id)
+            .with_for_update()
+        )
+        return db.execute(stmt).all()
+
+    def update_many(self, db: Session, ticket_ids: list[uuid.UUID], **values) -> None:
+        db.execute(
+            update(Ticket).where(Ticket.id.in_(ticket_ids)).values(**values),
+            execution_options={"synchronize_session": False},
+        )
+
+    def add_assignments(self, db: Session, rows: list[dict]) -> None:
+        if rows:
+            db.execute(insert(Assignment), rows)
+
+    def add_tags_many(
+        self, db: Session, ticket_ids: list[uuid.UUID], tag_ids: list[uuid.UUID]
+    ) -> None:
+        pairs = [{"ticket_id": t, "tag_id": g} for t in ticket_ids for g in tag_ids]
+        if pairs:
+            db.execute(pg_insert(TicketTag).values(pairs).on_conflict_do_nothing())
+
+    def workspace_tag_ids(
+        self, db: Session, workspace_id: uuid.UUID, tag_ids: list[uuid.UUID]
+    ) -> set[uuid.UUID]:
+        stmt = select(Tag.id).where(Tag.workspace_id == workspace_id, Tag.id.in_(tag_ids))
+        return set(db.execute(stmt).scalars())
+
     def _is_uuid(self, val: str) -> bool:
         try:
             uuid.UUID(val)
@@ -1,18 +1,29 @@
+from datetime import datetime, timezone
 from typing import Annotated
+import tempfile
 import uuid
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Request, Response, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.db.session import get_db
+from app.db.profiling import query_budget
+from app.core.errors import BadRequest
+from app.core.http_cache import change_versions, etag_for, not_modified, set_cache_headers
 from app.core.security import Role
 from app.modules.auth.deps import get_current_user, require_roles
 from app.modules.users.models import User
 from app.modules.tickets.schemas import (
-    TicketCreate, TicketResponse, TicketFilter, 
-    MessageCreate, MessageResponse, NoteCreate, NoteResponse
+    TicketCreate, TicketResponse, TicketListItem, TicketFilter, 
+    MessageCreate, MessageResponse, NoteCreate, NoteResponse, TicketBulkUpdate, TicketBulkResult,
+    TicketImportResult, TicketExportFilter,
 )
+from app.modules.tickets.export import MEDIA_TYPES, parquet_available, stream_export
+from app.modules.tickets.importer import ImportFormat, format_for, import_file
 from app.modules.tickets.service import ticket_service
 from app.common.responses import APIResponse, ResponseMeta
 
@@ -29,27 +40,130 @@ def create_ticket(
     return APIResponse(data=result)
 
 
-@router.get("", response_model=APIResponse[list[TicketResponse]])
+@router.get("", response_model=APIResponse[list[TicketListItem]])
+# user (principal cache miss), optional total, page; none on a 304
+@query_budget(4)
 def list_tickets(
+    request: Request,
+    response: Response,
     user: Annotated[User, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
     filter_params: Annotated[TicketFilter, Query()],
 ):
-    items, total = ticket_service.list_tickets(db, filter_params, user)
-    return APIResponse(
-        data=items,
-        meta=ResponseMeta(total=total)
+    etag = list_etag(request, user)
+    if cached := not_modified(request, etag):
+        return cached
+    items, total, next_cursor = ticket_service.list_tickets(db, filter_params, user)
+    set_cache_headers(response, etag)
+    return APIResponse(data=items, meta=build_list_meta(filter_params, total, next_cursor))
+
+
+def list_etag(request: Request, user: User) -> str:
+    # Taken before the query runs: a write committed meanwhile moves the
+    # version, so the page can never be older than its ETag says
+    scope = user.id if user.role == Role.CUSTOMER else "staff"
+    query = sorted(request.query_params.multi_items())
+    return etag_for(change_versions.workspace(user.workspace_id), scope, query)
+
+
+def ticket_etag(ticket_id: uuid.UUID, version: Row | None) -> str | None:
+    # Read before the ticket itself: a write committed meanwhile moves an
+    # updated_at, so the body can never be older than its ETag says
+    return etag_for(ticket_id, *version) if version is not None else None
+
+
+def build_list_meta(
+    filter_params: TicketFilter, total: int | None, next_cursor: str | None
+) -> ResponseMeta:
+    return ResponseMeta(
+        page=None if filter_params.cursor else filter_params.page,
+        size=filter_params.size,
+        total=total,
+        total_is_estimate=(filter_params.count == "estimated") if total is not None else None,
+        next_cursor=next_cursor,
     )
 
 from app.modules.workspaces.models import Workspace
 
+# Before /{ticket_id}, which would take "export" for an id
+@router.get("/export", response_class=StreamingResponse)
+def export_tickets(
+    user: Annotated[User, Depends(require_roles(Role.ADMIN, Role.AGENT))],
+    filters: Annotated[TicketExportFilter, Query()],
+):
+    """
+    Every ticket matching the list filters, streamed as CSV, NDJSON or
+    Parquet (needs pyarrow). Messages and notes nest per ticket, so they
+    need NDJSON or Parquet.
+    """
+    if filters.format == "csv" and (filters.include_messages or filters.include_notes):
+        raise BadRequest(message="Messages and notes can only be exported as ndjson or parquet")
+    if filters.format == "parquet" and not parquet_available():
+        raise BadRequest(message="Parquet export is not available on this server")
+    filename = f"tickets-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{filters.format}"
+    return StreamingResponse(
+        stream_export(user.workspace_id, filters),
+        media_type=MEDIA_TYPES[filters.format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/bulk", response_model=APIResponse[list[TicketBulkResult]])
+# user, assignee, tags, lock, assign + history, status, SLA met,
+# tags + updated_at, outbox (with counters and audit): independent of the
+# number of tickets
+@query_budget(12)
+def bulk_update_tickets(
+    bulk_in: TicketBulkUpdate,
+    user: Annotated[User, Depends(require_roles(Role.ADMIN, Role.AGENT))],
+    db: Annotated[Session, Depends(get_db)],
+):
+    result = ticket_service.bulk_update(db, bulk_in, user)
+    return APIResponse(data=result)
+
+
+# Uploads above this spill from memory to a temporary file
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+@router.post("/import", response_model=APIResponse[TicketImportResult])
+async def import_tickets(
+    request: Request,
+    user: Annotated[User, Depends(require_roles(Role.ADMIN))],
+    db: Annotated[Session, Depends(get_db)],
+    format: Annotated[ImportFormat | None, Query()] = None,
+):
+    """
+    Raw NDJSON (application/x-ndjson) or CSV (text/csv) body, one ticket per
+    line/row (see TicketImportRecord). Re-sending a file only imports the
+    external_ids the workspace doesn't have yet.
+    """
+    fmt = format or format_for(request.headers.get("content-type"))
+    if fmt is None:
+        raise BadRequest(message="Send application/x-ndjson or text/csv, or pass ?format=")
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as body:
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        result = await run_in_threadpool(import_file, db, body, fmt, user.workspace_id, user)
+    return APIResponse(data=result)
+
+
 @router.get("/{ticket_id}", response_model=APIResponse[TicketResponse])
+# user (principal cache miss), updated_at versions, ticket; no ticket on a 304
+@query_budget(4)
 def get_ticket(
     ticket_id: uuid.UUID,
+    request: Request,
+    response: Response,
     user: Annotated[User, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ):
+    etag = ticket_etag(ticket_id, ticket_service.get_ticket_version(db, ticket_id, user))
+    if cached := not_modified(request, etag):
+        return cached
     result = ticket_service.get_ticket(db, ticket_id, user)
+    set_cache_headers(response, etag)
     return APIResponse(data=result)
 
 
@@ -53,6 +53,7 @@ class TicketResponse(TicketBase):
     created_at: datetime
     updated_at: datetime
     closed_at: datetime | None
+    external_id: str | None = None
     
     tags: list[TagResponse] = []
     
@@ -64,6 +65,34 @@ class TicketResponse(TicketBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserSummary(BaseModel):
+    id: uuid.UUID
+    full_name: str | None
+    email: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TicketListItem(TicketBase):
+    """Lean ticket row for list views: no workspace, users reduced to a summary."""
+    id: uuid.UUID
+    workspace_id: uuid.UUID
+    created_by_user_id: uuid.UUID
+    status: TicketStatus
+    priority: TicketPriority
+    channel: TicketChannel
+    assigned_agent_id: uuid.UUID | None
+    created_at: datetime
+    updated_at: datetime
+    closed_at: datetime | None
+
+    tags: list[TagResponse] = []
+    requester: UserSummary | None = None
+    assigned_agent: UserSummary | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class MessageBase(BaseModel):
     body: str
 
@@ -98,14 +127,104 @@ class NoteResponse(NoteBase):
     model_config = ConfigDict(from_attributes=True)
 
 
-class TicketFilter(BaseModel):
-    page: int = 1
-    size: int = 20
+# Tickets per POST /tickets/bulk request
+MAX_BULK_TICKETS = 500
+
+
+class TicketBulkUpdate(BaseModel):
+    ticket_ids: list[uuid.UUID] = Field(min_length=1, max_length=MAX_BULK_TICKETS)
+    status: TicketStatus | None = None
+    # Sent as null to unassign; left out to keep current assignees
+    assigned_agent_id: uuid.UUID | None = None
+    # Added to each ticket (existing tags are kept)
+    tag_ids: list[uuid.UUID] = []
+
+
+class TicketBulkResult(BaseModel):
+    ticket_id: uuid.UUID
+    ok: bool
+    error: str | None = None
+    status: TicketStatus | None = None
+    assigned_agent_id: uuid.UUID | None = None
+
+
+class ImportedMessage(BaseModel):
+    body: str = Field(min_length=1)
+    # Defaults to the ticket's requester
+    author_email: str | None = None
+    created_at: datetime | None = None
+
+
+class TicketImportRecord(BaseModel):
+    """One ticket of an NDJSON/CSV import (CSV: no messages, tags separated by "|")."""
+    external_id: str = Field(min_length=1, max_length=255)
+    subject: str = Field(min_length=1)
+    description: str = ""
+    status: TicketStatus = TicketStatus.NEW
+    priority: TicketPriority = TicketPriority.MEDIUM
+    channel: TicketChannel = TicketChannel.WEB
+    # Existing users of the workspace; the requester defaults to the importing user
+    requester_email: str | None = None
+    assignee_email: str | None = None
+    # Created in the workspace when missing
+    tags: list[str] = []
+    # Name of an SLA policy of the workspace
+    sla_policy: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    closed_at: datetime | None = None
+    messages: list[ImportedMessage] = []
+
+
+class TicketImportError(BaseModel):
+    line: int
+    external_id: str | None = None
+    error: str
+
+
+class TicketImportResult(BaseModel):
+    created: int = 0
+    # Already imported (same external_id), or repeated in the file
+    skipped: int = 0
+    failed: int = 0
+    messages: int = 0
+    # The first MAX_IMPORT_ERRORS only
+    errors: list[TicketImportError] = []
+    seconds: float = 0
+    rows_per_second: float = 0
+
+
+class TicketSearchFilter(BaseModel):
+    """Which tickets: shared by the list and the export."""
     q: str | None = None
     status: str | None = None # Comma separated
     priority: str | None = None
     assigned_to: uuid.UUID | Literal["unassigned"] | None = None
     tag: str | None = None # name or UUID
+    # Changed at or after this instant: deltas after a realtime event or a reconnect
+    updated_since: datetime | None = None
+
+
+class TicketFilter(TicketSearchFilter):
+    page: int = Field(default=1, ge=1)
+    size: int = Field(default=20, ge=1, le=100)
+    # Keyset pagination: opaque value from meta.next_cursor, ignores `page`
+    cursor: str | None = None
+    # Totals are opt-in; "estimated" reads the planner's row estimate
+    count: Literal["exact", "estimated"] | None = Field(
+        default=None, description="Include meta.total"
+    )
     # Sort
-    sort: Literal["created_at", "updated_at", "priority", "status"] = Field(default="created_at", description="Sort field")
+    sort: Literal["created_at", "updated_at", "priority", "status", "relevance"] = Field(
+        default="created_at", description="Sort field; relevance ranks full-text matches of `q`"
+    )
     order: Literal["asc", "desc"] = Field(default="desc", description="Sort order")
+
+
+class TicketExportFilter(TicketSearchFilter):
+    format: Literal["csv", "ndjson", "parquet"] = "csv"
+    sort: Literal["created_at", "updated_at", "priority", "status"] = "created_at"
+    order: Literal["asc", "desc"] = "asc"
+    # Nested lists: NDJSON and Parquet only
+    include_messages: bool = False
+    include_notes: bool = False
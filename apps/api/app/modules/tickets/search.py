@@ -0,0 +1,43 @@
+import re
+
+from sqlalchemy import func, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.modules.tickets.models import Ticket
+
+# Text search configuration used by the triggers that maintain
+# Ticket.search_vector / Ticket.notes_search_vector. "simple" does no
+# stemming, which keeps mixed-language tickets searchable.
+SEARCH_CONFIG = "simple"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_tsquery(q: str) -> str | None:
+    """
+    Turn free text into a prefix tsquery: "print err" -> "print:* & err:*".
+
+    Only word characters survive, so user input can never inject tsquery
+    operators. Returns None when nothing searchable is left.
+    """
+    words = _WORD_RE.findall(q.lower())
+    if not words:
+        return None
+    return " & ".join(f"{w}:*" for w in words)
+
+
+def search_condition(tsquery: str, include_notes: bool) -> ColumnElement[bool]:
+    query = func.to_tsquery(SEARCH_CONFIG, tsquery)
+    condition = Ticket.search_vector.op("@@")(query)
+    if include_notes:
+        # Two GIN-indexed predicates, combined by the planner with a BitmapOr
+        condition = or_(condition, Ticket.notes_search_vector.op("@@")(query))
+    return condition
+
+
+def search_rank(tsquery: str, include_notes: bool) -> ColumnElement[float]:
+    query = func.to_tsquery(SEARCH_CONFIG, tsquery)
+    rank = func.coalesce(func.ts_rank_cd(Ticket.search_vector, query), 0)
+    if include_notes:
+        rank = rank + func.coalesce(func.ts_rank_cd(Ticket.notes_search_vector, query), 0)
+    return rank
@@ -1,14 +1,26 @@
 import uuid
 from datetime import datetime, timezone
 
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
 from app.modules.tickets.repo import ticket_repo
-from app.modules.tickets.schemas import TicketCreate, TicketResponse, MessageCreate, MessageResponse, NoteCreate, NoteResponse
+from app.modules.outbox.repo import outbox_repo
+from app.modules.realtime.events import (
+    TICKET_ASSIGNED, TICKET_CREATED, TICKET_MESSAGE, TICKET_STATUS, TICKET_TAGS, TICKET_UPDATED,
+)
+from app.modules.reports.service import RESOLVED_STATUSES, report_service
+from app.modules.sla.repo import sla_repo
+from app.modules.sla.timers import ESCALATION, FIRST_RESPONSE, RESOLUTION, sla_timers
+from app.modules.tickets.schemas import (
+    TicketCreate, TicketResponse, MessageCreate, MessageResponse, NoteCreate, NoteResponse,
+    TicketBulkUpdate, TicketBulkResult,
+)
 from app.modules.tickets.models import Ticket, TicketStatus, Assignment
 from app.modules.users.models import User
 from app.core.security import Role
 from app.core.errors import PermissionDenied, NotFound, BadRequest
+from app.core.http_cache import change_versions
 
 
 class TicketService:
@@ -19,7 +31,16 @@ class TicketService:
         # Phase 2 spec: "solo customer (y opcionalmente admin/agent... por defecto customer)" -> 
         # For MVP we assume the authenticated user is the creator.
         
-        ticket = ticket_repo.create(db, ticket_in, user.workspace_id, user.id)
+        ticket = ticket_repo.create(db, ticket_in, user.workspace_id, user.id, commit=False)
+        db.flush()
+        outbox_repo.add(
+            db, user.workspace_id, TICKET_CREATED, [ticket.id],
+            report_service.created_counters(ticket),
+        )
+        db.commit()
+        change_versions.changed(user.workspace_id)
+        # Reload with the detail relations in one statement
+        ticket = ticket_repo.get_by_id(db, user.workspace_id, ticket.id)
         return TicketResponse.model_validate(ticket)
 
     def get_ticket(self, db: Session, ticket_id: uuid.UUID, user: User) -> TicketResponse:
@@ -32,12 +53,16 @@ class TicketService:
              
         return TicketResponse.model_validate(ticket)
 
+    def get_ticket_version(self, db: Session, ticket_id: uuid.UUID, user: User) -> Row | None:
+        """What the detail ETag hashes; None if get_ticket would be a 404."""
+        target_user_id = user.id if user.role == Role.CUSTOMER else None
+        return ticket_repo.get_version(db, user.workspace_id, ticket_id, target_user_id)
+
     def list_tickets(self, db: Session, filter_params, user: User):
         # Access control: Customer force filter
         target_user_id = user.id if user.role == Role.CUSTOMER else None
         
-        items, total = ticket_repo.list_tickets(db, user.workspace_id, filter_params, target_user_id)
-        return items, total
+        return ticket_repo.list_tickets(db, user.workspace_id, filter_params, target_user_id)
 
     def add_message(self, db: Session, ticket_id: uuid.UUID, message_in: MessageCreate, user: User) -> MessageResponse:
         # 1. Get Ticket (verify access)
@@ -47,20 +72,10 @@ class TicketService:
         msg = ticket_repo.add_message(db, ticket_id, user.workspace_id, user.id, message_in)
         
         # 3. Update Ticket Activity / Status
-        now = datetime.now(timezone.utc)
-        if user.role == Role.CUSTOMER:
-            ticket.last_customer_activity_at = now
-            # Re-open if resolved
-            if ticket.status == TicketStatus.RESOLVED:
-                ticket.status = TicketStatus.OPEN
-        else:
-            ticket.last_agent_activity_at = now
-            # Auto-open if New
-            if ticket.status == TicketStatus.NEW:
-                ticket.status = TicketStatus.OPEN
-        
+        self.apply_message_activity(ticket, user)
         
         # 4. SLA Hook: First Response Met
+        first_response = False
         if user.role != Role.CUSTOMER:
             # Check if SLA exists
             from app.modules.sla.models import TicketSLA
@@ -70,14 +85,19 @@ class TicketService:
             # Let's query TicketSLA directly here.
             
             tsla = db.query(TicketSLA).filter(TicketSLA.ticket_id == ticket_id).first()
-            if tsla and not tsla.first_response_met:
+            first_response = tsla is not None and not tsla.first_response_met
+            if first_response:
                 tsla.first_response_met = True
                 # Check if it was breached?
                 # Met means it happened. If breached is true, it remains true (you responded late).
                 # If breached false and now < due, great.
                 # Just set met = True.
                 
+        outbox_repo.add(db, user.workspace_id, TICKET_MESSAGE, [ticket_id])
         db.commit()
+        change_versions.changed(user.workspace_id)
+        if first_response:
+            sla_timers.cancel(ticket_id, FIRST_RESPONSE)
         db.refresh(msg)
         return MessageResponse.model_validate(msg)
 
@@ -94,18 +114,28 @@ class TicketService:
         except ValueError:
             raise BadRequest(message="Invalid status")
             
+        old_status = ticket.status
         ticket.status = new_status
         ticket.updated_at = datetime.now(timezone.utc)
-        
+        counters = report_service.status_change_counters(
+            ticket, old_status, new_status, ticket.updated_at
+        )
+
         # SLA Hook: Resolution Met
-        if new_status in [TicketStatus.RESOLVED, TicketStatus.CLOSED]:
+        resolved = new_status in [TicketStatus.RESOLVED, TicketStatus.CLOSED]
+        if resolved:
              from app.modules.sla.models import TicketSLA
              tsla = db.query(TicketSLA).filter(TicketSLA.ticket_id == ticket_id).first()
              if tsla and not tsla.resolution_met:
                  tsla.resolution_met = True
                  
+        outbox_repo.add(db, user.workspace_id, TICKET_STATUS, [ticket_id], counters)
         db.commit()
-        db.refresh(ticket)
+        change_versions.changed(user.workspace_id)
+        if resolved:
+            # Escalation only applies to open tickets
+            sla_timers.cancel(ticket_id, RESOLUTION, ESCALATION)
+        ticket = self._get_ticket_model(db, ticket_id, user)
         return TicketResponse.model_validate(ticket)
 
     def add_note(self, db: Session, ticket_id: uuid.UUID, note_in: NoteCreate, user: User) -> NoteResponse:
@@ -141,9 +171,11 @@ class TicketService:
             assigned_by_user_id=user.id
         )
         ticket_repo.add_assignment_history(db, assignment)
+        outbox_repo.add(db, user.workspace_id, TICKET_ASSIGNED, [ticket_id])
         
         db.commit()
-        db.refresh(ticket)
+        change_versions.changed(user.workspace_id)
+        ticket = self._get_ticket_model(db, ticket_id, user)
         return TicketResponse.model_validate(ticket)
 
     def attach_tags(self, db: Session, ticket_id: uuid.UUID, tag_ids: list[uuid.UUID], user: User) -> TicketResponse:
@@ -168,11 +200,143 @@ class TicketService:
              if not exists:
                  tt = TicketTag(ticket_id=ticket_id, tag_id=t_id)
                  db.add(tt)
-                 
+        # Tags are part of the ticket as served (and of its ETag)
+        ticket.updated_at = datetime.now(timezone.utc)
+
+        outbox_repo.add(db, user.workspace_id, TICKET_TAGS, [ticket_id])
         db.commit()
-        db.refresh(ticket)
+        change_versions.changed(user.workspace_id)
+        ticket = self._get_ticket_model(db, ticket_id, user)
         return TicketResponse.model_validate(ticket)
 
+    def bulk_update(
+        self, db: Session, bulk_in: TicketBulkUpdate, user: User
+    ) -> list[TicketBulkResult]:
+        """
+        Status, assignee and tags for many tickets in one transaction, with a
+        fixed number of statements: each change is one set-based UPDATE/INSERT
+        over the ids it applies to. Unknown ids are reported, not fatal.
+        """
+        if user.role not in [Role.ADMIN, Role.AGENT]:
+            raise PermissionDenied(message="Only agents/admins can update tickets")
+        assign = "assigned_agent_id" in bulk_in.model_fields_set
+        if bulk_in.status is None and not assign and not bulk_in.tag_ids:
+            raise BadRequest(message="Nothing to update")
+
+        if assign and bulk_in.assigned_agent_id is not None:
+            assignee = db.get(User, bulk_in.assigned_agent_id)
+            if (assignee is None or assignee.workspace_id != user.workspace_id
+                    or assignee.role not in [Role.ADMIN, Role.AGENT] or not assignee.is_active):
+                raise BadRequest(
+                    message="Assignee must be an active agent/admin of this workspace"
+                )
+        tag_ids = list(dict.fromkeys(bulk_in.tag_ids))
+        if tag_ids:
+            known = ticket_repo.workspace_tag_ids(db, user.workspace_id, tag_ids)
+            if len(known) != len(tag_ids):
+                raise BadRequest(message="Unknown tag")
+
+        # Rows locked in id order, so overlapping bulk requests can't deadlock
+        ticket_ids = list(dict.fromkeys(bulk_in.ticket_ids))
+        current = {
+            row.id: row for row in ticket_repo.lock_many(db, user.workspace_id, ticket_ids)
+        }
+        found = [t for t in ticket_ids if t in current]
+        status = {t: current[t].status for t in found}
+        assignee_of = {t: current[t].assigned_agent_id for t in found}
+        changes: dict[uuid.UUID, dict] = {t: {} for t in found}
+        now = datetime.now(timezone.utc)
+
+        # Assignee first, so resolutions below credit the new one
+        if assign:
+            new_assignee = bulk_in.assigned_agent_id
+            reassigned = [t for t in found if assignee_of[t] != new_assignee]
+            if reassigned:
+                ticket_repo.update_many(
+                    db, reassigned, assigned_agent_id=new_assignee, updated_at=now
+                )
+                ticket_repo.add_assignments(db, [{
+                    "id": uuid.uuid4(),
+                    "ticket_id": t,
+                    "workspace_id": user.workspace_id,
+                    "assigned_agent_id": new_assignee,
+                    "assigned_by_user_id": user.id,
+                    "created_at": now,
+                } for t in reassigned])
+            for t in reassigned:
+                changes[t]["assigned_agent_id"] = [
+                    str(assignee_of[t]) if assignee_of[t] else None,
+                    str(new_assignee) if new_assignee else None,
+                ]
+                assignee_of[t] = new_assignee
+
+        counters = None
+        if bulk_in.status is not None:
+            moved = [t for t in found if status[t] != bulk_in.status]
+            if moved:
+                ticket_repo.update_many(db, moved, status=bulk_in.status, updated_at=now)
+            # Same rule as status_change_counters: only the move into resolved/closed counts
+            resolved = [
+                t for t in moved
+                if status[t] not in RESOLVED_STATUSES and bulk_in.status in RESOLVED_STATUSES
+            ]
+            if resolved:
+                counters = report_service.resolution_counters(
+                    [assignee_of[t] for t in resolved], now
+                )
+            if bulk_in.status in RESOLVED_STATUSES and moved:
+                sla_repo.mark_resolution_met(db, moved)
+            for t in moved:
+                changes[t]["status"] = [status[t].value, bulk_in.status.value]
+                status[t] = bulk_in.status
+
+        if tag_ids:
+            ticket_repo.add_tags_many(db, found, tag_ids)
+            ticket_repo.update_many(db, found, updated_at=now)
+            for t in found:
+                changes[t]["tag_ids"] = [str(g) for g in tag_ids]
+
+        # Every resolved ticket is audited, so the counters ride on this event
+        audited = [t for t in found if changes[t]]
+        outbox_repo.add(
+            db, user.workspace_id, TICKET_UPDATED, audited, counters,
+            audit=[{
+                "actor_user_id": str(user.id),
+                "entity_type": "ticket",
+                "entity_id": str(t),
+                "action": "bulk_update",
+                "meta": changes[t],
+            } for t in audited],
+        )
+        db.commit()
+        change_versions.changed(user.workspace_id)
+
+        if bulk_in.status in RESOLVED_STATUSES:
+            sla_timers.cancel_many(found, RESOLUTION, ESCALATION)
+
+        return [
+            TicketBulkResult(
+                ticket_id=t, ok=True, status=status[t], assigned_agent_id=assignee_of[t]
+            )
+            if t in current
+            else TicketBulkResult(ticket_id=t, ok=False, error="not_found")
+            for t in ticket_ids
+        ]
+
+    def apply_message_activity(self, ticket: Ticket, user: User) -> None:
+        # Shared with the async service: activity timestamps and status moves on a new message
+        now = datetime.now(timezone.utc)
+        if user.role == Role.CUSTOMER:
+            ticket.last_customer_activity_at = now
+            # Re-open if resolved
+            if ticket.status == TicketStatus.RESOLVED:
+                ticket.status = TicketStatus.OPEN
+        else:
+            ticket.last_agent_activity_at = now
+            # Auto-open if New
+            if ticket.status == TicketStatus.NEW:
+                ticket.status = TicketStatus.OPEN
+
     def _get_ticket_model(self, db: Session, ticket_id: uuid.UUID, user: User) -> Ticket:
         # Helper to get model object for internal updates
         target_user_id = user.id if user.role == Role.CUSTOMER else None
@@ -0,0 +1,18 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.users.models import User
+
+
+class AsyncUserRepo:
+    async def get_by_id(self, db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+        # Identity map first, then a primary key SELECT
+        return await db.get(User, user_id)
+
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
+        return await db.scalar(select(User).where(User.email == email))
+
+async_user_repo = AsyncUserRepo()
@@ -0,0 +1,17 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from app.common.responses import APIResponse
+from app.modules.auth.deps import get_current_user_async
+from app.modules.users.models import User
+from app.modules.users.schemas import UserRead
+
+router = APIRouter()
+
+
+@router.get("/me", response_model=APIResponse[UserRead])
+async def get_me_async(
+    current_user: Annotated[User, Depends(get_current_user_async)],
+):
+    return APIResponse(data=UserRead.model_validate(current_user))
@@ -6,6 +6,8 @@ from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.modules.auth.deps import get_current_user, require_roles
+from app.modules.auth.cache import principal_cache
+from app.core.http_cache import change_versions
 from app.modules.users.models import User
 from app.modules.users.schemas import UserRead, UserCreate, UserUpdate
 from app.core.security import Role, get_password_hash
@@ -103,6 +105,10 @@ def update_user(
             setattr(user, field, value)
     
     db.commit()
+    # Deactivation must take effect on the user's next request
+    principal_cache.invalidate(user.id)
+    # Ticket lists embed requester/assignee names (details follow updated_at)
+    change_versions.changed(user.workspace_id)
     db.refresh(user)
     return APIResponse(data=UserRead.model_validate(user))
 
@@ -126,4 +132,6 @@ def delete_user(
     
     db.delete(user)
     db.commit()
+    principal_cache.invalidate(user_id)
+    change_versions.changed(current_user.workspace_id)
     return {"message": "User deleted"}
@@ -0,0 +1,53 @@
+"""
+Outbox relay: delivers the domain events services write to outbox_events
+in their own transaction (app.modules.outbox) to the Redis stream
+outbox:events and to the realtime channels.
+
+    python -m app.outbox_relay
+
+Any number of relays can run; each event is claimed by exactly one.
+"""
+import logging
+import signal
+import time
+
+import redis
+
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from app.modules.outbox.relay import outbox_relay
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def run_relay() -> None:
+    configure_logging()
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info("Outbox relay started")
+    while not stopping:
+        try:
+            if outbox_relay.process() == outbox_relay.batch_size:
+                # Backlog: next batch right away
+                continue
+            delay = settings.outbox_poll_seconds
+        except redis.RedisError:
+            logger.exception("outbox: redis unavailable")
+            delay = settings.outbox_retry_seconds
+        except Exception:
+            logger.exception("outbox: relay failed")
+            delay = settings.outbox_retry_seconds
+        time.sleep(delay)
+
+
+if __name__ == "__main__":
+    run_relay()
@@ -1,49 +1,274 @@
+import logging
+import random
+import signal
 import time
-import schedule
-from app.queue import task_queue
-from app.jobs import sla_escalation_job, auto_close_job, weekly_report_job
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import redis
+
 from app.core.config import get_settings
+from app.core.cron import CronSpec, weekly_cron
+from app.core.logging import configure_logging
+from app.core.redis import get_redis
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+
+class IntervalSpec:
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+
+    def __repr__(self) -> str:
+        return f"IntervalSpec({self.seconds})"
+
+    def next_after(self, after: datetime) -> datetime:
+        return after + timedelta(seconds=self.seconds)
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable
+    spec: CronSpec | IntervalSpec
+    # Random delay added to every run so replicas/jobs don't fire in lockstep
+    jitter_seconds: float = 0
+    # Runs found more than this late (scheduler down, lease lost) are skipped
+    misfire_grace_seconds: float = 300
+    # First run for a job with no stored state: now (interval jobs) or the next cron time
+    run_on_first_start: bool = False
+
+
+class RedisScheduleState:
+    """
+    Next-run times and the leader lease, in Redis.
+
+    Next-run times survive restarts, and advancing one is a compare-and-set,
+    so even two schedulers that both think they lead fire a run only once.
+    """
+
+    NEXT_RUN_KEY = "scheduler:next_run"
+    LEASE_KEY = "scheduler:leader"
+
+    _CAS_NEXT_RUN = """
+    local current = redis.call('HGET', KEYS[1], ARGV[1])
+    if current == ARGV[2] or (current == false and ARGV[2] == '') then
+        redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+        return 1
+    end
+    return 0
+    """
+    _RENEW = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    _RELEASE = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+        self._cas = client.register_script(self._CAS_NEXT_RUN)
+        self._renew = client.register_script(self._RENEW)
+        self._release = client.register_script(self._RELEASE)
+
+    def get_next_run(self, name: str) -> str | None:
+        value = self.client.hget(self.NEXT_RUN_KEY, name)
+        return value.decode() if value is not None else None
+
+    def advance(self, name: str, expected: str | None, next_run: str) -> bool:
+        return bool(self._cas(keys=[self.NEXT_RUN_KEY], args=[name, expected or "", next_run]))
+
+    def acquire_lease(self, owner: str, ttl_seconds: float) -> bool:
+        ttl_ms = int(ttl_seconds * 1000)
+        if self.client.set(self.LEASE_KEY, owner, nx=True, px=ttl_ms):
+            return True
+        return bool(self._renew(keys=[self.LEASE_KEY], args=[owner, ttl_ms]))
+
+    def release_lease(self, owner: str) -> None:
+        self._release(keys=[self.LEASE_KEY], args=[owner])
+
+
+class Scheduler:
+    def __init__(
+        self,
+        jobs: list[ScheduledJob],
+        state,
+        enqueue: Callable[[ScheduledJob, datetime], None],
+        lease_ttl_seconds: float = 30,
+        owner: str | None = None,
+    ):
+        self.jobs = jobs
+        self.state = state
+        self.enqueue = enqueue
+        self.lease_ttl_seconds = lease_ttl_seconds
+        self.owner = owner or f"scheduler-{uuid.uuid4().hex[:12]}"
+        self.is_leader = False
+
+    def tick(self, now: datetime) -> list[str]:
+        """Fire whatever is due. Returns the names of the jobs enqueued."""
+        leader = self.state.acquire_lease(self.owner, self.lease_ttl_seconds)
+        if leader != self.is_leader:
+            logger.info("%s %s leadership", self.owner, "acquired" if leader else "lost")
+            self.is_leader = leader
+        if not leader:
+            return []
+
+        fired = []
+        for job in self.jobs:
+            if self._tick_job(job, now):
+                fired.append(job.name)
+        return fired
+
+    def _tick_job(self, job: ScheduledJob, now: datetime) -> bool:
+        stored = self.state.get_next_run(job.name)
+        if stored is None and not job.run_on_first_start:
+            first = self._next(job, now)
+            self.state.advance(job.name, None, first.isoformat())
+            logger.info("%s first run at %s", job.name, first.isoformat())
+            return False
+        due = now if stored is None else datetime.fromisoformat(stored)
+
+        if due > now:
+            return False
+
+        next_run = self._next(job, now)
+        if not self.state.advance(job.name, stored, next_run.isoformat()):
+            # Someone else already claimed this run
+            return False
+
+        lateness = (now - due).total_seconds()
+        if lateness > job.misfire_grace_seconds:
+            logger.warning(
+                "%s misfired: due %s, %.0fs late; skipped, next at %s",
+                job.name,
+                due.isoformat(),
+                lateness,
+                next_run.isoformat(),
+            )
+            return False
+
+        logger.info(
+            "Enqueuing %s (due %s), next at %s", job.name, due.isoformat(), next_run.isoformat()
+        )
+        self.enqueue(job, due)
+        return True
+
+    def _next(self, job: ScheduledJob, now: datetime) -> datetime:
+        next_run = job.spec.next_after(now)
+        if job.jitter_seconds:
+            next_run += timedelta(seconds=random.uniform(0, job.jitter_seconds))
+        return next_run
+
+    def release(self) -> None:
+        if self.is_leader:
+            self.state.release_lease(self.owner)
+            self.is_leader = False
+
+
+WEEKLY_REPORT_MISFIRE_GRACE = timedelta(days=7)
+
+
+def default_jobs() -> list[ScheduledJob]:
+    from app import jobs
+
+    # With fan-out the scheduler enqueues the coordinators, which enqueue
+    # one sub-job per workspace.
+    fanout = settings.jobs_fanout_enabled
+    sla_escalation_job = jobs.sla_escalation_coordinator if fanout else jobs.sla_escalation_job
+    auto_close_job = jobs.auto_close_coordinator if fanout else jobs.auto_close_job
+    weekly_report_job = jobs.weekly_report_coordinator if fanout else jobs.weekly_report_job
+
+    grace = settings.scheduler_misfire_grace_seconds
+    jitter = settings.scheduler_jitter_seconds
+    return [
+        ScheduledJob(
+            "sla_escalation",
+            sla_escalation_job,
+            IntervalSpec(settings.sla_escalation_interval_seconds),
+            # Late escalations are still worth running; jitter stays small
+            # relative to the interval.
+            jitter_seconds=min(jitter, settings.sla_escalation_interval_seconds / 10),
+            misfire_grace_seconds=max(grace, settings.sla_escalation_interval_seconds),
+            run_on_first_start=True,
+        ),
+        ScheduledJob(
+            "auto_close", auto_close_job, CronSpec(settings.auto_close_cron), jitter, grace
+        ),
+        ScheduledJob(
+            "weekly_report",
+            weekly_report_job,
+            CronSpec(weekly_cron(settings.weekly_report_day, settings.weekly_report_hour)),
+            jitter,
+            # A skipped run would lose the week's snapshot for good, and a
+            # late one is harmless: the job snapshots the last completed
+            # week and skips workspaces that already have it.
+            misfire_grace_seconds=max(grace, WEEKLY_REPORT_MISFIRE_GRACE.total_seconds()),
+        ),
+    ]
+
+
+def enqueue_job(job: ScheduledJob, due: datetime) -> None:
+    from rq.job import Job
+
+    from app.queue import task_queue
+
+    # The leader lease and the compare-and-set on the next-run time are what
+    # keep a run from firing twice. The deterministic id is a backstop on top:
+    # enqueueing an existing id would overwrite and re-queue that job, so an
+    # id RQ still knows is skipped instead.
+    job_id = f"{job.name}-{int(due.timestamp())}"
+    if Job.exists(job_id, connection=task_queue.connection):
+        logger.warning("%s run %s already enqueued; skipped", job.name, job_id)
+        return
+    # scheduled_at lets track_job record how late the run started
+    task_queue.enqueue(job.func, job_id=job_id, meta={"scheduled_at": due.isoformat()})
+
+
 def run_scheduler():
-    # Enqueue jobs periodicallly
-    # We use 'schedule' lib or just simple loop with sleep and checks
-    # Since we didn't add 'schedule' to dependencies, I'll write a simple loop with helper.
-    # Wait, did I add 'schedule'? No.
-    # I'll use simple time check loop.
-    
-    last_escalation = 0
-    last_daily = 0
-    
-    print("Scheduler started...")
-    
-    while True:
-        now = time.time()
-        
-        # Escalation (every 5 mins)
-        if now - last_escalation > settings.sla_escalation_interval_seconds:
-            print("Enqueuing SLA Escalation Job")
-            task_queue.enqueue(sla_escalation_job)
-            last_escalation = now
-            
-        # Daily (check once a day, e.g. check current hour?)
-        # For simplicity in MVP, lets just use interval of 24h, or explicit check.
-        # Let's say we check every hour if logic needs running?
-        # Auto close and weekly report depend on "Daily" or "Weekly" timing.
-        # Better: use a robust library or just basic check.
-        
-        # Daily Auto Close
-        if now - last_daily > 86400: # 24h
-             print("Enqueuing Auto Close Job")
-             task_queue.enqueue(auto_close_job)
-             last_daily = now
-             
-        # Weekly
-        # Check if Monday 9am?
-        # Skip for MVP unless needed.
-             
-        time.sleep(60)
+    configure_logging()
+    scheduler = Scheduler(
+        default_jobs(),
+        RedisScheduleState(get_redis()),
+        enqueue_job,
+        lease_ttl_seconds=settings.scheduler_lease_ttl_seconds,
+    )
+    for job in scheduler.jobs:
+        logger.info("Scheduled %s: %r", job.name, job.spec)
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info("Scheduler %s started", scheduler.owner)
+    try:
+        while not stopping:
+            try:
+                scheduler.tick(datetime.now(timezone.utc))
+            except redis.RedisError:
+                # Without Redis nobody can hold the lease; retry next tick
+                logger.exception("Scheduler tick failed")
+                scheduler.is_leader = False
+            time.sleep(settings.scheduler_tick_seconds)
+    finally:
+        try:
+            scheduler.release()
+        except redis.RedisError:
+            pass
+
 
 if __name__ == "__main__":
     run_scheduler()
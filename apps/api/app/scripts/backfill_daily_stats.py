@@ -0,0 +1,138 @@
+"""
+Rebuild the daily report counters (workspace_daily_stats, agent_daily_stats)
+from the raw tables.
+
+Run once after the migration, and after anything that writes tickets without
+going through TicketService (seed scripts, manual SQL). Rebuilt rows replace
+what is there, so it is safe to re-run.
+
+    python -m app.scripts.backfill_daily_stats [--workspace-id ID] [--since 2026-01-01]
+
+Resolution and breach days are approximated from closed_at/updated_at, as
+the raw tables don't keep the transition time.
+"""
+import argparse
+import uuid
+from datetime import date
+
+from sqlalchemy import Date, cast, delete, func, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.base import Base  # noqa: F401  # registers every mapper
+from app.db.session import SessionLocal
+from app.modules.reports.models import AgentDailyStats, WorkspaceDailyStats
+from app.modules.reports.service import RESOLVED_STATUSES
+from app.modules.sla.models import TicketSLA
+from app.modules.tickets.models import Ticket
+
+
+def utc_day(column):
+    return cast(func.timezone("UTC", column), Date)
+
+
+def backfill(
+    db: Session, workspace_id: uuid.UUID | None = None, since: date | None = None
+) -> dict[str, int]:
+    def scoped(stmt, model, day_expr):
+        if workspace_id is not None:
+            stmt = stmt.where(model.workspace_id == workspace_id)
+        if since is not None:
+            stmt = stmt.where(day_expr >= since)
+        return stmt
+
+    for model in (WorkspaceDailyStats, AgentDailyStats):
+        db.execute(scoped(delete(model), model, model.day))
+
+    def upsert_workspace(column: str, source) -> int:
+        stmt = insert(WorkspaceDailyStats).from_select(["workspace_id", "day", column], source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["workspace_id", "day"],
+            set_={column: getattr(stmt.excluded, column)},
+        )
+        return db.execute(stmt).rowcount
+
+    created_day = utc_day(Ticket.created_at)
+    resolved_day = utc_day(func.coalesce(Ticket.closed_at, Ticket.updated_at))
+    breach_day = utc_day(TicketSLA.updated_at)
+    resolved = Ticket.status.in_(RESOLVED_STATUSES)
+
+    counts = {
+        "tickets_created": upsert_workspace(
+            "tickets_created",
+            scoped(
+                select(Ticket.workspace_id, created_day, func.count())
+                .group_by(Ticket.workspace_id, created_day),
+                Ticket,
+                created_day,
+            ),
+        ),
+        "tickets_resolved": upsert_workspace(
+            "tickets_resolved",
+            scoped(
+                select(Ticket.workspace_id, resolved_day, func.count())
+                .where(resolved)
+                .group_by(Ticket.workspace_id, resolved_day),
+                Ticket,
+                resolved_day,
+            ),
+        ),
+        "first_response_breaches": upsert_workspace(
+            "first_response_breaches",
+            scoped(
+                select(TicketSLA.workspace_id, breach_day, func.count())
+                .where(TicketSLA.first_response_breached == true())
+                .group_by(TicketSLA.workspace_id, breach_day),
+                TicketSLA,
+                breach_day,
+            ),
+        ),
+        "resolution_breaches": upsert_workspace(
+            "resolution_breaches",
+            scoped(
+                select(TicketSLA.workspace_id, breach_day, func.count())
+                .where(TicketSLA.resolution_breached == true())
+                .group_by(TicketSLA.workspace_id, breach_day),
+                TicketSLA,
+                breach_day,
+            ),
+        ),
+    }
+
+    agent_source = scoped(
+        select(Ticket.workspace_id, Ticket.assigned_agent_id, resolved_day, func.count())
+        .where(resolved, Ticket.assigned_agent_id.is_not(None))
+        .group_by(Ticket.workspace_id, Ticket.assigned_agent_id, resolved_day),
+        Ticket, resolved_day,
+    )
+    counts["agent_days"] = db.execute(
+        insert(AgentDailyStats).from_select(
+            ["workspace_id", "agent_id", "day", "tickets_resolved"], agent_source
+        )
+    ).rowcount
+
+    db.commit()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--workspace-id", type=uuid.UUID, default=None)
+    parser.add_argument(
+        "--since", type=date.fromisoformat, default=None, help="Only rebuild days >= this date"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        counts = backfill(db, args.workspace_id, args.since)
+    finally:
+        db.close()
+    for name, rows in counts.items():
+        print(f"{name}: {rows} day rows")
+
+
+if __name__ == "__main__":
+    main()
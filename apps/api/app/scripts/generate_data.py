@@ -0,0 +1,333 @@
+"""
+Generate a production-sized synthetic dataset: workspaces with agents,
+customers, tags, SLA policies, tickets with messages, internal notes, tags
+and a configurable SLA mix.
+
+Rows are streamed with COPY (psycopg), one chunk of tickets at a time, so
+memory stays flat and millions of rows load in minutes:
+
+    python -m app.scripts.generate_data --workspaces 10 --tickets 200000 --messages 4
+
+Every user's password is --password (default "password123"); logins are
+admin@ws<N>.loadtest.example.com, agent<I>@ws<N>... and customer<I>@ws<N>...,
+which is what loadtests/locustfile.py uses.
+
+The full-text triggers would rewrite the ticket row once per message, so
+they are disabled while loading and search vectors are rebuilt per
+workspace afterwards in one pass. Daily report counters are rebuilt with
+app.scripts.backfill_daily_stats at the end.
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.security import Role, get_password_hash
+from app.db.base import Base  # noqa: F401  # registers every mapper
+from app.db.session import SessionLocal
+from app.modules.tickets.models import TicketChannel, TicketPriority, TicketStatus
+from app.modules.tickets.search import SEARCH_CONFIG
+from app.scripts.backfill_daily_stats import backfill
+
+EMAIL_DOMAIN = "loadtest.example.com"
+
+# Tables whose full-text triggers are switched off during the load
+SEARCH_TRIGGERS = {
+    "tickets": "tickets_search_vector_trg",
+    "ticket_messages": "ticket_messages_search_trg",
+    "internal_notes": "internal_notes_search_trg",
+}
+
+STATUS_WEIGHTS = {
+    TicketStatus.NEW: 10,
+    TicketStatus.OPEN: 15,
+    TicketStatus.PENDING: 10,
+    TicketStatus.RESOLVED: 25,
+    TicketStatus.CLOSED: 40,
+}
+PRIORITY_WEIGHTS = {
+    TicketPriority.LOW: 30,
+    TicketPriority.MEDIUM: 45,
+    TicketPriority.HIGH: 20,
+    TicketPriority.URGENT: 5,
+}
+
+# Small vocabulary so searches for common words hit many tickets and rarer
+# ones few, roughly like real support traffic
+PRODUCTS = [
+    "printer", "vpn", "email", "laptop", "invoice", "password", "wifi", "database", "backup",
+    "license", "monitor", "phone", "calendar", "firewall", "router", "account", "report",
+    "dashboard", "api", "sso",
+]
+PROBLEMS = [
+    "not working", "error", "slow", "cannot connect", "crashes", "login failed", "timeout",
+    "missing data", "access denied", "sync issue", "update failed", "billing question",
+]
+FILLER = (
+    "please help we tried restarting the device and the problem persists since this morning "
+    "users in the office are affected and the issue blocks our work thanks in advance for checking"
+).split()
+TAG_NAMES = [
+    "billing", "hardware", "network", "software", "urgent", "vip", "onboarding", "security",
+    "bug", "feature-request", "refund", "outage", "mobile", "integration", "training",
+]
+
+
+def email(kind: str, index: int | None, workspace_no: int) -> str:
+    local = kind if index is None else f"{kind}{index}"
+    return f"{local}@ws{workspace_no}.{EMAIL_DOMAIN}"
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(FILLER) for _ in range(words))
+
+
+class Copier:
+    """COPY FROM STDIN inside the session's transaction, row counts kept per table."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.rows: dict[str, int] = {}
+
+    def copy(self, table: str, columns: tuple[str, ...], rows) -> None:
+        # The session may hold a different pooled connection after each commit
+        cursor = self.db.connection().connection.driver_connection.cursor()
+        n = 0
+        with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                n += 1
+        self.rows[table] = self.rows.get(table, 0) + n
+
+
+def set_search_triggers(db: Session, enabled: bool) -> None:
+    action = "ENABLE" if enabled else "DISABLE"
+    for table, trigger in SEARCH_TRIGGERS.items():
+        db.execute(text(f"ALTER TABLE {table} {action} TRIGGER {trigger}"))
+    db.commit()
+
+
+def rebuild_search_vectors(db: Session, workspace_id: uuid.UUID) -> None:
+    # Same documents the triggers build (see migration 67ec5b14a69c), set-based
+    db.execute(text(f"""
+        UPDATE tickets t
+        SET search_vector =
+            setweight(to_tsvector('{SEARCH_CONFIG}', t.subject), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', t.description), 'B') ||
+            coalesce(m.vector, ''::tsvector),
+            notes_search_vector = n.vector
+        FROM tickets base
+        LEFT JOIN (
+            SELECT ticket_id,
+                   setweight(to_tsvector('{SEARCH_CONFIG}', string_agg(body, ' ')), 'C') AS vector
+            FROM ticket_messages WHERE workspace_id = :ws GROUP BY ticket_id
+        ) m ON m.ticket_id = base.id
+        LEFT JOIN (
+            SELECT ticket_id, to_tsvector('{SEARCH_CONFIG}', string_agg(body, ' ')) AS vector
+            FROM internal_notes WHERE workspace_id = :ws GROUP BY ticket_id
+        ) n ON n.ticket_id = base.id
+        WHERE t.id = base.id AND base.workspace_id = :ws
+    """), {"ws": workspace_id})
+    db.commit()
+
+
+def generate_workspace(
+    db: Session, copier: Copier, rng: random.Random, workspace_no: int, args, password_hash: str
+) -> uuid.UUID:
+    now = datetime.now(timezone.utc)
+    workspace_id = uuid.uuid4()
+    copier.copy("workspaces", ("id", "name", "created_at", "updated_at"),
+                [(workspace_id, f"Load Test {workspace_no}", now, now)])
+
+    def user_rows(role: Role, kind: str, count: int | None):
+        indexes = [None] if count is None else range(count)
+        return [
+            (
+                uuid.uuid4(), email(kind, i, workspace_no),
+                f"{kind.title()} {'' if i is None else i}".strip(),
+                password_hash, role.name, True, workspace_id, now, now,
+            )
+            for i in indexes
+        ]
+
+    admin = user_rows(Role.ADMIN, "admin", None)
+    agents = user_rows(Role.AGENT, "agent", args.agents)
+    customers = user_rows(Role.CUSTOMER, "customer", args.customers)
+    copier.copy("users", (
+        "id", "email", "full_name", "password_hash", "role", "is_active", "workspace_id",
+        "created_at", "updated_at",
+    ), admin + agents + customers)
+    staff_ids = [r[0] for r in admin + agents]
+    agent_ids = [r[0] for r in agents] or staff_ids
+    customer_ids = [r[0] for r in customers] or staff_ids
+
+    tag_ids = [uuid.uuid4() for _ in range(args.tags)]
+
+    def tag_name(i: int) -> str:
+        suffix = f"-{i // len(TAG_NAMES)}" if i >= len(TAG_NAMES) else ""
+        return TAG_NAMES[i % len(TAG_NAMES)] + suffix
+
+    copier.copy("tags", ("id", "workspace_id", "name", "color", "created_at"), [
+        (tag_id, workspace_id, tag_name(i), None, now) for i, tag_id in enumerate(tag_ids)
+    ])
+
+    policy_id = uuid.uuid4()
+    first_response_minutes, resolution_minutes = 60, 24 * 60
+    copier.copy("sla_policies", (
+        "id", "workspace_id", "name", "first_response_time_minutes", "resolution_time_minutes",
+        "is_active", "created_at", "updated_at",
+    ), [
+        (policy_id, workspace_id, "Standard", first_response_minutes, resolution_minutes,
+         True, now, now),
+    ])
+    db.commit()
+
+    statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+    priorities, priority_weights = zip(*PRIORITY_WEIGHTS.items())
+    channels = list(TicketChannel)
+    span_seconds = args.days * 86400
+
+    for start in range(0, args.tickets, args.batch_size):
+        n = min(args.batch_size, args.tickets - start)
+        tickets, slas, ticket_tags, messages, notes = [], [], [], [], []
+        for _ in range(n):
+            ticket_id = uuid.uuid4()
+            created_at = now - timedelta(seconds=rng.randrange(span_seconds))
+            status = rng.choices(statuses, status_weights)[0]
+            assigned = status != TicketStatus.NEW or rng.random() < 0.3
+            assignee = rng.choice(agent_ids) if assigned else None
+            requester = rng.choice(customer_ids)
+            done = status in (TicketStatus.RESOLVED, TicketStatus.CLOSED)
+            updated_at = min(created_at + timedelta(minutes=rng.randrange(5, 7 * 24 * 60)), now)
+            tickets.append((
+                ticket_id, workspace_id, requester,
+                f"{rng.choice(PRODUCTS)} {rng.choice(PROBLEMS)}",
+                f"{rng.choice(PRODUCTS)} {rng.choice(PROBLEMS)}. {sentence(rng, 25)}",
+                status.name, rng.choices(priorities, priority_weights)[0].name,
+                rng.choice(channels).name, assignee, created_at, updated_at,
+                created_at, updated_at if assignee else None,
+                updated_at if status == TicketStatus.CLOSED else None,
+            ))
+
+            # SLA mix: breached, first response met, or still pending
+            roll = rng.random()
+            resolution_breached = roll < args.sla_breached
+            first_response_breached = resolution_breached and rng.random() < 0.5
+            first_response_met = not first_response_breached and (
+                done or resolution_breached or roll < args.sla_breached + args.sla_met
+            )
+            slas.append((
+                ticket_id, workspace_id, policy_id,
+                created_at + timedelta(minutes=first_response_minutes),
+                created_at + timedelta(minutes=resolution_minutes),
+                first_response_met, done and not resolution_breached,
+                first_response_breached, resolution_breached,
+                rng.randrange(1, 3) if resolution_breached else 0, created_at, updated_at,
+            ))
+
+            tag_count = min(len(tag_ids), rng.randrange(args.tags_per_ticket + 1))
+            for tag_id in rng.sample(tag_ids, tag_count):
+                ticket_tags.append((ticket_id, tag_id))
+
+            at = created_at
+            for m in range(rng.randrange(2 * args.messages + 1)):
+                at = min(at + timedelta(minutes=rng.randrange(1, 600)), now)
+                author = requester if m % 2 == 0 or assignee is None else assignee
+                body = f"{rng.choice(PROBLEMS)} {sentence(rng, 15)}"
+                messages.append((uuid.uuid4(), ticket_id, workspace_id, author, body, at))
+            if assignee is not None and rng.random() < args.notes:
+                body = sentence(rng, 12)
+                notes.append((uuid.uuid4(), ticket_id, workspace_id, assignee, body, updated_at))
+
+        copier.copy("tickets", (
+            "id", "workspace_id", "created_by_user_id", "subject", "description", "status",
+            "priority", "channel", "assigned_agent_id", "created_at", "updated_at",
+            "last_customer_activity_at", "last_agent_activity_at", "closed_at",
+        ), tickets)
+        copier.copy("ticket_slas", (
+            "ticket_id", "workspace_id", "policy_id", "first_response_due_at", "resolution_due_at",
+            "first_response_met", "resolution_met", "first_response_breached",
+            "resolution_breached", "escalated_level", "created_at", "updated_at",
+        ), slas)
+        copier.copy("ticket_tags", ("ticket_id", "tag_id"), ticket_tags)
+        body_columns = ("id", "ticket_id", "workspace_id", "author_user_id", "body", "created_at")
+        copier.copy("ticket_messages", body_columns, messages)
+        copier.copy("internal_notes", body_columns, notes)
+        db.commit()
+    return workspace_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--workspaces", type=int, default=5)
+    parser.add_argument("--agents", type=int, default=20,
+                        help="Agents per workspace (plus one admin)")
+    parser.add_argument("--customers", type=int, default=500, help="Customers per workspace")
+    parser.add_argument("--tickets", type=int, default=50000, help="Tickets per workspace")
+    parser.add_argument("--messages", type=int, default=3, help="Average messages per ticket")
+    parser.add_argument("--notes", type=float, default=0.3,
+                        help="Share of assigned tickets with an internal note")
+    parser.add_argument("--tags", type=int, default=15, help="Tags per workspace")
+    parser.add_argument("--tags-per-ticket", type=int, default=2, help="Maximum tags on a ticket")
+    parser.add_argument("--sla-breached", type=float, default=0.1,
+                        help="Share of tickets with a breached SLA")
+    parser.add_argument("--sla-met", type=float, default=0.6,
+                        help="Share of open tickets with a met first response")
+    parser.add_argument("--days", type=int, default=365,
+                        help="Spread ticket creation over this many days")
+    parser.add_argument("--batch-size", type=int, default=10000,
+                        help="Tickets per COPY round and commit")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Random seed, for reproducible datasets")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    password_hash = get_password_hash(args.password)
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        # Number new workspaces after the ones a previous run created
+        offset = db.execute(
+            text("SELECT count(*) FROM users WHERE role = 'ADMIN' AND email LIKE :pattern"),
+            {"pattern": f"admin@ws%.{EMAIL_DOMAIN}"},
+        ).scalar()
+        copier = Copier(db)
+        workspace_ids = []
+        set_search_triggers(db, enabled=False)
+        try:
+            for workspace_no in range(offset + 1, offset + args.workspaces + 1):
+                workspace_ids.append(
+                    generate_workspace(db, copier, rng, workspace_no, args, password_hash)
+                )
+                so_far = time.perf_counter() - started
+                print(f"workspace {workspace_no}: {args.tickets} tickets ({so_far:.0f}s)")
+        finally:
+            db.rollback()
+            set_search_triggers(db, enabled=True)
+
+        for workspace_id in workspace_ids:
+            rebuild_search_vectors(db, workspace_id)
+            backfill(db, workspace_id)
+        for table in copier.rows:
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    total = sum(copier.rows.values())
+    for table, rows in copier.rows.items():
+        print(f"{table}: {rows} rows")
+    print(f"{total} rows in {elapsed:.0f}s ({total / max(elapsed, 1e-9):.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Import tickets exported from another helpdesk into a workspace, from an
+NDJSON or CSV file (one ticket per line/row, see TicketImportRecord):
+
+    python -m app.scripts.import_tickets export.ndjson --admin-email admin@acme.com
+    python -m app.scripts.import_tickets export.csv --admin-email admin@acme.com \
+        --batch-size 5000
+
+Same importer as POST /api/v1/tickets/import: streamed batch by batch, and
+idempotent on external_id, so an interrupted run is resumed by re-running it.
+The importing admin's workspace receives the tickets and is the requester
+of records without requester_email.
+
+--defer-search switches the full-text triggers off for the run (every
+imported message would otherwise rewrite its ticket's search vector) and
+rebuilds the workspace's vectors in one pass at the end. It takes a table
+lock, so use it for migrations into an idle instance only.
+"""
+import argparse
+import sys
+
+from sqlalchemy import select
+
+from app.core.security import Role
+from app.db.base import Base  # noqa: F401  # registers every mapper
+from app.db.session import SessionLocal
+from app.modules.tickets.importer import IMPORT_BATCH_SIZE, format_for, import_file
+from app.modules.users.models import User
+from app.scripts.generate_data import rebuild_search_vectors, set_search_triggers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("path", help="NDJSON (.ndjson/.jsonl) or CSV (.csv) file")
+    parser.add_argument("--admin-email", required=True, help="Admin of the target workspace")
+    parser.add_argument(
+        "--format", choices=["ndjson", "csv"], default=None, help="Default: from the file extension"
+    )
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument(
+        "--defer-search", action="store_true", help="Rebuild search vectors once at the end"
+    )
+    args = parser.parse_args()
+
+    fmt = args.format or format_for(None, args.path)
+    if fmt is None:
+        sys.exit(f"cannot tell the format of {args.path}; pass --format")
+
+    db = SessionLocal()
+    try:
+        admin = db.execute(select(User).where(User.email == args.admin_email)).scalar_one_or_none()
+        if admin is None or admin.role != Role.ADMIN:
+            sys.exit(f"{args.admin_email} is not an admin")
+
+        if args.defer_search:
+            set_search_triggers(db, enabled=False)
+        try:
+            with open(args.path, "rb") as file:
+                result = import_file(db, file, fmt, admin.workspace_id, admin, args.batch_size)
+        finally:
+            db.rollback()
+            if args.defer_search:
+                set_search_triggers(db, enabled=True)
+        if args.defer_search:
+            rebuild_search_vectors(db, admin.workspace_id)
+    finally:
+        db.close()
+
+    for error in result.errors:
+        print(f"line {error.line} ({error.external_id}): {error.error}")
+    print(
+        f"created {result.created}, skipped {result.skipped}, "
+        f"failed {result.failed}, messages {result.messages}"
+    )
+    print(f"{result.seconds:.1f}s ({result.rows_per_second:.0f} tickets/s)")
+
+
+if __name__ == "__main__":
+    main()
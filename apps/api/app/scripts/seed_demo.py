@@ -221,6 +221,10 @@ def seed_demo():
         create_ticket_scenario("Password reset needed", TicketStatus.CLOSED, TicketPriority.HIGH, customers[1], assignee=agent2, created_delta_mins=2880, tags=["Security", "Access"])
 
         db.commit()
+
+        # Tickets above bypass TicketService, so rebuild the report counters
+        from app.scripts.backfill_daily_stats import backfill
+        backfill(db, ws.id)
         print("Seeding Complete!")
         
     finally:
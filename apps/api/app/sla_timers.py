@@ -0,0 +1,152 @@
+"""
+SLA timer consumer: escalates tickets as their deadlines fall due, from
+the sorted set SLAService.apply_sla and the ticket importer fill
+(app.modules.sla.timers).
+
+    python -m app.sla_timers             # run the consumer
+    python -m app.sla_timers --rebuild   # first (re)create timers for every pending SLA
+
+SLAs that existed before SLA_TIMERS_ENABLED was switched on (or whose
+timers were lost with Redis data) have no timer until --rebuild runs; the
+compose service passes it on every start (it is skipped while timers are
+disabled). Rebuilding is idempotent: a timer that already exists is
+rewritten with the same due time.
+
+Any number of consumers can run; each timer is claimed by exactly one.
+The periodic sla_escalation sweep stays on as a backstop, and can run far
+less often once timers are enabled.
+"""
+import argparse
+import logging
+import signal
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from app.db.session import SessionLocal
+from app.modules.sla.escalation import (
+    MAX_ESCALATION_LEVEL,
+    SLAEscalationEngine,
+    sla_escalation_engine,
+)
+from app.modules.sla.timers import ESCALATION, SLATimerQueue, Timer, sla_timers
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class SLATimerConsumer:
+    def __init__(
+        self,
+        timers: SLATimerQueue,
+        engine: SLAEscalationEngine,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 500,
+        escalation_interval_seconds: float = 300,
+    ):
+        self.timers = timers
+        self.engine = engine
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.escalation_interval_seconds = escalation_interval_seconds
+
+    def process(self, now: datetime) -> dict[str, int] | None:
+        """Escalate the tickets of one batch of due timers. None when nothing was due."""
+        due = self.timers.pop_due(now, self.batch_size)
+        if not due:
+            return None
+        ticket_ids = sorted({t.ticket_id for t in due})
+
+        db = self.session_factory()
+        try:
+            stats, escalated = self.engine.run_scoped(db, now, ticket_ids=ticket_ids)
+        except Exception:
+            # Claimed but not handled: put them back for the next pass
+            self.timers.requeue(due)
+            raise
+        finally:
+            db.close()
+
+        # Breached tickets below the top level get bumped again one sweep
+        # interval later, the cadence the sweep would give them
+        next_at = now + timedelta(seconds=self.escalation_interval_seconds)
+        self.timers.schedule([
+            Timer(row["ticket_id"], ESCALATION, next_at)
+            for row in escalated
+            if row["level"] < MAX_ESCALATION_LEVEL
+        ])
+        logger.info("sla timers: %d due, %d tickets, %s", len(due), len(ticket_ids), stats)
+        return {"timers": len(due), **stats}
+
+    def sleep_seconds(self, now: datetime, max_sleep: float) -> float:
+        # Bounded: timers added meanwhile may be due sooner than the current head
+        next_due = self.timers.next_due()
+        if next_due is None:
+            return max_sleep
+        return min(max_sleep, max((next_due - now).total_seconds(), 0))
+
+
+def run_consumer() -> None:
+    configure_logging()
+    consumer = SLATimerConsumer(
+        sla_timers,
+        sla_escalation_engine,
+        batch_size=settings.sla_timer_batch_size,
+        escalation_interval_seconds=settings.sla_escalation_interval_seconds,
+    )
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info("SLA timer consumer started")
+    max_sleep = settings.sla_timer_max_sleep_seconds
+    while not stopping:
+        now = datetime.now(timezone.utc)
+        try:
+            if consumer.process(now) is not None:
+                # More may already be due
+                continue
+            delay = consumer.sleep_seconds(now, max_sleep)
+        except redis.RedisError:
+            logger.exception("sla timers: redis unavailable")
+            delay = max_sleep
+        except Exception:
+            logger.exception("sla timers: escalation failed")
+            delay = max_sleep
+        time.sleep(delay)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Schedule timers for every pending SLA, then consume"
+    )
+    args = parser.parse_args()
+
+    if args.rebuild and not sla_timers.enabled:
+        # Request paths don't cancel timers while disabled; don't fill the set
+        logger.warning("SLA_TIMERS_ENABLED is off; --rebuild skipped")
+    elif args.rebuild:
+        db = SessionLocal()
+        try:
+            print(f"scheduled {sla_timers.rebuild(db)} timers")
+        finally:
+            db.close()
+    run_consumer()
+
+
+if __name__ == "__main__":
+    main()
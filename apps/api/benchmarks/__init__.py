@@ -0,0 +1 @@
+# Benchmarks run against the database configured in DATABASE_URL.
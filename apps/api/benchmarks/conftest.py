@@ -0,0 +1,64 @@
+"""
+Fixtures for the pytest-benchmark suite (benchmarks/test_*.py).
+
+Runs against the DATABASE_URL Postgres like the scripts next to it, in a
+throwaway workspace that is dropped afterwards; BENCH_TICKETS sets its size.
+"""
+import os
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.modules.users.models import User
+from app.scripts.backfill_daily_stats import backfill
+from tests.seed import create_tags, create_tickets, create_workspace, drop_workspace
+
+BENCH_TICKETS = int(os.getenv("BENCH_TICKETS", "50000"))
+
+
+@pytest.fixture(scope="session")
+def workspace() -> Iterator[dict]:
+    db = SessionLocal()
+    ws = create_workspace(db, "bench-pytest", agents=20, customers=200)
+    try:
+        create_tickets(db, ws, BENCH_TICKETS)
+        ws["tags"] = create_tags(db, ws, ["billing", "hardware", "vip"])
+        backfill(db, ws["workspace_id"])
+        for table in ("tickets", "ticket_tags", "workspace_daily_stats", "agent_daily_stats"):
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+        yield ws
+    finally:
+        db.rollback()
+        drop_workspace(db, ws["workspace_id"])
+        db.close()
+
+
+@pytest.fixture
+def scratch_workspaces() -> Iterator[list]:
+    """Workspace ids a benchmark created per round; dropped at teardown."""
+    ids: list = []
+    yield ids
+    db = SessionLocal()
+    try:
+        for workspace_id in ids:
+            drop_workspace(db, workspace_id)
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def agent(db, workspace) -> User:
+    return db.get(User, workspace["agent_ids"][0])
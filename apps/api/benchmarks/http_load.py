@@ -0,0 +1,138 @@
+"""
+Sync vs async API throughput under concurrency.
+
+Seeds a workspace, starts the API twice under uvicorn (once with the sync
+handlers, once with DB_ASYNC_ENABLED=1), then drives the hot endpoints with
+N concurrent clients and reports throughput and latency percentiles for
+each. Sync handlers are bounded by the threadpool (~40 in flight); the
+async ones by the connection pool.
+
+    python -m benchmarks.http_load --concurrency 50,200,500 --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from sqlalchemy import text
+
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from tests.seed import create_tickets, create_workspace, drop_workspace
+
+ENDPOINTS = {
+    "list": "/api/v1/tickets?size=20",
+    "detail": "/api/v1/tickets/{ticket_id}",
+    "me": "/api/v1/auth/me",
+}
+
+
+def start_server(port: int, async_enabled: bool, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, DB_ASYNC_ENABLED="1" if async_enabled else "0")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return proc
+        except httpx.TransportError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"uvicorn on :{port} did not come up")
+
+
+async def drive(base_url: str, path: str, token: str, total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60,
+                                 headers={"Authorization": f"Bearer {token}"}) as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                resp = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                if resp.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--tickets", type=int, default=10_000)
+    parser.add_argument("--concurrency", default="50,200,500", help="Comma separated client counts")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per endpoint and run")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="uvicorn worker processes per server"
+    )
+    parser.add_argument("--keep", action="store_true", help="Do not drop the seeded workspace")
+    args = parser.parse_args()
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    db = SessionLocal()
+    ws = create_workspace(db, "bench-http", agents=5, customers=100)
+    servers = {}
+    try:
+        create_tickets(db, ws, args.tickets)
+        ticket_id = db.execute(
+            text("SELECT id FROM tickets WHERE workspace_id = :ws LIMIT 1"),
+            {"ws": ws["workspace_id"]},
+        ).scalar()
+        token = create_access_token(ws["agent_ids"][0])
+
+        servers = {
+            "sync": start_server(8101, False, args.workers),
+            "async": start_server(8102, True, args.workers),
+        }
+        ports = {"sync": 8101, "async": 8102}
+
+        print(f"{'endpoint':<8} {'clients':>7} {'mode':<6} {'req/s':>9} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+        for name, template in ENDPOINTS.items():
+            path = template.format(ticket_id=ticket_id)
+            for concurrency in levels:
+                for mode in ("sync", "async"):
+                    base_url = f"http://127.0.0.1:{ports[mode]}"
+                    r = asyncio.run(drive(base_url, path, token, args.requests, concurrency))
+                    print(f"{name:<8} {concurrency:>7} {mode:<6} {r['rps']:>9.0f} {r['p50']:>8.1f} "
+                          f"{r['p95']:>8.1f} {r['p99']:>8.1f} {r['errors']:>6}")
+    finally:
+        for proc in servers.values():
+            proc.terminate()
+            proc.wait()
+        if not args.keep:
+            drop_workspace(db, ws["workspace_id"])
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Per-request cost of MetricsMiddleware.
+
+Calls a minimal FastAPI app directly through ASGI (no sockets, no DB), with
+and without the middleware, so the difference is the middleware alone:
+route template lookup, contextvar, timers and three metric updates.
+
+    python -m benchmarks.metrics_overhead --requests 20000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+
+from app.core.http_metrics import MetricsMiddleware
+
+
+def build_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/tickets/{ticket_id}")
+    async def detail(ticket_id: str):
+        return {"id": ticket_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def call(app, path: str) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1),
+        "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, requests: int, rounds: int) -> list[float]:
+    # Warm up (routing caches, first-call imports)
+    for i in range(200):
+        await call(app, f"/api/v1/tickets/{i}")
+    per_request = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for i in range(requests):
+            await call(app, f"/api/v1/tickets/{i}")
+        per_request.append((time.perf_counter() - started) / requests * 1e6)
+    return per_request
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for label, with_metrics in (("baseline", False), ("metrics", True)):
+        samples = asyncio.run(measure(build_app(with_metrics), args.requests, args.rounds))
+        results[label] = statistics.median(samples)
+        print(f"{label:<9} {results[label]:8.1f} us/request (median of {args.rounds} rounds)")
+
+    overhead = results["metrics"] - results["baseline"]
+    print(f"overhead  {overhead:8.1f} us/request ({overhead / results['baseline']:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+SLA escalation scaling benchmark.
+
+Seeds a throwaway workspace with N breached tickets, runs one escalation
+pass and reports wall time and statement count per N. The set-based engine
+should keep the statement count flat while wall time grows roughly linearly.
+
+    python -m benchmarks.sla_escalation --counts 100,1000,5000,20000 --agents 50
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+
+from app.db.session import SessionLocal, engine
+from app.modules.sla.escalation import sla_escalation_engine
+from tests.seed import StatementCounter, create_breached_tickets, create_workspace, drop_workspace
+
+
+def run_once(breached: int, agents: int) -> dict:
+    db = SessionLocal()
+    ws = create_workspace(db, f"bench-escalation-{breached}", agents=agents, customers=10)
+    try:
+        create_breached_tickets(db, ws, breached)
+        with StatementCounter(engine) as counter:
+            started = time.perf_counter()
+            stats = sla_escalation_engine.run(db, datetime.now(timezone.utc))
+            elapsed = time.perf_counter() - started
+        return {"breached": breached, "seconds": elapsed, "statements": counter.count, **stats}
+    finally:
+        drop_workspace(db, ws["workspace_id"])
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--counts", default="100,1000,5000",
+                        help="Comma separated breached-ticket counts")
+    parser.add_argument("--agents", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'breached':>10} {'seconds':>10} {'ms/ticket':>10} {'statements':>11} "
+          f"{'escalated':>10} {'reassigned':>11}")
+    for count in (int(c) for c in args.counts.split(",")):
+        r = run_once(count, args.agents)
+        per_ticket = r["seconds"] * 1000 / max(r["breached"], 1)
+        print(
+            f"{r['breached']:>10} {r['seconds']:>10.3f} {per_ticket:>10.3f} "
+            f"{r['statements']:>11} {r['escalated']:>10} {r['reassigned']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
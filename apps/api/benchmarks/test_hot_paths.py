@@ -0,0 +1,113 @@
+"""
+Micro-benchmarks for the service and repo hot paths (pytest-benchmark).
+
+    pytest benchmarks --benchmark-only                      # just run
+    make bench                                              # compare with the stored baseline
+    make bench-baseline                                     # record a new baseline
+
+Baselines live in benchmarks/baselines/ and are committed, so a PR that
+changes a hot path shows the before/after in review.
+"""
+import itertools
+from datetime import timedelta
+
+import pytest
+from fastapi import Request, Response
+from sqlalchemy import select
+
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.jobs import sla_escalation_job
+from app.modules.auth.cache import principal_cache
+from app.modules.auth.deps import get_current_user
+from app.modules.reports.router import get_weekly_report
+from app.modules.tickets.models import OPEN_STATUSES, Ticket
+from app.modules.tickets.repo import ticket_repo
+from app.modules.tickets.schemas import MessageCreate, TicketFilter
+from app.modules.tickets.service import ticket_service
+from tests.seed import create_breached_tickets, create_workspace
+
+LIST_FILTERS = {
+    "default": {},
+    "open": {"status": "NEW,OPEN,PENDING"},
+    "status-priority": {"status": "OPEN", "priority": "HIGH,URGENT"},
+    "updated-asc": {"sort": "updated_at", "order": "asc"},
+    "unassigned": {"assigned_to": "unassigned"},
+    "tag": {"tag": "vip"},
+    "search": {"q": "bench ticket"},
+    "exact-count": {"count": "exact"},
+    "estimated-count": {"count": "estimated"},
+    "deep-offset": {"page": 200},
+}
+
+BREACH_COUNTS = [100, 1000, 5000]
+
+
+@pytest.mark.parametrize("params", LIST_FILTERS.values(), ids=LIST_FILTERS.keys())
+def test_list_tickets(benchmark, db, workspace, params):
+    filters = TicketFilter(size=20, **params)
+    items, _, _ = benchmark(ticket_repo.list_tickets, db, workspace["workspace_id"], filters)
+    assert items
+
+
+def test_list_tickets_cursor_page(benchmark, db, workspace):
+    # Page 200 by cursor, the keyset counterpart of deep-offset
+    ws_id = workspace["workspace_id"]
+    cursor = None
+    for _ in range(199):
+        _, _, cursor = ticket_repo.list_tickets(db, ws_id, TicketFilter(size=20, cursor=cursor))
+    items, _, _ = benchmark(
+        ticket_repo.list_tickets, db, ws_id, TicketFilter(size=20, cursor=cursor)
+    )
+    assert items
+
+
+def test_add_message(benchmark, db, workspace, agent):
+    ticket_ids = db.execute(
+        select(Ticket.id)
+        .where(Ticket.workspace_id == workspace["workspace_id"], Ticket.status.in_(OPEN_STATUSES))
+        .limit(500)
+    ).scalars().all()
+    tickets = itertools.cycle(ticket_ids)
+    message = MessageCreate(body="Benchmark reply")
+    benchmark(lambda: ticket_service.add_message(db, next(tickets), message, agent))
+
+
+@pytest.mark.parametrize("breached", BREACH_COUNTS)
+def test_sla_escalation_job(benchmark, scratch_workspaces, breached):
+    # Every round needs fresh breaches: seed a workspace per round (untimed)
+    def setup():
+        db = SessionLocal()
+        try:
+            ws = create_workspace(db, f"bench-escalation-{breached}", agents=20, customers=10)
+            create_breached_tickets(db, ws, breached)
+        finally:
+            db.close()
+        scratch_workspaces.append(ws["workspace_id"])
+        return (), {"workspace_id": ws["workspace_id"]}
+
+    stats = benchmark.pedantic(sla_escalation_job, setup=setup, rounds=3)
+    assert stats["escalated"] == breached
+
+
+def test_get_weekly_report(benchmark, db, agent):
+    # No If-None-Match: every round sums the counters
+    request = Request({"type": "http", "method": "GET", "headers": []})
+    response = benchmark(
+        lambda: get_weekly_report(request=request, response=Response(), user=agent, db=db)
+    )
+    assert response.data["tickets_created"] > 0
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["cache-hit", "cache-miss"])
+def test_get_current_user(benchmark, db, workspace, cached):
+    user_id = workspace["agent_ids"][0]
+    token = create_access_token(user_id, expires_delta=timedelta(hours=1))
+
+    def call():
+        if not cached:
+            principal_cache.invalidate(user_id)
+            db.expunge_all()
+        return get_current_user(token, db)
+
+    assert benchmark(call).id == user_id
@@ -0,0 +1,68 @@
+"""
+Import throughput (app.modules.tickets.importer), in tickets per second.
+
+    pytest benchmarks/test_import.py --benchmark-only
+
+Each round imports into a fresh workspace, since re-importing the same
+external_ids is a no-op; rows/s of the last round are in extra_info.
+"""
+import io
+import json
+
+import pytest
+
+from app.db.session import SessionLocal
+from app.modules.tickets.importer import import_file
+from app.modules.users.models import User
+from tests.seed import create_workspace
+
+IMPORT_SIZES = [1000, 10000]
+MESSAGES_PER_TICKET = 3
+
+
+def export(size: int, agent_email: str) -> bytes:
+    lines = []
+    for i in range(size):
+        lines.append(json.dumps({
+            "external_id": f"bench-{i}",
+            "subject": f"Imported ticket {i}",
+            "description": "Exported from the old helpdesk",
+            "status": ["OPEN", "PENDING", "CLOSED"][i % 3],
+            "assignee_email": agent_email,
+            "tags": ["imported", f"batch-{i % 10}"],
+            "sla_policy": "Bench",
+            "created_at": f"2026-01-{i % 28 + 1:02d}T09:00:00Z",
+            "messages": [
+                {
+                    "body": f"Message {m} of ticket {i}",
+                    "author_email": agent_email if m % 2 else None,
+                }
+                for m in range(MESSAGES_PER_TICKET)
+            ],
+        }))
+    return "\n".join(lines).encode()
+
+
+@pytest.mark.parametrize("size", IMPORT_SIZES)
+def test_import_ndjson(benchmark, scratch_workspaces, size):
+    def setup():
+        db = SessionLocal()
+        try:
+            ws = create_workspace(db, f"bench-import-{size}", agents=5)
+            agent = db.get(User, ws["agent_ids"][0])
+            body = export(size, agent.email)
+        finally:
+            db.close()
+        scratch_workspaces.append(ws["workspace_id"])
+        return (ws["workspace_id"], agent.id, body), {}
+
+    def run(workspace_id, agent_id, body):
+        db = SessionLocal()
+        try:
+            return import_file(db, io.BytesIO(body), "ndjson", workspace_id, db.get(User, agent_id))
+        finally:
+            db.close()
+
+    result = benchmark.pedantic(run, setup=setup, rounds=3)
+    assert result.created == size and result.messages == size * MESSAGES_PER_TICKET
+    benchmark.extra_info["rows_per_second"] = result.rows_per_second
@@ -0,0 +1,95 @@
+"""
+Ticket list pagination benchmark.
+
+Seeds one workspace (1M tickets by default), then times OFFSET pages against
+keyset (cursor) pages at increasing depth for every sort option, and the
+exact COUNT(*) against the planner estimate.
+
+    python -m benchmarks.ticket_pagination --tickets 1000000 --depths 1,100,1000,10000
+"""
+import argparse
+import time
+
+from sqlalchemy import text
+
+from app.db.session import SessionLocal
+from app.modules.tickets.repo import ticket_repo
+from app.modules.tickets.schemas import TicketFilter
+from tests.seed import create_tickets, create_workspace, drop_workspace
+
+SORTS = ["created_at", "updated_at", "priority", "status"]
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def cursor_at_depth(db, workspace_id, sort: str, depth: int, size: int) -> str | None:
+    # Walk with the cursor itself; this is what a client paging forward does.
+    cursor = None
+    for _ in range(depth - 1):
+        filters = TicketFilter(sort=sort, size=size, cursor=cursor)
+        _, _, cursor = ticket_repo.list_tickets(db, workspace_id, filters)
+        if cursor is None:
+            break
+    return cursor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--depths", default="1,100,1000,10000", help="Comma separated page numbers")
+    parser.add_argument("--size", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="Do not drop the seeded workspace")
+    args = parser.parse_args()
+    depths = [int(d) for d in args.depths.split(",")]
+
+    db = SessionLocal()
+    ws = create_workspace(db, "bench-pagination", agents=50, customers=1000)
+    workspace_id = ws["workspace_id"]
+    try:
+        started = time.perf_counter()
+        create_tickets(db, ws, args.tickets)
+        db.execute(text("ANALYZE tickets"))
+        db.commit()
+        print(f"seeded {args.tickets} tickets in {time.perf_counter() - started:.1f}s\n")
+
+        print(f"{'sort':>10} {'page':>7} {'offset ms':>10} {'cursor ms':>10}")
+        for sort in SORTS:
+            for depth in depths:
+                if depth * args.size > args.tickets:
+                    continue
+                offset_ms = timed(lambda: ticket_repo.list_tickets(
+                    db, workspace_id, TicketFilter(sort=sort, size=args.size, page=depth)
+                ))
+                cursor = cursor_at_depth(db, workspace_id, sort, depth, args.size)
+                cursor_ms = timed(lambda: ticket_repo.list_tickets(
+                    db, workspace_id, TicketFilter(sort=sort, size=args.size, cursor=cursor)
+                ))
+                print(f"{sort:>10} {depth:>7} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+
+        print(f"\n{'count':>10} {'ms':>10} {'total':>10}")
+        for mode in ("exact", "estimated"):
+            result = {}
+
+            def run():
+                filters = TicketFilter(size=args.size, count=mode, status="OPEN,PENDING")
+                _, result["total"], _ = ticket_repo.list_tickets(db, workspace_id, filters)
+
+            ms = timed(run)
+            print(f"{mode:>10} {ms:>10.2f} {result['total']:>10}")
+    finally:
+        if not args.keep:
+            drop_workspace(db, workspace_id)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Ticket search benchmark.
+
+Seeds a corpus of tickets and messages built from a synthetic vocabulary,
+then compares the old ILIKE '%q%' scan with the full-text index for a set
+of rare, common and multi-word queries.
+
+    python -m benchmarks.ticket_search --tickets 200000 --messages-per-ticket 3
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, or_, select, text
+
+from app.db.session import SessionLocal
+from app.modules.tickets.models import Ticket, TicketMessage
+from app.modules.tickets.repo import ticket_repo
+from app.modules.tickets.schemas import TicketFilter
+from tests.seed import create_workspace, drop_workspace
+
+VOCABULARY_SIZE = 20_000
+QUERIES = ["printer", "vpn timeout", "w17342", "invoice refund w88", "outlook sync error"]
+COMMON_WORDS = [
+    "printer", "vpn", "timeout", "invoice", "refund",
+    "outlook", "sync", "error", "password", "laptop",
+]
+
+
+def vocabulary() -> list[str]:
+    rng = random.Random(42)
+    words = [f"w{i}" for i in range(VOCABULARY_SIZE)]
+    rng.shuffle(words)
+    return COMMON_WORDS * 200 + words
+
+
+def sentence(rng: random.Random, words: list[str], n: int) -> str:
+    return " ".join(rng.choice(words) for _ in range(n))
+
+
+def seed_corpus(
+    db, ws: dict, tickets: int, messages_per_ticket: int, batch_size: int = 2000
+) -> None:
+    rng = random.Random(7)
+    words = vocabulary()
+    now = datetime.now(timezone.utc)
+    for start in range(0, tickets, batch_size):
+        n = min(batch_size, tickets - start)
+        ticket_rows = [
+            {
+                "id": uuid.uuid4(),
+                "workspace_id": ws["workspace_id"],
+                "created_by_user_id": rng.choice(ws["customer_ids"]),
+                "subject": sentence(rng, words, 6),
+                "description": sentence(rng, words, 40),
+                "created_at": now - timedelta(minutes=start + i),
+                "updated_at": now - timedelta(minutes=start + i),
+            }
+            for i in range(n)
+        ]
+        db.execute(insert(Ticket), ticket_rows)
+        message_rows = [
+            {
+                "ticket_id": row["id"],
+                "workspace_id": ws["workspace_id"],
+                "author_user_id": rng.choice(ws["agent_ids"]),
+                "body": sentence(rng, words, 25),
+            }
+            for row in ticket_rows
+            for _ in range(messages_per_ticket)
+        ]
+        if message_rows:
+            db.execute(insert(TicketMessage), message_rows)
+        db.commit()
+
+
+def ilike_search(db, workspace_id, q: str, size: int = 20):
+    # The pre-index implementation, kept here as the baseline
+    pattern = f"%{q}%"
+    stmt = (
+        select(Ticket.id)
+        .where(
+            Ticket.workspace_id == workspace_id,
+            or_(Ticket.subject.ilike(pattern), Ticket.description.ilike(pattern)),
+        )
+        .order_by(Ticket.created_at.desc())
+        .limit(size)
+    )
+    total = db.execute(select(func.count()).select_from(stmt.limit(None).subquery())).scalar()
+    return db.execute(stmt).all(), total
+
+
+def timed(fn, repeat: int = 3) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--tickets", type=int, default=200_000)
+    parser.add_argument("--messages-per-ticket", type=int, default=3)
+    parser.add_argument("--keep", action="store_true", help="Do not drop the seeded workspace")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    ws = create_workspace(db, "bench-search", agents=20, customers=500)
+    workspace_id = ws["workspace_id"]
+    try:
+        started = time.perf_counter()
+        seed_corpus(db, ws, args.tickets, args.messages_per_ticket)
+        db.execute(text("ANALYZE tickets"))
+        db.commit()
+        print(f"seeded {args.tickets} tickets in {time.perf_counter() - started:.1f}s\n")
+
+        print(f"{'query':>22} {'ilike ms':>10} {'hits':>8} "
+              f"{'fts ms':>10} {'hits':>8} {'ranked ms':>10}")
+        for q in QUERIES:
+            ilike_ms, (_, ilike_hits) = timed(lambda: ilike_search(db, workspace_id, q))
+            fts_ms, (_, fts_hits, _) = timed(lambda: ticket_repo.list_tickets(
+                db, workspace_id, TicketFilter(q=q, count="exact")
+            ))
+            ranked_ms, _ = timed(lambda: ticket_repo.list_tickets(
+                db, workspace_id, TicketFilter(q=q, sort="relevance")
+            ))
+            print(f"{q:>22} {ilike_ms:>10.2f} {ilike_hits:>8} "
+                  f"{fts_ms:>10.2f} {fts_hits:>8} {ranked_ms:>10.2f}")
+    finally:
+        if not args.keep:
+            drop_workspace(db, workspace_id)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Load test for the agent-facing hot paths, against a dataset built by
+app.scripts.generate_data (same workspace numbering, emails and password).
+
+    locust -f loadtests/locustfile.py --headless -u 200 -r 20 -t 5m \\
+        --host http://localhost:18000 --csv loadtests/results/run
+    python -m loadtests.report loadtests/results/run_stats.csv
+
+LOADTEST_WORKSPACES / LOADTEST_AGENTS must not exceed what was generated;
+LOADTEST_PASSWORD matches generate_data --password.
+"""
+import os
+import random
+
+from locust import HttpUser, between, task
+
+from app.scripts.generate_data import EMAIL_DOMAIN, PROBLEMS, PRODUCTS
+
+API = "/api/v1"
+WORKSPACES = int(os.getenv("LOADTEST_WORKSPACES", "5"))
+AGENTS = int(os.getenv("LOADTEST_AGENTS", "20"))
+PASSWORD = os.getenv("LOADTEST_PASSWORD", "password123")
+
+LIST_FILTERS = [
+    {},
+    {"status": "NEW,OPEN,PENDING"},
+    {"status": "OPEN", "priority": "HIGH,URGENT"},
+    {"sort": "updated_at"},
+    {"assigned_to": "unassigned"},
+]
+
+
+class Agent(HttpUser):
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        workspace_no = random.randint(1, WORKSPACES)
+        self.email = f"agent{random.randrange(AGENTS)}@ws{workspace_no}.{EMAIL_DOMAIN}"
+        credentials = {"email": self.email, "password": PASSWORD}
+        resp = self.client.post(f"{API}/auth/login", json=credentials)
+        resp.raise_for_status()
+        self.client.headers["Authorization"] = f"Bearer {resp.json()['data']['access_token']}"
+        self.ticket_ids: list[str] = []
+        self.next_page_params: dict | None = None
+
+    def remember(self, resp, params: dict) -> None:
+        if resp.status_code != 200:
+            return
+        body = resp.json()
+        self.ticket_ids = [t["id"] for t in body["data"]] or self.ticket_ids
+        cursor = (body.get("meta") or {}).get("next_cursor")
+        # The cursor is only valid with the filters and sort that produced it
+        self.next_page_params = {**params, "cursor": cursor} if cursor else None
+
+    @task(10)
+    def list_tickets(self):
+        params = {"size": 20, **random.choice(LIST_FILTERS)}
+        self.remember(self.client.get(f"{API}/tickets", params=params, name="GET /tickets"), params)
+
+    @task(3)
+    def next_page(self):
+        if not self.next_page_params:
+            return self.list_tickets()
+        params = self.next_page_params
+        resp = self.client.get(f"{API}/tickets", params=params, name="GET /tickets?cursor")
+        self.remember(resp, params)
+
+    @task(5)
+    def search(self):
+        q = random.choice(PRODUCTS)
+        if random.random() >= 0.5:
+            q += " " + random.choice(PROBLEMS).split()[0]
+        params = {"q": q, "size": 20}
+        resp = self.client.get(f"{API}/tickets", params=params, name="GET /tickets?q")
+        self.remember(resp, params)
+
+    @task(8)
+    def detail(self):
+        if not self.ticket_ids:
+            return self.list_tickets()
+        ticket_id = random.choice(self.ticket_ids)
+        self.client.get(f"{API}/tickets/{ticket_id}", name="GET /tickets/{ticket_id}")
+
+    @task(3)
+    def post_message(self):
+        if not self.ticket_ids:
+            return self.list_tickets()
+        ticket_id = random.choice(self.ticket_ids)
+        self.client.post(
+            f"{API}/tickets/{ticket_id}/messages",
+            json={"body": "Load test reply, please ignore"},
+            name="POST /tickets/{ticket_id}/messages",
+        )
+
+    @task(1)
+    def weekly_report(self):
+        self.client.get(f"{API}/reports/weekly", name="GET /reports/weekly")
@@ -0,0 +1,29 @@
+"""
+p50/p95/p99 per endpoint from a locust --csv run (the <prefix>_stats.csv file).
+
+    python -m loadtests.report loadtests/results/run_stats.csv
+"""
+import argparse
+import csv
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("stats_csv")
+    args = parser.parse_args()
+
+    with open(args.stats_csv, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    print(f"{'endpoint':<40} {'requests':>9} {'fail':>6} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for row in rows:
+        name = row["Name"] if row["Type"] else "total"
+        print(f"{name:<40} {int(row['Request Count']):>9} {int(row['Failure Count']):>6} "
+              f"{float(row['Requests/s']):>8.1f} {row['50%']:>8} {row['95%']:>8} {row['99%']:>8}")
+
+
+if __name__ == "__main__":
+    main()
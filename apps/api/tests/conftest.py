@@ -12,11 +12,16 @@ from app.main import app
 from app.db.base import Base
 from app.core.config import get_settings
 from app.db.session import get_db
+from app.db.profiling import install_query_profiler
 
 settings = get_settings()
 # Use the same DB URL from settings (Docker PG)
 engine = create_engine(settings.database_url)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Requests use this engine through the get_db override: profile it like the
+# app's, and fail any request over its endpoint's @query_budget
+install_query_profiler(engine)
+settings.db_query_budget_mode = "raise"
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -144,3 +149,72 @@ def customer_auth_headers(client, db, admin_auth_headers):
     })
     token = resp.json()["data"]["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def query_log(db):
+    """Statements sent to the database while the returned recorder is active."""
+    from contextlib import contextmanager
+
+    from sqlalchemy import event
+
+    @contextmanager
+    def record():
+        statements = []
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        try:
+            yield statements
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    return record
+
+
+class NullStream:
+    """Takes what OutboxRelay appends to the Redis stream."""
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def xadd(self, name, fields, maxlen=None, approximate=True):
+        pass
+
+    def execute(self):
+        return []
+
+
+@pytest.fixture
+def relay_outbox(db):
+    """
+    Drains the outbox like the outbox-relay service, which writes the report
+    counters and audit entries the events carry. Returns how many it relayed.
+    """
+    from app.modules.outbox.relay import OutboxRelay
+
+    relay = OutboxRelay(session_factory=TestingSessionLocal, client=NullStream(), handlers=[])
+
+    def drain() -> int:
+        relayed = 0
+        while batch := relay.process():
+            relayed += batch
+        return relayed
+
+    return drain
+
+
+@pytest.fixture
+def async_client(client, monkeypatch) -> Generator[TestClient, None, None]:
+    # Separate app with the async routers mounted; it talks to the database
+    # through its own async engine, so only committed data is visible.
+    from app.db.session import get_async_engine, get_async_sessionmaker
+    from app.main import create_app
+
+    monkeypatch.setattr(settings, "db_async_enabled", True)
+    with TestClient(create_app()) as c:
+        yield c
+    # Pooled connections belong to the client's event loop
+    get_async_sessionmaker.cache_clear()
+    get_async_engine.cache_clear()
@@ -0,0 +1,180 @@
+"""Bulk seeding helpers shared by benchmarks/ and the index tests (tests/test_indexes.py)."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, event, insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.security import Role
+from app.modules.audit.models import AuditLog
+from app.modules.reports.models import WeeklyReportSnapshot
+from app.modules.sla.models import SLAPolicy, TicketSLA
+from app.modules.tags.models import Tag
+from app.modules.tickets.models import (
+    Assignment,
+    InternalNote,
+    Ticket,
+    TicketMessage,
+    TicketPriority,
+    TicketStatus,
+    TicketTag,
+)
+from app.modules.users.models import User
+from app.modules.workspaces.models import Workspace
+
+# Benchmarks never log in, so every seeded user shares one throwaway hash.
+PASSWORD_HASH = "$2b$12$benchmarkbenchmarkbenchmarkbenchmarkbenchmarkbenchmark"
+
+
+def create_workspace(db: Session, name: str, agents: int, customers: int = 1) -> dict:
+    """Bulk insert a workspace with its agents and customers."""
+    workspace_id = uuid.uuid4()
+    db.execute(insert(Workspace), [{"id": workspace_id, "name": name}])
+
+    def users(role: Role, count: int) -> list[dict]:
+        return [
+            {
+                "id": uuid.uuid4(),
+                "email": f"{role.value}-{i}-{workspace_id.hex[:8]}@bench.local",
+                "full_name": f"Bench {role.value} {i}",
+                "password_hash": PASSWORD_HASH,
+                "role": role,
+                "is_active": True,
+                "workspace_id": workspace_id,
+            }
+            for i in range(count)
+        ]
+
+    agent_rows = users(Role.AGENT, agents)
+    customer_rows = users(Role.CUSTOMER, customers)
+    db.execute(insert(User), agent_rows + customer_rows)
+
+    policy_id = uuid.uuid4()
+    db.execute(insert(SLAPolicy), [{
+        "id": policy_id,
+        "workspace_id": workspace_id,
+        "name": "Bench",
+        "first_response_time_minutes": 10,
+        "resolution_time_minutes": 60,
+        "is_active": True,
+    }])
+    db.commit()
+    return {
+        "workspace_id": workspace_id,
+        "agent_ids": [r["id"] for r in agent_rows],
+        "customer_ids": [r["id"] for r in customer_rows],
+        "policy_id": policy_id,
+    }
+
+
+def create_tickets(db: Session, ws: dict, count: int, batch_size: int = 5000) -> None:
+    """Bulk insert tickets with a spread of statuses, priorities, assignees and ages."""
+    statuses = list(TicketStatus)
+    priorities = list(TicketPriority)
+    now = datetime.now(timezone.utc)
+    for start in range(0, count, batch_size):
+        n = min(batch_size, count - start)
+        rows = []
+        for i in range(start, start + n):
+            created_at = now - timedelta(minutes=i)
+            rows.append({
+                "id": uuid.uuid4(),
+                "workspace_id": ws["workspace_id"],
+                "created_by_user_id": ws["customer_ids"][i % len(ws["customer_ids"])],
+                "subject": f"Bench ticket {i}",
+                "description": "Seeded by benchmarks",
+                "status": statuses[i % len(statuses)],
+                "priority": priorities[(i // 7) % len(priorities)],
+                "assigned_agent_id": ws["agent_ids"][i % len(ws["agent_ids"])] if i % 5 else None,
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(seconds=i % 600),
+            })
+        db.execute(insert(Ticket), rows)
+        db.commit()
+
+
+def create_breached_tickets(db: Session, ws: dict, count: int, batch_size: int = 5000) -> None:
+    """Bulk insert open tickets whose SLA deadlines are already in the past."""
+    created_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    for start in range(0, count, batch_size):
+        n = min(batch_size, count - start)
+        ticket_ids = [uuid.uuid4() for _ in range(n)]
+        db.execute(insert(Ticket), [
+            {
+                "id": ticket_id,
+                "workspace_id": ws["workspace_id"],
+                "created_by_user_id": ws["customer_ids"][i % len(ws["customer_ids"])],
+                "subject": f"Bench ticket {start + i}",
+                "description": "Seeded by benchmarks",
+                "status": TicketStatus.OPEN,
+                "assigned_agent_id": ws["agent_ids"][i % len(ws["agent_ids"])],
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+            for i, ticket_id in enumerate(ticket_ids)
+        ])
+        db.execute(insert(TicketSLA), [
+            {
+                "ticket_id": ticket_id,
+                "workspace_id": ws["workspace_id"],
+                "policy_id": ws["policy_id"],
+                "first_response_due_at": created_at + timedelta(minutes=10),
+                "resolution_due_at": created_at + timedelta(minutes=60),
+            }
+            for ticket_id in ticket_ids
+        ])
+        db.commit()
+
+
+def create_tags(
+    db: Session, ws: dict, names: list[str], share: float = 0.1
+) -> dict[str, uuid.UUID]:
+    """Bulk insert tags and attach each to roughly `share` of the workspace's tickets."""
+    tags = {name: uuid.uuid4() for name in names}
+    db.execute(insert(Tag), [
+        {"id": tag_id, "workspace_id": ws["workspace_id"], "name": name}
+        for name, tag_id in tags.items()
+    ])
+    for tag_id in tags.values():
+        db.execute(
+            text(
+                "INSERT INTO ticket_tags (ticket_id, tag_id) SELECT id, :tag FROM tickets"
+                " WHERE workspace_id = :ws AND random() < :share"
+            ),
+            {"tag": tag_id, "ws": ws["workspace_id"], "share": share},
+        )
+    db.commit()
+    return tags
+
+
+def drop_workspace(db: Session, workspace_id: uuid.UUID) -> None:
+    tag_ids = select(Tag.id).where(Tag.workspace_id == workspace_id)
+    db.execute(delete(TicketTag).where(TicketTag.tag_id.in_(tag_ids)))
+    for model in (
+        AuditLog, Assignment, TicketSLA, TicketMessage, InternalNote, Tag, WeeklyReportSnapshot,
+    ):
+        db.execute(delete(model).where(model.workspace_id == workspace_id))
+    db.execute(delete(Ticket).where(Ticket.workspace_id == workspace_id))
+    db.execute(delete(SLAPolicy).where(SLAPolicy.workspace_id == workspace_id))
+    db.execute(delete(User).where(User.workspace_id == workspace_id))
+    db.execute(delete(Workspace).where(Workspace.id == workspace_id))
+    db.commit()
+
+
+class StatementCounter:
+    """Counts statements sent to the database while active."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
@@ -67,3 +67,64 @@ def test_me_returns_user_workspace(client):
     
     assert data["workspace"]["name"] == "My Workspace"
     assert data["user"]["email"] == "me@demo.com"
+
+
+def test_principal_cache_ttl_lru_and_invalidate(monkeypatch):
+    import uuid
+
+    from app.modules.auth import cache as cache_module
+    from app.modules.auth.cache import PrincipalCache
+
+    clock = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+    cache = PrincipalCache(ttl_seconds=60, local_ttl_seconds=5, max_entries=2, use_redis=False)
+
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cache.set(a, {"id": str(a)})
+    assert cache.get(a) == {"id": str(a)}
+
+    cache.invalidate(a)
+    assert cache.get(a) is None
+
+    cache.set(a, {"id": str(a)})
+    cache.set(b, {"id": str(b)})
+    cache.set(c, {"id": str(c)})  # evicts the least recently used entry
+    assert cache.get(a) is None
+    assert cache.get(c) is not None
+
+    clock[0] += 61
+    assert cache.get(c) is None
+
+
+def test_me_served_from_principal_cache(client, admin_auth_headers, db):
+    from sqlalchemy import event
+
+    assert client.get("/api/v1/users/me", headers=admin_auth_headers).status_code == 200
+
+    statements = []
+
+    def listener(*args):
+        statements.append(args[2])
+
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        resp = client.get("/api/v1/users/me", headers=admin_auth_headers)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["email"] == "admin@test.com"
+    assert not [s for s in statements if "FROM users" in s]
+
+
+def test_deactivated_user_is_rejected_immediately(client, admin_auth_headers, agent_auth_headers):
+    me = client.get("/api/v1/auth/me", headers=agent_auth_headers)
+    assert me.status_code == 200
+    agent_id = me.json()["data"]["user"]["id"]
+
+    resp = client.patch(
+        f"/api/v1/users/{agent_id}", headers=admin_auth_headers, json={"is_active": False}
+    )
+    assert resp.status_code == 200
+
+    assert client.get("/api/v1/users/me", headers=agent_auth_headers).status_code == 403
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.db.pool import TimedQueuePool, install_idle_ping, pool_status
+
+
+def test_pool_status_tracks_checkouts_and_timeouts():
+    engine = create_engine(
+        "sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01
+    )
+
+    conn = engine.connect()
+    status = pool_status(engine)
+    assert status["checked_out"] == 1
+    assert status["checkouts"] == 1
+    assert status["max_connections"] == 1
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    assert pool_status(engine)["timeouts"] == 1
+
+    conn.close()
+    assert pool_status(engine)["checked_out"] == 0
+
+    # dispose() recreates the pool; counters carry over
+    engine.dispose()
+    assert pool_status(engine)["checkouts"] == 1
+
+
+def test_idle_ping_replaces_dead_connections():
+    import sqlite3
+
+    opened = []
+
+    def creator():
+        opened.append(sqlite3.connect(":memory:", check_same_thread=False))
+        return opened[-1]
+
+    engine = create_engine(
+        "sqlite://", creator=creator, poolclass=TimedQueuePool, pool_size=1, max_overflow=0
+    )
+    install_idle_ping(engine, idle_seconds=0)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    # Server went away while the connection sat in the pool
+    opened[0].close()
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+    assert len(opened) == 2
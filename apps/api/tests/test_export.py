@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+
+from app.modules.tickets.export import COLUMNS, write_csv, write_ndjson
+from app.modules.tickets.models import TicketStatus
+
+
+def rows(n, start=0):
+    return [
+        {
+            "id": uuid.UUID(int=i), "external_id": None, "subject": f"S{i}",
+            "description": "a, \"quoted\"\nline",
+            "status": TicketStatus.OPEN, "priority": "LOW", "channel": "WEB",
+            "requester_email": "c@x.io", "assignee_email": None, "tags": ["b", "a"],
+            "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+            "updated_at": datetime(2026, 1, 2, tzinfo=timezone.utc), "closed_at": None,
+        }
+        for i in range(start, start + n)
+    ]
+
+
+def test_writers_emit_one_piece_per_chunk():
+    pieces = list(write_csv(iter([rows(2), rows(1, start=2)])))
+    assert len(pieces) == 2
+    parsed = list(csv.DictReader(io.StringIO(b"".join(pieces).decode(), newline="")))
+    assert list(parsed[0]) == list(COLUMNS)
+    assert [r["subject"] for r in parsed] == ["S0", "S1", "S2"]
+    assert parsed[0]["status"] == "OPEN" and parsed[0]["tags"] == "b|a"
+    assert parsed[0]["description"] == "a, \"quoted\"\nline" and parsed[0]["closed_at"] == ""
+
+    # Header only when nothing matched
+    assert b"".join(write_csv(iter([]))).decode().strip() == ",".join(COLUMNS)
+
+    lines = b"".join(write_ndjson(iter([rows(2)]))).decode().splitlines()
+    first = json.loads(lines[0])
+    assert first["id"] == str(uuid.UUID(int=0))
+    assert first["created_at"] == "2026-01-01T00:00:00+00:00"
+    assert first["tags"] == ["b", "a"] and first["status"] == "OPEN"
+
+
+def test_export_streams_filtered_tickets(
+    client, db, agent_auth_headers, customer_auth_headers, monkeypatch
+):
+    for i in range(5):
+        ticket_id = client.post(
+            "/api/v1/tickets", headers=customer_auth_headers,
+            json={"subject": f"Export {i}", "description": "..."},
+        ).json()["data"]["id"]
+        client.post(
+            f"/api/v1/tickets/{ticket_id}/messages", headers=agent_auth_headers,
+            json={"body": f"Reply {i}"},
+        )
+        if i % 2:
+            client.post(
+                f"/api/v1/tickets/{ticket_id}/notes", headers=agent_auth_headers,
+                json={"body": f"Note {i}"},
+            )
+    client.patch(
+        f"/api/v1/tickets/{ticket_id}/status", headers=agent_auth_headers,
+        json={"status": "RESOLVED"},
+    )
+
+    # Several chunks per export
+    monkeypatch.setattr("app.modules.tickets.export.EXPORT_CHUNK_SIZE", 2)
+
+    resp = client.get("/api/v1/tickets/export", headers=agent_auth_headers,
+                      params={"format": "ndjson", "include_messages": True, "include_notes": True})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert resp.headers["content-disposition"].startswith('attachment; filename="tickets-')
+    exported = [json.loads(line) for line in resp.text.splitlines()]
+    assert [t["subject"] for t in exported] == [f"Export {i}" for i in range(5)]
+    assert [m["body"] for m in exported[1]["messages"]] == ["Reply 1"]
+    assert [n["body"] for n in exported[1]["notes"]] == ["Note 1"] and exported[0]["notes"] == []
+
+    resp = client.get("/api/v1/tickets/export", headers=agent_auth_headers,
+                      params={"status": "NEW,OPEN", "sort": "created_at", "order": "desc"})
+    assert resp.headers["content-type"].startswith("text/csv")
+    subjects = [r["subject"] for r in csv.DictReader(io.StringIO(resp.text, newline=""))]
+    assert subjects == [f"Export {i}" for i in (3, 2, 1, 0)]
+
+    resp = client.get(
+        "/api/v1/tickets/export", headers=agent_auth_headers, params={"include_messages": True}
+    )
+    assert resp.status_code == 400
+    resp = client.get("/api/v1/tickets/export", headers=customer_auth_headers)
+    assert resp.status_code == 403
+
+
+def test_export_reimports_into_another_workspace(
+    client, admin_auth_headers, agent_auth_headers, customer_auth_headers
+):
+    ticket_id = client.post(
+        "/api/v1/tickets", headers=customer_auth_headers,
+        json={"subject": "Round trip", "description": "a, \"b\"\nc"},
+    ).json()["data"]["id"]
+    tag_ids = [
+        client.post(
+            "/api/v1/tags", headers=admin_auth_headers, json={"name": n}
+        ).json()["data"]["id"]
+        for n in ("vip", "billing")
+    ]
+    client.post(
+        f"/api/v1/tickets/{ticket_id}/tags", headers=agent_auth_headers, json={"tag_ids": tag_ids}
+    )
+    client.patch(
+        f"/api/v1/tickets/{ticket_id}/status", headers=agent_auth_headers,
+        json={"status": "RESOLVED"},
+    )
+    client.post(
+        "/api/v1/tickets", headers=customer_auth_headers,
+        json={"subject": "Still open", "description": "..."},
+    )
+
+    client.post("/api/v1/auth/register", json={
+        "workspace_name": "Other", "admin_email": "other@test.com",
+        "admin_password": "password", "admin_full_name": "Other",
+    })
+    token = client.post(
+        "/api/v1/auth/login", json={"email": "other@test.com", "password": "password"}
+    ).json()["data"]["access_token"]
+    other_headers = {"Authorization": f"Bearer {token}"}
+
+    user_columns = ("requester_email", "assignee_email")
+
+    def export(headers, fmt):
+        return client.get(
+            "/api/v1/tickets/export", headers=headers, params={"format": fmt}
+        ).text
+
+    def without_users(record):
+        # Users belong to one workspace: the importing admin becomes the requester
+        return {k: v for k, v in record.items() if k not in user_columns}
+
+    exported = [json.loads(line) for line in export(agent_auth_headers, "ndjson").splitlines()]
+    assert [t["external_id"] for t in exported] == [t["id"] for t in exported]
+    body = "\n".join(json.dumps(without_users(t)) for t in exported)
+    result = client.post(
+        "/api/v1/tickets/import",
+        headers={**other_headers, "Content-Type": "application/x-ndjson"},
+        content=body,
+    ).json()["data"]
+    assert (result["created"], result["failed"]) == (2, 0)
+
+    reimported = [json.loads(line) for line in export(other_headers, "ndjson").splitlines()]
+    compared = [c for c in COLUMNS if c != "id" and c not in user_columns]
+    assert [{c: t[c] for c in compared} for t in reimported] == [
+        {c: t[c] for c in compared} for t in exported
+    ]
+
+    # The CSV export parses back too: same external ids, so nothing new
+    rows = list(csv.DictReader(io.StringIO(export(agent_auth_headers, "csv"), newline="")))
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=[c for c in COLUMNS if c not in user_columns])
+    writer.writeheader()
+    writer.writerows(without_users(row) for row in rows)
+    result = client.post(
+        "/api/v1/tickets/import", headers=other_headers, params={"format": "csv"},
+        content=buffer.getvalue(),
+    ).json()["data"]
+    assert (result["created"], result["skipped"], result["failed"]) == (0, 2, 0)
@@ -0,0 +1,106 @@
+import uuid
+
+import pytest
+from rq.job import JobStatus
+
+from app import fanout
+
+
+class MemoryRedis:
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class FakeJob:
+    def __init__(self, id, args, depends_on):
+        self.id = id
+        self.args = args
+        self.depends_on = depends_on
+        self.status = JobStatus.QUEUED
+
+    def get_status(self):
+        return self.status
+
+
+class FakeQueue:
+    def __init__(self):
+        self.jobs = {}
+
+    def enqueue(self, func, *args, job_id, depends_on):
+        job = FakeJob(job_id, args, depends_on)
+        self.jobs[job_id] = job
+        return job
+
+    def fetch_job(self, job_id):
+        return self.jobs.get(job_id)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    monkeypatch.setattr(fanout.settings, "jobs_fanout_concurrency", 2)
+    return FakeQueue(), MemoryRedis()
+
+
+def parents(job):
+    return job.depends_on.dependencies if job.depends_on else []
+
+
+def test_fan_out_caps_concurrency_with_lanes(fake):
+    queue, client = fake
+    workspaces = [uuid.uuid4() for _ in range(5)]
+
+    result = fanout.fan_out("sla", print, workspaces, queue=queue, client=client)
+    assert result == {"enqueued": 5, "skipped": 0}
+
+    jobs = list(queue.jobs.values())
+    assert [job.args[2] for job in jobs] == workspaces
+    # Two lanes: the first two start right away, each later one waits on its lane
+    assert [parents(job) for job in jobs[:2]] == [[], []]
+    assert [parents(job) for job in jobs[2:]] == [[jobs[0].id], [jobs[1].id], [jobs[2].id]]
+
+
+def test_fan_out_skips_busy_workspaces_and_chains_onto_running_lanes(fake):
+    queue, client = fake
+    busy, free = uuid.uuid4(), uuid.uuid4()
+    fanout.fan_out("sla", print, [busy], queue=queue, client=client)
+    first = next(iter(queue.jobs.values()))
+    first.status = JobStatus.STARTED
+
+    result = fanout.fan_out("sla", print, [busy, free], queue=queue, client=client)
+    assert result == {"enqueued": 1, "skipped": 1}
+    second = queue.jobs[client.get(fanout.dedupe_key("sla", free))]
+    assert parents(second) == [first.id]
+
+    # A finished (or failed) tail is not chained onto: it would never release the job
+    first.status = JobStatus.FAILED
+    client.delete(fanout.dedupe_key("sla", busy))
+    second.status = JobStatus.FINISHED
+    client.delete(fanout.dedupe_key("sla", free))
+    fanout.fan_out("sla", print, [busy, free], queue=queue, client=client)
+    assert all(parents(job) == [] for job in list(queue.jobs.values())[-2:])
+
+
+def test_run_shard_releases_workspace(monkeypatch):
+    client = MemoryRedis()
+    monkeypatch.setattr(fanout, "get_redis", lambda: client)
+    workspace_id = uuid.uuid4()
+    client.set(fanout.dedupe_key("sla", workspace_id), "job")
+
+    def boom(workspace_id):
+        raise RuntimeError(workspace_id)
+
+    with pytest.raises(RuntimeError):
+        fanout.run_shard("sla", boom, workspace_id, {})
+    assert client.get(fanout.dedupe_key("sla", workspace_id)) is None
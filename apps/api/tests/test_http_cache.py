@@ -0,0 +1,123 @@
+import uuid
+
+from app.core import http_cache as http_cache_module
+from app.core.http_cache import ChangeVersions, etag_for, etag_matches
+
+
+def test_etag_matching_and_version_store(monkeypatch):
+    etag = etag_for("v1", 42)
+    assert etag.startswith('W/"') and etag != etag_for("v2", 42)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"abc", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag) and not etag_matches('"abc"', etag)
+
+    clock = [1000.0]
+    monkeypatch.setattr(http_cache_module.time, "monotonic", lambda: clock[0])
+    versions = ChangeVersions(ttl_seconds=30, use_redis=False)
+    ws, other = uuid.uuid4(), uuid.uuid4()
+
+    version, other_version = versions.workspace(ws), versions.workspace(other)
+    assert versions.workspace(ws) == version
+
+    # A change drops the version of every workspace it touches
+    versions.changed_many([ws, other, ws])
+    assert versions.workspace(ws) != version
+    assert versions.workspace(other) != other_version
+
+    version = versions.workspace(ws)
+    clock[0] += 31
+    assert versions.workspace(ws) != version
+
+
+def test_conditional_get_skips_the_database(
+    client, admin_auth_headers, agent_auth_headers, customer_auth_headers, query_log
+):
+    ticket_id = client.post(
+        "/api/v1/tickets", headers=customer_auth_headers,
+        json={"subject": "Cache me", "description": "..."},
+    ).json()["data"]["id"]
+    detail = f"/api/v1/tickets/{ticket_id}"
+
+    def conditional(path, headers, etag, **params):
+        with query_log() as statements:
+            resp = client.get(path, headers={**headers, "If-None-Match": etag}, params=params)
+        return resp, statements
+
+    for path, params in [
+        (detail, {}), ("/api/v1/tickets", {"size": 10}), ("/api/v1/reports/weekly", {}),
+    ]:
+        first = client.get(path, headers=agent_auth_headers, params=params)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        resp, statements = conditional(path, agent_auth_headers, etag, **params)
+        assert resp.status_code == 304 and resp.headers["etag"] == etag and resp.content == b""
+        # The detail reads its updated_at versions by primary key, nothing else
+        assert len(statements) == (1 if path == detail else 0)
+
+    # A write changes every ETag that depends on the ticket
+    detail_etag = client.get(detail, headers=agent_auth_headers).headers["etag"]
+    list_etag = client.get("/api/v1/tickets", headers=agent_auth_headers).headers["etag"]
+    report_etag = client.get("/api/v1/reports/weekly", headers=agent_auth_headers).headers["etag"]
+    client.patch(f"{detail}/status", headers=agent_auth_headers, json={"status": "RESOLVED"})
+
+    resp, _ = conditional(detail, agent_auth_headers, detail_etag)
+    assert resp.status_code == 200 and resp.json()["data"]["status"] == "RESOLVED"
+    assert resp.headers["etag"] != detail_etag
+    resp, _ = conditional("/api/v1/tickets", agent_auth_headers, list_etag)
+    assert resp.status_code == 200
+    resp, _ = conditional("/api/v1/reports/weekly", agent_auth_headers, report_etag)
+    assert resp.status_code == 200
+
+    # Customers get the same detail ETag through the ownership check, and
+    # lists are per scope
+    detail_etag = client.get(detail, headers=agent_auth_headers).headers["etag"]
+    resp, statements = conditional(detail, customer_auth_headers, detail_etag)
+    assert resp.status_code == 304 and len(statements) == 1
+    staff_etag = client.get("/api/v1/tickets", headers=agent_auth_headers).headers["etag"]
+    customer_etag = client.get("/api/v1/tickets", headers=customer_auth_headers).headers["etag"]
+    assert customer_etag != staff_etag
+
+
+def test_etags_follow_writes_the_api_process_does_not_see(
+    client, db, admin_auth_headers, agent_auth_headers, customer_auth_headers
+):
+    from sqlalchemy import update
+
+    from app.modules.tickets.models import Ticket, TicketPriority
+
+    ticket_id = client.post(
+        "/api/v1/tickets", headers=customer_auth_headers,
+        json={"subject": "Cache me", "description": "..."},
+    ).json()["data"]["id"]
+    detail = f"/api/v1/tickets/{ticket_id}"
+
+    def etags():
+        return (
+            client.get(detail, headers=agent_auth_headers).headers["etag"],
+            client.get("/api/v1/tickets", headers=agent_auth_headers).headers["etag"],
+        )
+
+    # A worker commits straight to the database, without changed()
+    detail_etag, _ = etags()
+    db.execute(
+        update(Ticket)
+        .where(Ticket.id == uuid.UUID(ticket_id))
+        .values(priority=TicketPriority.HIGH)
+    )
+    db.commit()
+    resp = client.get(detail, headers={**agent_auth_headers, "If-None-Match": detail_etag})
+    assert resp.status_code == 200 and resp.json()["data"]["priority"] == "HIGH"
+
+    # Renaming the requester changes both the detail and the list
+    detail_etag, list_etag = etags()
+    customer_id = client.get("/api/v1/users/me", headers=customer_auth_headers).json()["data"]["id"]
+    client.patch(
+        f"/api/v1/users/{customer_id}", headers=admin_auth_headers, json={"full_name": "Renamed"}
+    )
+    resp = client.get(detail, headers={**agent_auth_headers, "If-None-Match": detail_etag})
+    assert resp.status_code == 200 and resp.json()["data"]["requester"]["full_name"] == "Renamed"
+    resp = client.get("/api/v1/tickets", headers={**agent_auth_headers, "If-None-Match": list_etag})
+    assert resp.status_code == 200
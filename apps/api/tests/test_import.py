@@ -0,0 +1,219 @@
+import io
+import json
+
+from sqlalchemy import select
+
+from app.modules.reports.models import WorkspaceDailyStats
+from app.modules.sla.models import TicketSLA
+from app.modules.tickets.importer import format_for, parse_csv, parse_ndjson
+from app.modules.tickets.models import Ticket, TicketMessage
+
+
+def test_parsers_keep_line_numbers_and_report_bad_lines():
+    lines = ['{"external_id": "a", "subject": "A"}\n', "\n", "not json\n", "[1]\n"]
+    parsed = list(parse_ndjson(lines))
+    assert parsed[0] == (1, {"external_id": "a", "subject": "A"})
+    assert parsed[1][0] == 3 and parsed[1][1].startswith("invalid JSON")
+    assert parsed[2] == (4, "expected a JSON object")
+
+    csv_file = io.StringIO(
+        'external_id,subject,tags,priority\nb,"Multi\nline",vip| billing,\n', newline=""
+    )
+    rows = list(parse_csv(csv_file))
+    assert rows == [
+        (3, {"external_id": "b", "subject": "Multi\nline", "tags": ["vip", "billing"]})
+    ]
+
+    assert format_for("application/x-ndjson; charset=utf-8") == "ndjson"
+    assert format_for(None, "export.CSV") == "csv"
+    assert format_for("text/plain") is None
+
+
+def test_import_ndjson_is_idempotent(
+    client, db, admin_auth_headers, agent_auth_headers, customer_auth_headers, relay_outbox
+):
+    agent = client.get("/api/v1/auth/me", headers=agent_auth_headers).json()["data"]["user"]
+    customer = client.get(
+        "/api/v1/auth/me", headers=customer_auth_headers
+    ).json()["data"]["user"]
+    client.post(
+        "/api/v1/slas", headers=admin_auth_headers,
+        json={"name": "Gold", "first_response_time_minutes": 60, "resolution_time_minutes": 240},
+    )
+    records = [
+        {
+            "external_id": "zd-1", "subject": "Printer on fire", "description": "Smoke",
+            "status": "CLOSED", "requester_email": customer["email"],
+            "assignee_email": agent["email"],
+            "tags": ["hardware", "vip"], "sla_policy": "Gold",
+            "created_at": "2026-03-02T09:00:00Z", "closed_at": "2026-03-02T15:00:00Z",
+            "messages": [
+                {"body": "It is still smoking"},
+                {
+                    "body": "Unplug it", "author_email": agent["email"],
+                    "created_at": "2026-03-02T09:30:00Z",
+                },
+            ],
+        },
+        {"external_id": "zd-2", "subject": "Password reset", "tags": ["vip"]},
+        {"external_id": "zd-3", "subject": "Ghost", "requester_email": "nobody@example.com"},
+        {"external_id": "zd-2", "subject": "Repeated in the file"},
+        {"subject": "No id"},
+    ]
+    body = "\n".join(json.dumps(r) for r in records)
+
+    ndjson_headers = {**admin_auth_headers, "Content-Type": "application/x-ndjson"}
+
+    def upload():
+        resp = client.post("/api/v1/tickets/import", headers=ndjson_headers, content=body)
+        assert resp.status_code == 200
+        return resp.json()["data"]
+
+    result = upload()
+    counts = (result["created"], result["skipped"], result["failed"], result["messages"])
+    assert counts == (2, 1, 2, 2)
+    assert [(e["line"], e["external_id"]) for e in result["errors"]] == [(5, None), (3, "zd-3")]
+    assert result["rows_per_second"] > 0
+
+    ticket = db.execute(select(Ticket).where(Ticket.external_id == "zd-1")).scalar_one()
+    assert str(ticket.assigned_agent_id) == agent["id"]
+    assert str(ticket.created_by_user_id) == customer["id"]
+    assert ticket.last_agent_activity_at.hour == 9
+    assert {t.name for t in ticket.tags} == {"hardware", "vip"}
+    assert db.scalar(select(TicketMessage.body).where(
+        TicketMessage.ticket_id == ticket.id,
+        TicketMessage.author_user_id == ticket.created_by_user_id,
+    )) == "It is still smoking"
+    sla = db.get(TicketSLA, ticket.id)
+    assert sla.first_response_met and not sla.first_response_breached
+    assert sla.resolution_met and sla.resolution_breached
+    # The counters ride on the import's outbox event
+    relay_outbox()
+    stats = select(
+        WorkspaceDailyStats.tickets_created,
+        WorkspaceDailyStats.tickets_resolved,
+        WorkspaceDailyStats.resolution_breaches,
+    ).where(
+        WorkspaceDailyStats.workspace_id == ticket.workspace_id,
+        WorkspaceDailyStats.day == ticket.created_at.date(),
+    )
+    assert tuple(db.execute(stats).one()) == (1, 1, 1)
+
+    # Found by full-text search like any other ticket
+    found = client.get(
+        "/api/v1/tickets", headers=agent_auth_headers, params={"q": "smoking"}
+    ).json()["data"]
+    assert [t["id"] for t in found] == [str(ticket.id)]
+
+    # Second run: nothing new
+    again = upload()
+    assert (again["created"], again["skipped"], again["messages"]) == (0, 3, 0)
+    assert relay_outbox() == 0
+    assert tuple(db.execute(stats).one()) == (1, 1, 1)
+
+    resp = client.post("/api/v1/tickets/import", headers=agent_auth_headers, content=body)
+    assert resp.status_code == 403
+    resp = client.post(
+        "/api/v1/tickets/import",
+        headers={**admin_auth_headers, "Content-Type": "text/plain"},
+        content=body,
+    )
+    assert resp.status_code == 400
+
+
+def test_import_reports_undecodable_lines_instead_of_failing(client, db, admin_auth_headers):
+    ndjson = (
+        b'{"external_id": "u-1", "subject": "Fine"}\n'
+        b'{"external_id": "u-2", "subject": "Latin-1 \xe9t\xe9"}\n'
+        b'{"external_id": "u-3", "subject": "Also fine \xc3\xa9"}\n'
+    )
+    resp = client.post(
+        "/api/v1/tickets/import",
+        headers={**admin_auth_headers, "Content-Type": "application/x-ndjson"},
+        content=ndjson,
+    )
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert (data["created"], data["failed"]) == (2, 1)
+    assert data["errors"][0] == {"line": 2, "external_id": None, "error": "invalid UTF-8"}
+
+    csv_body = (
+        b"external_id,subject\n"
+        b"c-1,NUL \x00 byte\n"
+        b'c-2,"' + b"x" * 200_000 + b'"\n'
+        b"c-3,Fine\n"
+    )
+    resp = client.post(
+        "/api/v1/tickets/import",
+        headers={**admin_auth_headers, "Content-Type": "text/csv"},
+        content=csv_body,
+    )
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert (data["created"], data["failed"]) == (1, 2)
+    assert [(e["line"], e["error"].split(":")[0]) for e in data["errors"]] == [
+        (2, "NUL byte"), (3, "invalid CSV"),
+    ]
+
+
+def test_import_csv(client, db, admin_auth_headers):
+    body = (
+        "external_id,subject,priority,tags,created_at\n"
+        "fd-1,VPN down,HIGH,network|vip,2026-03-01 08:00:00\n"
+        "fd-2,,LOW,,\n"
+    )
+    resp = client.post(
+        "/api/v1/tickets/import", headers=admin_auth_headers, params={"format": "csv"}, content=body
+    )
+    data = resp.json()["data"]
+    assert (data["created"], data["failed"]) == (1, 1)
+    assert data["errors"][0]["line"] == 3
+
+    ticket = db.execute(select(Ticket).where(Ticket.external_id == "fd-1")).scalar_one()
+    assert ticket.priority == "HIGH" and ticket.created_at.tzinfo is not None
+    assert {t.name for t in ticket.tags} == {"network", "vip"}
+
+
+def test_import_schedules_timers_for_pending_deadlines(
+    client, db, admin_auth_headers, monkeypatch
+):
+    from app.modules.sla import timers as timers_module
+    from app.modules.tickets import importer
+
+    class RecordingRedis:
+        def __init__(self):
+            self.members = {}
+
+        def zadd(self, key, mapping):
+            self.members.update(mapping)
+
+    redis_client = RecordingRedis()
+    monkeypatch.setattr(timers_module.settings, "sla_timers_enabled", True)
+    monkeypatch.setattr(importer, "sla_timers", timers_module.SLATimerQueue(redis_client))
+
+    client.post(
+        "/api/v1/slas", headers=admin_auth_headers,
+        json={"name": "Timed", "first_response_time_minutes": 60, "resolution_time_minutes": 240},
+    )
+    records = [
+        {"external_id": "t-open", "subject": "Open", "sla_policy": "Timed"},
+        {"external_id": "t-closed", "subject": "Closed", "status": "CLOSED", "sla_policy": "Timed"},
+        {"external_id": "t-none", "subject": "No SLA"},
+    ]
+    resp = client.post(
+        "/api/v1/tickets/import",
+        headers={**admin_auth_headers, "Content-Type": "application/x-ndjson"},
+        content="\n".join(json.dumps(r) for r in records),
+    )
+    assert resp.json()["data"]["created"] == 3
+
+    open_id, closed_id = (
+        db.scalar(select(Ticket.id).where(Ticket.external_id == external_id))
+        for external_id in ("t-open", "t-closed")
+    )
+    # Closed: resolution met, but its first response is still pending
+    assert set(redis_client.members) == {
+        f"{open_id}:{timers_module.FIRST_RESPONSE}",
+        f"{open_id}:{timers_module.RESOLUTION}",
+        f"{closed_id}:{timers_module.FIRST_RESPONSE}",
+    }
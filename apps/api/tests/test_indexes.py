@@ -0,0 +1,151 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import false, select, text, true
+
+from app.db.session import SessionLocal
+from app.modules.sla.escalation import MAX_ESCALATION_LEVEL, SLAEscalationEngine
+from app.modules.sla.models import TicketSLA
+from app.modules.tickets.auto_close import AutoCloseEngine
+from app.modules.tickets.models import Ticket
+from app.modules.tickets.repo import ticket_repo
+from app.modules.tickets.schemas import TicketFilter
+from tests.seed import create_breached_tickets, create_tickets, create_workspace, drop_workspace
+
+WORKSPACES = 8
+TICKETS_PER_WORKSPACE = 3000
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    """
+    Several workspaces so `workspace_id = ?` is selective, then ANALYZE so
+    the planner knows it.
+    """
+    db = SessionLocal()
+    db.execute(text("TRUNCATE TABLE users, workspaces RESTART IDENTITY CASCADE"))
+    db.commit()
+    workspaces = []
+    for i in range(WORKSPACES):
+        ws = create_workspace(db, f"Index WS {i}", agents=5)
+        create_tickets(db, ws, TICKETS_PER_WORKSPACE)
+        create_breached_tickets(db, ws, 50)
+        workspaces.append(ws)
+    # Settled SLAs for the regular tickets: the bulk of the table the partial
+    # indexes leave out
+    db.execute(text("""
+        INSERT INTO ticket_slas (ticket_id, workspace_id, policy_id,
+                                 first_response_due_at, resolution_due_at,
+                                 first_response_met, resolution_met,
+                                 first_response_breached, resolution_breached,
+                                 escalated_level, created_at, updated_at)
+        SELECT t.id, t.workspace_id, p.id,
+               t.created_at + interval '10 minutes', t.created_at + interval '1 hour',
+               true, true, false, false, 0, t.created_at, t.created_at
+        FROM tickets t JOIN sla_policies p ON p.workspace_id = t.workspace_id
+        WHERE NOT EXISTS (SELECT 1 FROM ticket_slas s WHERE s.ticket_id = t.id)
+    """))
+    for table in ("tickets", "ticket_slas", "audit_logs"):
+        db.execute(text(f"ANALYZE {table}"))
+    db.commit()
+    try:
+        yield db, workspaces[0]
+    finally:
+        db.rollback()
+        for ws in workspaces:
+            drop_workspace(db, ws["workspace_id"])
+        db.close()
+
+
+def explain(db, stmt) -> dict:
+    compiled = stmt.compile(dialect=db.bind.dialect, compile_kwargs={"render_postcompile": True})
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def scans(plan: dict) -> list[tuple[str, str | None, str | None]]:
+    """(node type, relation, index) for every node of the plan."""
+    nodes = [(plan["Node Type"], plan.get("Relation Name"), plan.get("Index Name"))]
+    for child in plan.get("Plans", []):
+        nodes.extend(scans(child))
+    return nodes
+
+
+def assert_uses_index(plan: dict, table: str, expected: set[str]) -> None:
+    nodes = scans(plan)
+    assert ("Seq Scan", table, None) not in nodes, nodes
+    used = {index for _, relation, index in nodes if relation == table and index}
+    assert used & expected, nodes
+
+
+OPEN_LIST_INDEXES = {"ix_tickets_open_ws_created", "ix_tickets_ws_status_created"}
+
+
+@pytest.mark.parametrize("params, expected", [
+    ({}, {"ix_tickets_ws_created"}),
+    ({"sort": "updated_at"}, {"ix_tickets_ws_updated"}),
+    ({"status": "OPEN"}, OPEN_LIST_INDEXES),
+    ({"status": "NEW,OPEN,PENDING"}, OPEN_LIST_INDEXES),
+    ({"status": "CLOSED"}, {"ix_tickets_ws_status_created"}),
+])
+def test_ticket_list_uses_composite_indexes(seeded, params, expected):
+    db, ws = seeded
+    stmt, _ = ticket_repo.list_statements(ws["workspace_id"], TicketFilter(**params))
+    assert_uses_index(explain(db, stmt), "tickets", expected)
+
+
+def test_ticket_list_by_assignee_uses_index(seeded):
+    db, ws = seeded
+    stmt, _ = ticket_repo.list_statements(
+        ws["workspace_id"], TicketFilter(assigned_to=ws["agent_ids"][0])
+    )
+    assert_uses_index(explain(db, stmt), "tickets", {"ix_tickets_ws_assignee_created"})
+
+
+def test_auto_close_candidates_use_partial_index(seeded):
+    db, _ = seeded
+    engine = AutoCloseEngine()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=7)
+    stmt = select(Ticket.id).where(*engine._closable(cutoff)).limit(500)
+    assert_uses_index(explain(db, stmt), "tickets", {"ix_tickets_resolved_updated"})
+
+
+def test_sla_breach_scans_use_partial_indexes(seeded):
+    db, ws = seeded
+    now = datetime.now(timezone.utc)
+    fr = select(TicketSLA.ticket_id).where(
+        TicketSLA.first_response_due_at < now,
+        TicketSLA.first_response_met == false(),
+        TicketSLA.first_response_breached == false(),
+    )
+    assert_uses_index(explain(db, fr), "ticket_slas", {"ix_ticket_slas_fr_due"})
+
+    res = select(TicketSLA.ticket_id).where(
+        TicketSLA.resolution_due_at < now,
+        TicketSLA.resolution_met == false(),
+        TicketSLA.resolution_breached == false(),
+        TicketSLA.workspace_id == ws["workspace_id"],
+    )
+    assert_uses_index(explain(db, res), "ticket_slas", {"ix_ticket_slas_res_due"})
+
+
+def test_sla_escalation_uses_breached_index(seeded):
+    db, ws = seeded
+    now = datetime.now(timezone.utc)
+    # Only a few breached rows exist once flagged; escalate must find them
+    # without a full scan
+    SLAEscalationEngine().flag_breaches(db, now, ws["workspace_id"])
+    try:
+        stmt = select(TicketSLA.ticket_id).where(
+            (TicketSLA.first_response_breached == true())
+            | (TicketSLA.resolution_breached == true()),
+            TicketSLA.escalated_level < MAX_ESCALATION_LEVEL,
+        )
+        assert_uses_index(explain(db, stmt), "ticket_slas", {"ix_ticket_slas_breached_level"})
+    finally:
+        db.rollback()
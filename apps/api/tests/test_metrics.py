@@ -0,0 +1,131 @@
+from sqlalchemy import create_engine, text
+
+from app.core.metrics import MetricsRegistry
+from app.db.profiling import install_query_profiler, profile_queries
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    runs = registry.counter("runs_total", "Runs", ("job",))
+    runs.inc("sla")
+    runs.inc("sla", amount=2)
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1))
+    latency.observe("/a", value=0.05)
+    latency.observe("/a", value=0.5)
+    latency.observe("/a", value=3)
+
+    def broken():
+        raise RuntimeError("db down")
+
+    registry.register_collector("broken", broken)
+    registry.register_collector("static", lambda: [("up", "gauge", "Up", [({"node": 'a"b'}, 1)])])
+
+    lines = registry.render().splitlines()
+    assert "# TYPE runs_total counter" in lines
+    assert 'runs_total{job="sla"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.55' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+    # A failing collector is skipped, the rest still render
+    assert 'up{node="a\\"b"} 1' in lines
+
+
+def test_profile_queries_counts_only_inside_block():
+    engine = create_engine("sqlite://")
+    install_query_profiler(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with profile_queries() as stats:
+            conn.execute(text("SELECT 1"))
+            try:
+                conn.execute(text("SELECT * FROM missing"))
+            except Exception:
+                pass
+            conn.execute(text("SELECT 2"))
+        # The failed statement didn't leave a start time behind
+        assert conn.info["query_start"] == []
+
+    assert stats.count == 2
+    assert stats.seconds > 0
+
+
+def test_metrics_middleware_labels_by_route_template():
+    from fastapi import APIRouter, FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.core import http_metrics
+    from app.core.metrics import registry
+
+    router = APIRouter()
+
+    @router.get("/{ticket_id}")
+    def detail(ticket_id: str):
+        return {"id": ticket_id}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/things")
+    app.add_middleware(http_metrics.MetricsMiddleware)
+
+    client = TestClient(app)
+    client.get("/api/v1/things/a")
+    client.get("/api/v1/things/b")
+    client.get("/no/such/path")
+
+    text = registry.render()
+    route = 'method="GET",route="/api/v1/things/{ticket_id}"'
+    assert f'helpdesk_http_requests_total{{{route},status="200"}} 2' in text
+    assert 'helpdesk_http_requests_total{method="GET",route="<unmatched>",status="404"} 1' in text
+    assert f"helpdesk_http_request_duration_seconds_count{{{route}}} 2" in text
+    assert f'helpdesk_http_request_db_statements_bucket{{{route},le="0"}} 2' in text
+    assert "helpdesk_http_requests_in_flight 0" in text
+    assert "/api/v1/things/a" not in text
+
+
+def test_query_profiling_middleware_budget_server_timing_and_slow_log(monkeypatch, caplog):
+    import logging
+
+    import pytest
+    from fastapi import APIRouter, FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.core import http_metrics
+    from app.db import profiling
+
+    engine = create_engine("sqlite://")
+    install_query_profiler(engine)
+    router = APIRouter()
+
+    @router.get("/{n}")
+    @profiling.query_budget(2)
+    def run(n: int):
+        with engine.connect() as conn:
+            for _ in range(n):
+                conn.execute(text("SELECT 1"))
+        return {"n": n}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/things")
+    app.add_middleware(http_metrics.QueryProfilingMiddleware)
+    client = TestClient(app)
+
+    monkeypatch.setattr(http_metrics.settings, "server_timing_enabled", True)
+    monkeypatch.setattr(profiling.settings, "db_query_budget_mode", "raise")
+    resp = client.get("/things/2")
+    assert resp.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="2 queries"' in resp.headers["server-timing"]
+
+    with pytest.raises(
+        profiling.QueryBudgetExceeded,
+        match=r"GET /things/\{n\} ran 3 SQL statements, budget is 2",
+    ):
+        client.get("/things/3")
+
+    monkeypatch.setattr(profiling.settings, "db_query_budget_mode", "warn")
+    monkeypatch.setattr(profiling.settings, "db_slow_query_ms", 0.000001)
+    with caplog.at_level(logging.WARNING, logger="app.db.profiling"):
+        assert client.get("/things/3").status_code == 200
+    assert "budget is 2" in caplog.text
+    assert "slow query" in caplog.text and "[GET /things/{n}]: SELECT 1" in caplog.text
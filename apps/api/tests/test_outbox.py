@@ -0,0 +1,117 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.modules.outbox.models import OutboxEvent
+from app.modules.outbox.relay import STREAM, OutboxRelay
+from app.modules.realtime.events import TICKET_CREATED, TICKET_STATUS
+
+
+class RecordingStream:
+    """The stream commands OutboxRelay uses."""
+
+    def __init__(self):
+        self.entries = []
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def xadd(self, name, fields, maxlen=None, approximate=True):
+        self.entries.append((name, fields))
+
+    def execute(self):
+        return []
+
+
+def test_events_commit_with_the_change_and_are_relayed_once(
+    client, db, agent_auth_headers, customer_auth_headers
+):
+    ticket_id = client.post(
+        "/api/v1/tickets", headers=customer_auth_headers,
+        json={"subject": "Outbox", "description": "..."},
+    ).json()["data"]["id"]
+    status_path = f"/api/v1/tickets/{ticket_id}/status"
+    client.patch(status_path, headers=agent_auth_headers, json={"status": "PENDING"})
+    # Rejected before commit: no event
+    resp = client.patch(status_path, headers=agent_auth_headers, json={"status": "BOGUS"})
+    assert resp.status_code == 400
+
+    events = db.execute(
+        select(OutboxEvent.event_type, OutboxEvent.payload).order_by(OutboxEvent.id)
+    ).all()
+    assert [(e.event_type, e.payload["ticket_ids"]) for e in events] == [
+        (TICKET_CREATED, [ticket_id]),
+        (TICKET_STATUS, [ticket_id]),
+    ]
+
+    # A failing handler leaves the batch in place for the next pass
+    def failing(batch):
+        raise RuntimeError("downstream down")
+
+    stream = RecordingStream()
+    relay = OutboxRelay(session_factory=lambda: db, client=stream, batch_size=1, handlers=[failing])
+    with pytest.raises(RuntimeError):
+        relay.process()
+    assert db.scalar(select(func.count()).select_from(OutboxEvent)) == 2
+
+    handled = []
+    relay = OutboxRelay(
+        session_factory=lambda: db, client=stream, batch_size=1, handlers=[handled.extend]
+    )
+    assert relay.process() == 1
+    assert relay.process() == 1
+    assert relay.process() == 0
+    assert [e["event_type"] for e in handled] == [TICKET_CREATED, TICKET_STATUS]
+    streamed = [fields["type"] for name, fields in stream.entries if name == STREAM]
+    assert streamed[-2:] == [TICKET_CREATED, TICKET_STATUS]
+    assert db.scalar(select(func.count()).select_from(OutboxEvent)) == 0
+
+
+def test_relay_applies_counters_and_audit_with_the_claim(
+    client, db, admin_auth_headers, agent_auth_headers, customer_auth_headers
+):
+    from app.modules.audit.models import AuditLog
+    from app.modules.reports.models import WorkspaceDailyStats
+
+    ticket_ids = [
+        client.post(
+            "/api/v1/tickets", headers=customer_auth_headers,
+            json={"subject": f"Counted {i}", "description": "..."},
+        ).json()["data"]["id"]
+        for i in range(2)
+    ]
+    client.patch(
+        f"/api/v1/tickets/{ticket_ids[0]}/status", headers=agent_auth_headers,
+        json={"status": "RESOLVED"},
+    )
+    client.post(
+        "/api/v1/tickets/bulk", headers=agent_auth_headers,
+        json={"ticket_ids": ticket_ids, "status": "CLOSED"},
+    )
+    report = client.get("/api/v1/reports/weekly", headers=admin_auth_headers)
+    assert report.json()["data"]["tickets_created"] == 0
+
+    counters = select(WorkspaceDailyStats.tickets_created, WorkspaceDailyStats.tickets_resolved)
+    audited = select(func.count()).select_from(AuditLog).where(AuditLog.action == "bulk_update")
+
+    # Rolled back with the claim when delivery fails: nothing counted twice
+    def failing(batch):
+        raise RuntimeError("downstream down")
+
+    stream = RecordingStream()
+    relay = OutboxRelay(session_factory=lambda: db, client=stream, handlers=[failing])
+    with pytest.raises(RuntimeError):
+        relay.process()
+    assert db.execute(counters).all() == [] and db.scalar(audited) == 0
+
+    relay = OutboxRelay(session_factory=lambda: db, client=stream, handlers=[])
+    assert relay.process() == 4
+    # RESOLVED -> CLOSED is the same resolution, OPEN -> CLOSED a new one
+    assert tuple(db.execute(counters).one()) == (2, 2)
+    assert db.scalar(audited) == 2
+
+    # The weekly report's ETag moves once the counters land
+    resp = client.get(
+        "/api/v1/reports/weekly",
+        headers={**admin_auth_headers, "If-None-Match": report.headers["etag"]},
+    )
+    assert resp.status_code == 200 and resp.json()["data"]["tickets_resolved"] == 2
@@ -0,0 +1,16 @@
+import pytest
+
+from app.common.pagination import decode_cursor, encode_cursor
+from app.core.errors import BadRequest
+
+
+def test_cursor_round_trip():
+    payload = {"s": "created_at", "o": "desc", "v": "2026-01-07 10:00:00+00:00", "id": "abc"}
+    cursor = encode_cursor(payload)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == payload
+
+
+def test_invalid_cursor_is_bad_request():
+    with pytest.raises(BadRequest):
+        decode_cursor("not-a-cursor!!")
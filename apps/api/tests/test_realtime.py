@@ -0,0 +1,97 @@
+import asyncio
+import json
+import uuid
+
+from app.modules.realtime import events as events_module
+from app.modules.realtime.events import TICKET_STATUS, TicketEvents, channel_for
+from app.modules.realtime.hub import RESYNC_FRAME, RealtimeHub
+
+
+class RecordingRedis:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, payload):
+        self.published.append((channel, json.loads(payload)))
+
+
+def test_events_are_published_per_workspace(monkeypatch):
+    client = RecordingRedis()
+    publisher = TicketEvents(client)
+    ws, other = uuid.uuid4(), uuid.uuid4()
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    monkeypatch.setattr(events_module.settings, "realtime_enabled", False)
+    publisher.publish(ws, TICKET_STATUS, [a])
+    assert client.published == []
+
+    monkeypatch.setattr(events_module.settings, "realtime_enabled", True)
+    publisher.publish(ws, TICKET_STATUS, [])
+    publisher.publish_rows(TICKET_STATUS, [(ws, a), (other, b), (ws, c)])
+    assert [(channel, event["ticket_ids"]) for channel, event in client.published] == [
+        (channel_for(ws), [str(a), str(c)]),
+        (channel_for(other), [str(b)]),
+    ]
+    assert client.published[0][1]["type"] == TICKET_STATUS
+
+
+def test_hub_fans_out_and_resyncs_slow_clients(monkeypatch):
+    hub = RealtimeHub(queue_size=2)
+    # No Redis here: events are dispatched as the listener would
+    monkeypatch.setattr(hub, "_ensure_listener", lambda: None)
+    ws, other = uuid.uuid4(), uuid.uuid4()
+    event = json.dumps({"type": TICKET_STATUS, "ticket_ids": [str(uuid.uuid4())]})
+
+    async def scenario():
+        async with (
+            hub.subscribe(ws) as first,
+            hub.subscribe(ws) as second,
+            hub.subscribe(other) as third,
+        ):
+            hub.dispatch(ws, event)
+            frame = f"event: {TICKET_STATUS}\ndata: {event}\n\n".encode()
+            assert first.get_nowait() == frame and second.get_nowait() == frame
+            assert third.empty()
+
+            hub.dispatch(ws, "not json")
+            assert first.empty()
+
+            for _ in range(3):
+                hub.dispatch(ws, event)
+            assert first.qsize() == 1 and first.get_nowait() == RESYNC_FRAME
+        assert hub.clients(ws) == 0
+
+    asyncio.run(scenario())
+
+
+def test_stream_requires_staff_and_updated_since_returns_deltas(
+    client, agent_auth_headers, customer_auth_headers
+):
+    assert client.get("/api/v1/events").status_code == 401
+    assert client.get("/api/v1/events", headers=customer_auth_headers).status_code == 403
+    token = agent_auth_headers["Authorization"].removeprefix("Bearer ")
+    # Disabled by default
+    assert client.get("/api/v1/events", params={"access_token": token}).status_code == 400
+
+    def create(subject):
+        return client.post(
+            "/api/v1/tickets", headers=customer_auth_headers,
+            json={"subject": subject, "description": "..."},
+        ).json()["data"]
+
+    first = create("First")
+    second = create("Second")
+
+    def changed_since():
+        resp = client.get(
+            "/api/v1/tickets", headers=agent_auth_headers,
+            params={"updated_since": second["updated_at"]},
+        )
+        return {t["subject"] for t in resp.json()["data"]}
+
+    assert changed_since() == {"Second"}
+    client.patch(
+        f"/api/v1/tickets/{first['id']}/status", headers=agent_auth_headers,
+        json={"status": "PENDING"},
+    )
+    assert changed_since() == {"First", "Second"}
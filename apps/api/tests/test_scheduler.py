@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.cron import CronSpec, weekly_cron
+from app.scheduler import IntervalSpec, ScheduledJob, Scheduler
+
+
+class MemoryScheduleState:
+    """Same contract as RedisScheduleState, shared between schedulers in a test."""
+
+    def __init__(self):
+        self.next_runs: dict[str, str] = {}
+        self.leader: tuple[str, datetime] | None = None
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def get_next_run(self, name):
+        return self.next_runs.get(name)
+
+    def advance(self, name, expected, next_run):
+        if self.next_runs.get(name) != expected:
+            return False
+        self.next_runs[name] = next_run
+        return True
+
+    def acquire_lease(self, owner, ttl_seconds):
+        if self.leader is None or self.leader[0] == owner or self.leader[1] <= self.now:
+            self.leader = (owner, self.now + timedelta(seconds=ttl_seconds))
+            return True
+        return False
+
+    def release_lease(self, owner):
+        if self.leader and self.leader[0] == owner:
+            self.leader = None
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_cron_next_after():
+    every_15_minutes = CronSpec("*/15 * * * *")
+    assert every_15_minutes.next_after(utc(2026, 3, 2, 10, 7, 30)) == utc(2026, 3, 2, 10, 15)
+    assert CronSpec("0 3 * * *").next_after(utc(2026, 3, 2, 3, 0)) == utc(2026, 3, 3, 3, 0)
+    # 2026-03-02 is a Monday
+    monday_9am = CronSpec(weekly_cron("MONDAY", 9))
+    assert monday_9am.next_after(utc(2026, 3, 2, 9, 30)) == utc(2026, 3, 9, 9, 0)
+    assert CronSpec("30 8 * * MON-FRI").next_after(utc(2026, 3, 6, 9, 0)) == utc(2026, 3, 9, 8, 30)
+    assert CronSpec("0 0 29 2 *").next_after(utc(2026, 1, 1)) == utc(2028, 2, 29, 0, 0)
+    # Day-of-month OR day-of-week when both are restricted
+    assert CronSpec("0 0 15 * SUN").next_after(utc(2026, 3, 2)) == utc(2026, 3, 8, 0, 0)
+
+
+@pytest.mark.parametrize(
+    "expr", ["* * * *", "61 * * * *", "*/0 * * * *", "5-1 * * * *", "0 0 * * FUNDAY"]
+)
+def test_cron_rejects_invalid(expr):
+    with pytest.raises(ValueError):
+        CronSpec(expr)
+
+
+def test_scheduler_persists_state_and_elects_one_leader():
+    state = MemoryScheduleState()
+    fired = []
+    jobs = [
+        ScheduledJob("escalation", None, IntervalSpec(300), run_on_first_start=True),
+        ScheduledJob("weekly", None, CronSpec("0 9 * * 1"), misfire_grace_seconds=600),
+    ]
+
+    def enqueue(job, due):
+        fired.append((job.name, due))
+
+    a = Scheduler(jobs, state, enqueue, lease_ttl_seconds=30, owner="a")
+    b = Scheduler(jobs, state, enqueue, lease_ttl_seconds=30, owner="b")
+
+    now = state.now
+    assert a.tick(now) == ["escalation"]
+    assert b.tick(now) == []  # not the leader
+    assert state.next_runs["weekly"] == utc(2026, 1, 5, 9, 0).isoformat()
+
+    # A restart (new instance, same state) does not re-enqueue anything
+    a.release()
+    restarted = Scheduler(jobs, state, enqueue, owner="a2")
+    assert restarted.tick(now + timedelta(seconds=10)) == []
+    assert restarted.tick(now + timedelta(seconds=300)) == ["escalation"]
+
+    # Leader dies without releasing: b takes over once the lease expires
+    state.now = now + timedelta(seconds=400)
+    assert b.tick(state.now) == []
+    state.now = now + timedelta(seconds=700)
+    assert b.tick(state.now) == ["escalation"]
+    assert b.is_leader
+
+    # Misfire: the Monday 09:00 run found a day late is skipped and rescheduled
+    late = utc(2026, 1, 6, 9, 0)
+    state.now = late
+    assert "weekly" not in b.tick(late)
+    assert state.next_runs["weekly"] == utc(2026, 1, 12, 9, 0).isoformat()
+    assert [name for name, _ in fired].count("weekly") == 0
+
+    # On time (within grace) it fires, once
+    on_time = utc(2026, 1, 12, 9, 2)
+    state.now = on_time
+    assert "weekly" in b.tick(on_time)
+    assert "weekly" not in b.tick(on_time)
+
+
+def test_weekly_report_runs_late_after_an_outage_across_its_slot():
+    from app.scheduler import default_jobs
+
+    weekly = next(job for job in default_jobs() if job.name == "weekly_report")
+    state = MemoryScheduleState()
+    fired = []
+    scheduler = Scheduler([weekly], state, lambda job, due: fired.append(due), owner="a")
+    assert scheduler.tick(state.now) == []
+    slot = datetime.fromisoformat(state.next_runs["weekly_report"])
+
+    # Down from an hour before the slot until five hours after it
+    state.now = slot - timedelta(hours=1)
+    assert scheduler.tick(state.now) == []
+    back = slot + timedelta(hours=5)
+    state.now = back
+    assert scheduler.tick(back) == ["weekly_report"]
+    assert fired == [slot]
+    # Once, and the next run is the following week's slot
+    assert scheduler.tick(back + timedelta(seconds=10)) == []
+    assert datetime.fromisoformat(state.next_runs["weekly_report"]) > slot + timedelta(days=6)
+
+
+def test_jitter_is_stored_with_the_next_run():
+    state = MemoryScheduleState()
+    job = ScheduledJob("j", None, IntervalSpec(60), jitter_seconds=10, run_on_first_start=True)
+    scheduler = Scheduler([job], state, lambda job, due: None, owner="a")
+    scheduler.tick(state.now)
+    next_run = datetime.fromisoformat(state.next_runs["j"])
+    assert state.now + timedelta(seconds=60) <= next_run <= state.now + timedelta(seconds=70)
+
+
+def test_enqueue_job_skips_a_run_rq_already_has(monkeypatch):
+    from rq.job import Job
+
+    from app import queue
+    from app.scheduler import enqueue_job
+
+    enqueued = []
+
+    class RecordingQueue:
+        connection = None
+
+        def enqueue(self, func, job_id, meta):
+            enqueued.append(job_id)
+
+    known = set()
+    monkeypatch.setattr(queue, "task_queue", RecordingQueue())
+    monkeypatch.setattr(Job, "exists", classmethod(lambda cls, job_id, connection: job_id in known))
+
+    job = ScheduledJob("j", None, IntervalSpec(60))
+    due = utc(2026, 1, 12, 9, 0)
+    enqueue_job(job, due)
+    known.update(enqueued)
+    enqueue_job(job, due)
+    assert enqueued == [f"j-{int(due.timestamp())}"]
@@ -0,0 +1,146 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.modules.sla import timers as timers_module
+from app.modules.sla.timers import ESCALATION, FIRST_RESPONSE, RESOLUTION, SLATimerQueue, Timer
+from app.sla_timers import SLATimerConsumer
+
+
+class MemorySortedSets:
+    """The sorted-set commands SLATimerQueue uses."""
+
+    def __init__(self):
+        self.sets = {}
+
+    def zadd(self, key, mapping):
+        self.sets.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key, *members):
+        zset = self.sets.get(key, {})
+        return sum(zset.pop(m, None) is not None for m in members)
+
+    def zrangebyscore(self, key, min, max, start=0, num=None, withscores=False):
+        items = sorted((score, m) for m, score in self.sets.get(key, {}).items() if score <= max)
+        items = items[start:start + num if num is not None else None]
+        return [(m.encode(), score) for score, m in items]
+
+    def zrange(self, key, start, end, withscores=False):
+        items = sorted((score, m) for m, score in self.sets.get(key, {}).items())
+        return [(m.encode(), score) for score, m in items[start:end + 1]]
+
+    def zcard(self, key):
+        return len(self.sets.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        client = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            def zrem(self, key, member):
+                self.calls.append((key, member.decode() if isinstance(member, bytes) else member))
+
+            def execute(self):
+                return [client.zrem(key, member) for key, member in self.calls]
+
+        return Pipeline()
+
+
+class FakeEngine:
+    def __init__(self, escalated=None, fail=False):
+        self.calls = []
+        self.escalated = escalated or []
+        self.fail = fail
+
+    def run_scoped(self, db, now, ticket_ids=None):
+        self.calls.append(ticket_ids)
+        if self.fail:
+            raise RuntimeError("db down")
+        return {"escalated": len(self.escalated)}, self.escalated
+
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    monkeypatch.setattr(timers_module.settings, "sla_timers_enabled", True)
+    return SLATimerQueue(MemorySortedSets())
+
+
+def sla(**overrides):
+    fields = dict(
+        ticket_id=uuid.uuid4(),
+        first_response_due_at=NOW + timedelta(minutes=10),
+        resolution_due_at=NOW + timedelta(hours=1),
+        first_response_met=False,
+        first_response_breached=False,
+        resolution_met=False,
+        resolution_breached=False,
+    )
+    return SimpleNamespace(**{**fields, **overrides})
+
+
+def test_schedule_pop_and_cancel(queue):
+    pending, met = sla(), sla(first_response_met=True)
+    queue.schedule_sla(pending)
+    queue.schedule_sla(met)
+    assert queue.size() == 3
+    assert queue.next_due() == pending.first_response_due_at
+
+    # Nothing due yet; then only the first-response deadline
+    assert queue.pop_due(NOW, 100) == []
+    due = queue.pop_due(NOW + timedelta(minutes=15), 100)
+    assert due == [Timer(pending.ticket_id, FIRST_RESPONSE, pending.first_response_due_at)]
+    # Claimed timers are gone for every other consumer
+    assert queue.pop_due(NOW + timedelta(minutes=15), 100) == []
+
+    queue.cancel(met.ticket_id, RESOLUTION)
+    assert [t.ticket_id for t in queue.pop_due(NOW + timedelta(days=1), 100)] == [pending.ticket_id]
+
+
+def test_disabled_queue_ignores_request_writes(queue, monkeypatch):
+    monkeypatch.setattr(timers_module.settings, "sla_timers_enabled", False)
+    queue.schedule_sla(sla())
+    assert queue.size() == 0
+
+
+def test_consumer_escalates_due_tickets_and_schedules_next_level(queue):
+    first, second = sla(), sla()
+    queue.schedule_sla(first)
+    queue.schedule_sla(second)
+    engine = FakeEngine(escalated=[
+        {"ticket_id": first.ticket_id, "level": 1},
+        {"ticket_id": second.ticket_id, "level": 2},
+    ])
+    consumer = SLATimerConsumer(
+        queue, engine, session_factory=lambda: SimpleNamespace(close=lambda: None),
+        escalation_interval_seconds=300,
+    )
+
+    now = NOW + timedelta(minutes=11)
+    assert consumer.process(now) == {"timers": 2, "escalated": 2}
+    assert engine.calls == [sorted([first.ticket_id, second.ticket_id])]
+
+    # Level 1 gets its next bump one interval later; level 2 is the top
+    escalation = queue.pop_due(now + timedelta(seconds=300), 100)
+    assert escalation == [Timer(first.ticket_id, ESCALATION, now + timedelta(seconds=300))]
+    assert consumer.process(now + timedelta(seconds=1)) is None
+    assert consumer.sleep_seconds(now, max_sleep=5) == 5
+
+
+def test_consumer_requeues_on_failure(queue):
+    pending = sla()
+    queue.schedule_sla(pending)
+    consumer = SLATimerConsumer(
+        queue, FakeEngine(fail=True), session_factory=lambda: SimpleNamespace(close=lambda: None)
+    )
+
+    with pytest.raises(RuntimeError):
+        consumer.process(NOW + timedelta(minutes=11))
+    assert queue.size() == 2
+    assert queue.next_due() == pending.first_response_due_at